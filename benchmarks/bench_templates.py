@@ -0,0 +1,62 @@
+"""
+Template Benchmark
+Compares the precompiled, escaping chapter templates with the old string-concatenation builder
+"""
+
+import os
+import sys
+import timeit
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from formatters.templates import render_chapter
+
+
+def _legacy_chapter(article):
+    """The previous string-concatenation chapter builder (unescaped; for comparison only)"""
+    html_content = f'''
+        <html>
+        <head>
+            <title>{article.get('headline', 'No title')}</title>
+            <link rel="stylesheet" href="style/nav.css" type="text/css"/>
+        </head>
+        <body>
+            <h1>{article.get('headline', 'No title')}</h1>
+        '''
+    if article.get('author'):
+        html_content += f'<p class="author">By {article["author"]}</p>'
+    if article.get('date'):
+        html_content += f'<p class="date">{article["date"]}</p>'
+    html_content += '<div class="content">'
+    for para in article.get('content', '').split('\n\n'):
+        if para.strip():
+            html_content += f'<p>{para.strip()}</p>\n'
+    html_content += '</div>'
+    if article.get('url'):
+        html_content += f'<p class="url"><small>Source: <a href="{article["url"]}">{article["url"]}</a></small></p>'
+    html_content += '''
+        </body>
+        </html>
+        '''
+    return html_content
+
+
+def main():
+    """Time both builders on editions of increasing size"""
+    article = {
+        'headline': 'Markets & Morning Briefing: <Live> Updates',
+        'author': 'Test Author',
+        'date': '2026-01-09',
+        'content': '\n\n'.join(f'Paragraph {i} with an & ampersand and "quotes" ' * 8 for i in range(60)),
+        'url': 'https://example.com/article?a=1&b=2',
+    }
+    for chapters in (100, 500, 2000):
+        edition = [article] * chapters
+        legacy = timeit.timeit(lambda: [_legacy_chapter(a) for a in edition], number=3) / 3
+        compiled = timeit.timeit(lambda: [render_chapter(a) for a in edition], number=3) / 3
+        print(f"{chapters:5d} chapters: legacy {legacy * 1000:8.1f} ms, compiled {compiled * 1000:8.1f} ms "
+              f"({compiled / chapters * 1e6:.0f} us/chapter, escaped)")
+
+
+if __name__ == "__main__":
+    main()
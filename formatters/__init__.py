@@ -1,3 +1,34 @@
-from .epub_formatter import EpubFormatter
+"""
+Formatters
+Backends are imported on first use, so ebooklib is only loaded when an edition is formatted
+"""
 
-__all__ = ['EpubFormatter']
+import importlib
+
+# Registry: format name -> (module, class name)
+FORMATTERS = {
+    'epub': ('.epub_formatter', 'EpubFormatter'),
+}
+
+__all__ = ['EpubFormatter', 'get_formatter']
+
+
+def get_formatter(name):
+    """
+    Get a formatter class by format name, importing its module on demand
+
+    Args:
+        name: Format name from FORMATTERS ('epub')
+    """
+    if name not in FORMATTERS:
+        raise ValueError(f"Unknown formatter: {name}")
+    module_name, class_name = FORMATTERS[name]
+    return getattr(importlib.import_module(module_name, __name__), class_name)
+
+
+def __getattr__(name):
+    """Lazy access to formatter classes, e.g. `from formatters import EpubFormatter`"""
+    for backend, (_, class_name) in FORMATTERS.items():
+        if class_name == name:
+            return get_formatter(backend)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
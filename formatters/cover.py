@@ -0,0 +1,155 @@
+"""
+Cover Pipeline
+Normalizes the cover image once to Kindle dimensions and caches it, optionally stamped with the date
+"""
+
+from functools import lru_cache
+import hashlib
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.atomic_file import atomic_write
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:  # Optional: without Pillow the cover is embedded as-is
+    Image = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Kindle Paperwhite screen in portrait
+COVER_SIZE = (1072, 1448)
+COVER_FONTS = ('DejaVuSans-Bold.ttf', 'Arial Bold.ttf', 'arialbd.ttf')
+
+
+@lru_cache(maxsize=None)
+def default_cover_path(assets_dir):
+    """
+    Find the default cover in an assets directory (probed once per process)
+
+    Returns:
+        Path of cover.jpg or cover.png, or None
+    """
+    for name in ('cover.jpg', 'cover.png'):
+        cover_path = os.path.join(assets_dir, name)
+        if os.path.exists(cover_path):
+            return cover_path
+    return None
+
+
+class CoverPipeline:
+    def __init__(self, cache_dir='cache/covers', size=COVER_SIZE, quality=80, grayscale=True):
+        """
+        Initialize the cover pipeline
+
+        Args:
+            cache_dir: Directory for normalized and dated covers
+            size: (width, height) of the output cover
+            quality: JPEG quality
+            grayscale: Convert to grayscale
+        """
+        self.cache_dir = cache_dir
+        self.size = tuple(size)
+        self.quality = quality
+        self.grayscale = grayscale
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _cache_key(self, source_path):
+        """Key for a source file under the current settings (changes when the file does)"""
+        stat = os.stat(source_path)
+        settings = f'{self.size[0]}x{self.size[1]}-q{self.quality}-{self.grayscale}'
+        fingerprint = f'{os.path.abspath(source_path)}:{stat.st_mtime_ns}:{stat.st_size}:{settings}'
+        return hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:32]
+
+    def _save(self, image, path):
+        """Atomically write an image as JPEG"""
+        with atomic_write(path, 'wb') as f:
+            image.save(f, 'JPEG', quality=self.quality, optimize=True)
+
+    def normalized(self, source_path):
+        """
+        Cover scaled and padded to the output size, as a compact JPEG
+
+        The full-size source is decoded only when it changed since the last run.
+
+        Returns:
+            Path of the cached cover
+        """
+        path = os.path.join(self.cache_dir, f'{self._cache_key(source_path)}.jpg')
+        if os.path.exists(path):
+            return path
+
+        mode = 'L' if self.grayscale else 'RGB'
+        with Image.open(source_path) as source:
+            source.draft(mode, self.size)  # JPEG sources decode at reduced size
+            source = source.convert(mode)
+            source.thumbnail(self.size, Image.LANCZOS)
+            cover = Image.new(mode, self.size, 'white')
+            cover.paste(source, ((self.size[0] - source.width) // 2, (self.size[1] - source.height) // 2))
+
+        self._save(cover, path)
+        logger.info(f"Normalized cover {source_path} -> {path}")
+        return path
+
+    def _font(self, size):
+        """Bold TrueType font if one is installed, else Pillow's built-in font"""
+        for name in COVER_FONTS:
+            try:
+                return ImageFont.truetype(name, size)
+            except OSError:
+                continue
+        try:
+            return ImageFont.load_default(size)
+        except TypeError:  # Pillow < 10.1 has a single fixed-size default font
+            return ImageFont.load_default()
+
+    def dated(self, source_path, date_text):
+        """
+        Normalized cover with the date on a band along the bottom
+
+        Composited onto the cached normalized cover, never the full-size source.
+
+        Returns:
+            Path of the cached dated cover
+        """
+        base_path = self.normalized(source_path)
+        date_key = hashlib.sha256(date_text.encode('utf-8')).hexdigest()[:8]
+        path = os.path.join(self.cache_dir, f'{self._cache_key(source_path)}-{date_key}.jpg')
+        if os.path.exists(path):
+            return path
+
+        with Image.open(base_path) as base:
+            cover = base.copy()
+        width, height = cover.size
+        band = height // 10
+        draw = ImageDraw.Draw(cover)
+        draw.rectangle([0, height - band, width, height], fill='black')
+        draw.text(
+            (width // 2, height - band // 2), date_text,
+            fill='white', font=self._font(band // 2), anchor='mm'
+        )
+
+        self._save(cover, path)
+        return path
+
+    def prepare(self, source_path, date_text=None):
+        """
+        Cover to embed: normalized (and dated, if date_text is given) when
+        Pillow is available, otherwise the source unchanged
+
+        Returns:
+            (path, media type)
+        """
+        if Image is not None:
+            try:
+                path = self.dated(source_path, date_text) if date_text else self.normalized(source_path)
+                return path, 'image/jpeg'
+            except Exception as e:
+                logger.warning(f"Could not prepare cover, embedding it unchanged: {e}")
+
+        media_type = 'image/png' if source_path.lower().endswith('.png') else 'image/jpeg'
+        return source_path, media_type
@@ -0,0 +1,96 @@
+"""
+Edition Assembler
+Builds several subscribers' editions from one article pool, rendering each article once
+"""
+
+import logging
+import os
+import re
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from formatters.epub_formatter import EpubFormatter
+from formatters.render_cache import ChapterCache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class EditionAssembler:
+    def __init__(self, chapter_cache=None, cover_pipeline=None, output_dir='output', section_dividers=False,
+                 max_bytes=None):
+        """
+        Initialize the assembler
+
+        Every edition is written with the streaming backend from one shared
+        ChapterCache, so an article that appears in several editions is
+        rendered and compressed once and then copied into each archive.
+
+        Args:
+            chapter_cache: Shared ChapterCache (default: an in-memory cache for this assembler)
+            cover_pipeline: Optional CoverPipeline shared by all editions
+            output_dir: Directory for the generated EPUB files
+            section_dividers: Default for editions that do not set 'section_dividers'
+            max_bytes: Size budget each edition is fitted to (None: unlimited)
+        """
+        self.chapter_cache = chapter_cache or ChapterCache(cache_dir=None)
+        self.cover_pipeline = cover_pipeline
+        self.output_dir = output_dir
+        self.section_dividers = section_dividers
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def select(articles, sections=None, max_articles=None):
+        """
+        An edition's articles from the pool, in pool order
+
+        Args:
+            articles: Article pool
+            sections: Only articles whose 'section' is listed, ignoring case
+                      (the NYT feeds disagree: 'business' vs 'Business') (None: all)
+            max_articles: Cap on the number of articles (None: no cap)
+        """
+        if sections is not None:
+            wanted = {str(section).casefold() for section in sections}
+            articles = [a for a in articles if str(a.get('section', '')).casefold() in wanted]
+        return list(articles)[:max_articles]
+
+    def formatter(self, name, cover_image_path=None, dated_cover=False, section_dividers=None):
+        """
+        Streaming formatter for one edition, sharing the assembler's caches
+
+        Its files are named <output_dir>/<name>_<date>_<edition hash>.epub.
+        """
+        return EpubFormatter(
+            cover_image_path=cover_image_path,
+            backend='streaming',
+            section_dividers=self.section_dividers if section_dividers is None else section_dividers,
+            cover_pipeline=self.cover_pipeline,
+            dated_cover=dated_cover,
+            chapter_cache=self.chapter_cache,
+            output_dir=self.output_dir,
+            name=re.sub(r'[^\w-]+', '_', name),
+        )
+
+    def assemble(self, articles, name, sections=None, max_articles=None, cover_image_path=None,
+                 dated_cover=False, section_dividers=None):
+        """
+        Build one edition
+
+        Args:
+            articles: Article pool
+            name: Edition name (used in the file name)
+            sections, max_articles: Article selection, see select()
+            cover_image_path: Cover for this edition (default: assets/cover.jpg or .png)
+            dated_cover: Stamp the date on the cover (needs a cover pipeline)
+            section_dividers: Override the assembler's default
+
+        Returns:
+            List of EPUB paths (several if the edition was split to fit max_bytes)
+        """
+        selected = self.select(articles, sections, max_articles)
+        formatter = self.formatter(name, cover_image_path, dated_cover, section_dividers)
+        if self.max_bytes:
+            return formatter.format_volumes(selected, self.max_bytes)
+        return [formatter.format_for_kindle(selected)]
@@ -4,120 +4,99 @@ Formats news articles into EPUB format for better Kindle compatibility
 """
 
 from ebooklib import epub
-from datetime import datetime
+from datetime import datetime, timezone
+import hashlib
+import json
 import logging
 import os
 import sys
 
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from formatters.streaming_epub import StreamingEpubWriter
+from formatters.templates import TEMPLATE_VERSION, render_chapter, render_section_divider, image_href
+from formatters.cover import default_cover_path
+from formatters.render_cache import render_key
+from formatters.size_budget import SizeBudget
+from formatters.zip_stream import normalize_archive
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+BACKENDS = ('ebooklib', 'streaming')
+
 
 class EpubFormatter:
-    def __init__(self, cover_image_path=None):
+    def __init__(self, cover_image_path=None, backend='ebooklib', section_dividers=False, cover_pipeline=None,
+                 dated_cover=False, chapter_cache=None, output_dir='output', name='daily_news'):
+        """
+        Initialize the formatter
+
+        Args:
+            cover_image_path: Cover image (defaults to assets/cover.jpg or .png)
+            backend: 'ebooklib' builds the whole book in memory and writes it at the end;
+                     'streaming' writes each chapter into the archive as it is produced
+            section_dividers: Insert a title page whenever the articles' section changes
+            cover_pipeline: Optional CoverPipeline; the cover is then embedded from its
+                            normalized, cached copy instead of the original file
+            dated_cover: Stamp the edition date on the cover (needs cover_pipeline)
+            chapter_cache: Optional ChapterCache; the streaming backend then copies
+                           pre-rendered, pre-compressed chapters into the archive
+            output_dir: Directory for generated files without an explicit filename
+            name: File name prefix of generated files
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown EPUB backend: {backend}")
         self.book = None
+        self.backend = backend
+        self.section_dividers = section_dividers
+        self.cover_pipeline = cover_pipeline
+        self.dated_cover = dated_cover
+        self.chapter_cache = chapter_cache
+        self.output_dir = output_dir
+        self.name = name
         self.cover_image_path = cover_image_path or self._get_default_cover_path()
+        self.last_edition_hash = None
+        self._file_digests = {}
 
     def _get_default_cover_path(self):
-        """Get the default cover image path"""
-        # Try to find cover.jpg in assets directory
+        """Get the default cover image path (assets/cover.jpg or .png)"""
         script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        cover_path = os.path.join(script_dir, 'assets', 'cover.jpg')
-        if os.path.exists(cover_path):
-            return cover_path
-        # Also try cover.png
-        cover_path = os.path.join(script_dir, 'assets', 'cover.png')
-        if os.path.exists(cover_path):
-            return cover_path
-        return None
-
-    def format_for_kindle(self, nyt_articles):
+        return default_cover_path(os.path.join(script_dir, 'assets'))
+
+    def format_for_kindle(self, nyt_articles, filename=None, volume=None, edition_hash=None):
         """
         Format articles into EPUB format
 
+        The output is reproducible: the same articles, cover and settings give
+        a byte-identical file on the same day, whose identifier and default
+        file name derive from the edition hash (see edition_hash()).
+
         Args:
-            nyt_articles: List of NYT article dictionaries
+            nyt_articles: List of NYT article dictionaries (with the streaming
+                          backend any iterable, e.g. a generator fed by the scraper)
+            filename: Output path (default: <output_dir>/<name>_<date>_<hash>.epub,
+                      or <output_dir>/<name>_<timestamp>.epub for a generator)
+            volume: Optional (number, count) when the edition is split into volumes
+            edition_hash: Precomputed edition hash (default: computed from the articles)
 
         Returns:
             Path to generated EPUB file
         """
         try:
-            logger.info(f"Formatting {len(nyt_articles)} NYT Business articles")
-
-            # Create EPUB book
-            self.book = epub.EpubBook()
-
-            # Set metadata
-            today = datetime.now().strftime('%m-%d-%y')
-            self.book.set_identifier(f'daily-news-{today}')
-            self.book.set_title(today)
-            self.book.set_language('en')
-            self.book.add_author('NYT Business')
-
-            # Create chapters
-            chapters = []
-            spine = ['nav']
-
-            # Add cover image if available
-            if self.cover_image_path and os.path.exists(self.cover_image_path):
-                try:
-                    with open(self.cover_image_path, 'rb') as f:
-                        cover_image_data = f.read()
-
-                    # Determine image type
-                    image_ext = os.path.splitext(self.cover_image_path)[1].lower()
-                    if image_ext == '.jpg' or image_ext == '.jpeg':
-                        media_type = 'image/jpeg'
-                    elif image_ext == '.png':
-                        media_type = 'image/png'
-                    else:
-                        media_type = 'image/jpeg'
-
-                    # Set the cover image
-                    self.book.set_cover(f'cover{image_ext}', cover_image_data)
-                    logger.info(f"Added cover image: {self.cover_image_path}")
-                except Exception as e:
-                    logger.warning(f"Failed to add cover image: {e}")
-
-            # Add NYT articles
-            for i, article in enumerate(nyt_articles, 1):
-                chapter = self._create_chapter(
-                    article,
-                    f'article_{i}',
-                    article.get("headline", "Article")
-                )
-                chapters.append(chapter)
-                spine.append(chapter)
-                self.book.add_item(chapter)
-
-            # Add table of contents
-            self.book.toc = chapters
-
-            # Add navigation files
-            self.book.add_item(epub.EpubNcx())
-            self.book.add_item(epub.EpubNav())
-
-            # Define spine
-            self.book.spine = spine
-
-            # Add CSS
-            css = self._get_css()
-            nav_css = epub.EpubItem(
-                uid="style_nav",
-                file_name="style/nav.css",
-                media_type="text/css",
-                content=css
-            )
-            self.book.add_item(nav_css)
+            if hasattr(nyt_articles, '__len__'):
+                logger.info(f"Formatting {len(nyt_articles)} NYT Business articles")
+                edition_hash = edition_hash or self.edition_hash(nyt_articles)
+            self.last_edition_hash = edition_hash
 
             # Generate EPUB file
-            output_dir = 'output'
-            os.makedirs(output_dir, exist_ok=True)
+            filename = filename or self._default_filename(edition_hash)
+            os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
 
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f'{output_dir}/daily_news_{timestamp}.epub'
-
-            epub.write_epub(filename, self.book, {})
+            if self.backend == 'streaming':
+                self._write_streaming(nyt_articles, filename, volume, edition_hash)
+            else:
+                self._write_ebooklib(nyt_articles, filename, volume, edition_hash)
 
             logger.info("Formatting complete")
             return filename
@@ -126,58 +105,292 @@ class EpubFormatter:
             logger.error(f"Error formatting EPUB: {e}")
             raise
 
-    def _create_chapter(self, article, chapter_id, title):
-        """Create an EPUB chapter from an article"""
-
-        headline = article.get('headline', 'No title')
-        author = article.get('author', '')
-        date = article.get('date', '')
-        content = article.get('content', '')
-        url = article.get('url', '')
-
-        # Build HTML content
-        html_content = f'''
-        <html>
-        <head>
-            <title>{headline}</title>
-            <link rel="stylesheet" href="style/nav.css" type="text/css"/>
-        </head>
-        <body>
-            <h1>{headline}</h1>
-        '''
+    def format_volumes(self, nyt_articles, max_bytes):
+        """
+        Format articles into as few EPUB files as fit a size budget
 
-        if author:
-            html_content += f'<p class="author">By {author}</p>'
+        The edition is planned before anything is written: images are dropped
+        and long articles truncated only as far as needed, and if it still
+        does not fit it is split into numbered volumes, each with its own
+        table of contents.
 
-        if date:
-            html_content += f'<p class="date">{date}</p>'
+        Args:
+            nyt_articles: List of NYT article dictionaries
+            max_bytes: Largest allowed file, e.g. size_budget.attachment_budget()
 
-        html_content += '<div class="content">'
+        Returns:
+            List of EPUB paths in reading order (one unless the edition was split)
+        """
+        edition_hash = self.edition_hash(nyt_articles, max_bytes)
+        cover = self._read_cover()
+        budget = SizeBudget(max_bytes, chapter_cache=self.chapter_cache, fixed_bytes=len(cover[1]) if cover else 0)
+        volumes = budget.plan(nyt_articles)
+
+        if len(volumes) == 1:
+            filenames = [self.format_for_kindle(volumes[0], edition_hash=edition_hash)]
+        else:
+            base = self._default_filename(edition_hash)[:-len('.epub')]
+            filenames = [
+                self.format_for_kindle(articles, filename=f'{base}_vol{number}.epub', volume=(number, len(volumes)),
+                                       edition_hash=edition_hash)
+                for number, articles in enumerate(volumes, 1)
+            ]
+        self.last_edition_hash = edition_hash
+
+        for filename in filenames:
+            size = os.path.getsize(filename)
+            if size > max_bytes:
+                logger.warning(f"{filename} is {size} bytes, over the {max_bytes} byte budget")
+        return filenames
+
+    def edition_hash(self, nyt_articles, max_bytes=None):
+        """
+        Content hash of the edition these articles would produce
 
-        # Split content into paragraphs
-        if content:
-            paragraphs = content.split('\n\n')
-            for para in paragraphs:
-                if para.strip():
-                    html_content += f'<p>{para.strip()}</p>\n'
+        Covers the template version, formatter settings, stylesheet, cover and
+        every field and image the chapters are rendered from, but not the
+        build time, so it is computed without formatting anything and stays
+        the same until the edition's content does.
 
-        html_content += '</div>'
+        Args:
+            nyt_articles: List of NYT article dictionaries
+            max_bytes: Size budget the edition will be formatted with, if any
 
-        if url:
-            html_content += f'<p class="url"><small>Source: <a href="{url}">{url}</a></small></p>'
+        Returns:
+            Hex SHA-256 digest
+        """
+        digest = self._edition_digest(max_bytes)
+        for article in nyt_articles:
+            self._hash_article(digest, article)
+        return digest.hexdigest()
+
+    def _edition_digest(self, max_bytes=None):
+        """Hash object seeded with everything in the edition except its articles"""
+        cover = self._read_cover()
+        settings = [
+            TEMPLATE_VERSION, self.backend, self.section_dividers, max_bytes, self._get_css(),
+            [cover[0], cover[2], hashlib.sha256(cover[1]).hexdigest()] if cover else None,
+        ]
+        return hashlib.sha256(json.dumps(settings).encode('utf-8'))
+
+    def _hash_article(self, digest, article):
+        """Add an article (its rendered fields, section and image contents) to an edition hash"""
+        digest.update(render_key(article).encode('ascii'))
+        if self.section_dividers:
+            digest.update(str(article.get('section', '')).encode('utf-8'))
+        for image in article.get('images') or []:
+            digest.update(self._file_digest(image['path']))
+
+    def _file_digest(self, path):
+        """SHA-256 of a file's contents (memoized, as images recur across volumes and editions)"""
+        if path not in self._file_digests:
+            with open(path, 'rb') as f:
+                self._file_digests[path] = hashlib.sha256(f.read()).digest()
+        return self._file_digests[path]
+
+    def _hashing(self, nyt_articles, digest):
+        """Pass articles through while adding them to an edition hash (for generators)"""
+        for article in nyt_articles:
+            self._hash_article(digest, article)
+            yield article
+
+    def _default_filename(self, edition_hash=None):
+        """<output_dir>/<name>_<date>_<hash>.epub, or <output_dir>/<name>_<timestamp>.epub without a hash"""
+        if edition_hash:
+            return os.path.join(self.output_dir, f"{self.name}_{datetime.now().strftime('%Y%m%d')}_{edition_hash[:12]}.epub")
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return os.path.join(self.output_dir, f'{self.name}_{timestamp}.epub')
+
+    def _title(self, volume=None):
+        """Book title: the date, with '(n/count)' for volumes"""
+        today = datetime.now().strftime('%m-%d-%y')
+        if volume:
+            number, count = volume
+            return f'{today} ({number}/{count})'
+        return today
+
+    def _identifier(self, edition_hash, volume=None):
+        """Content-derived book identifier, with '-vol<n>' for volumes"""
+        identifier = f'urn:kindle-news:{edition_hash[:32]}'
+        return f'{identifier}-vol{volume[0]}' if volume else identifier
+
+    def _modified(self):
+        """
+        Last-modified time recorded in the book
 
-        html_content += '''
-        </body>
-        </html>
-        '''
+        SOURCE_DATE_EPOCH if set (the reproducible-builds convention), else
+        midnight UTC of the edition date, so rebuilds on the same day match.
+        """
+        epoch = os.environ.get('SOURCE_DATE_EPOCH')
+        if epoch:
+            return datetime.fromtimestamp(int(epoch), timezone.utc)
+        return datetime.combine(datetime.now().date(), datetime.min.time(), timezone.utc)
 
+    def _read_cover(self):
+        """
+        Read the cover image
+
+        Returns:
+            (file name, image bytes, media type), or None if there is no usable cover
+        """
+        if not (self.cover_image_path and os.path.exists(self.cover_image_path)):
+            return None
+
+        cover_path = self.cover_image_path
+        if self.cover_pipeline:
+            date_text = datetime.now().strftime('%B %d, %Y') if self.dated_cover else None
+            cover_path, media_type = self.cover_pipeline.prepare(cover_path, date_text)
+        else:
+            media_type = 'image/png' if cover_path.lower().endswith('.png') else 'image/jpeg'
+
+        try:
+            with open(cover_path, 'rb') as f:
+                cover_image_data = f.read()
+        except OSError as e:
+            logger.warning(f"Failed to add cover image: {e}")
+            return None
+
+        image_ext = '.png' if media_type == 'image/png' else '.jpg'
+        return f'cover{image_ext}', cover_image_data, media_type
+
+    def _write_ebooklib(self, nyt_articles, filename, volume=None, edition_hash=None):
+        """Build the whole book with ebooklib, then write it"""
+        # Create EPUB book
+        self.book = epub.EpubBook()
+
+        # Set metadata (the identifier is set once the edition hash is known)
+        self.book.set_title(self._title(volume))
+        self.book.set_language('en')
+        self.book.add_author('NYT Business')
+
+        # Create chapters
+        chapters = []
+        spine = ['nav']
+
+        # Add cover image if available
+        cover = self._read_cover()
+        if cover:
+            try:
+                # Set the cover image
+                self.book.set_cover(cover[0], cover[1])
+                logger.info(f"Added cover image: {self.cover_image_path}")
+            except Exception as e:
+                logger.warning(f"Failed to add cover image: {e}")
+
+        # Add NYT articles
+        digest = None
+        if edition_hash is None:
+            digest = self._edition_digest()
+            nyt_articles = self._hashing(nyt_articles, digest)
+        for page_id, title, xhtml, images in self._iter_pages(nyt_articles):
+            for href, path in images:
+                with open(path, 'rb') as f:
+                    self.book.add_item(epub.EpubImage(
+                        uid='img_' + os.path.splitext(os.path.basename(path))[0],
+                        file_name=href,
+                        media_type='image/jpeg',
+                        content=f.read()
+                    ))
+            chapter = self._create_chapter(xhtml, page_id, title)
+            chapters.append(chapter)
+            spine.append(chapter)
+            self.book.add_item(chapter)
+
+        # Add table of contents
+        self.book.toc = chapters
+
+        # Add navigation files
+        self.book.add_item(epub.EpubNcx())
+        self.book.add_item(epub.EpubNav())
+
+        # Define spine
+        self.book.spine = spine
+
+        # Add CSS
+        css = self._get_css()
+        nav_css = epub.EpubItem(
+            uid="style_nav",
+            file_name="style/nav.css",
+            media_type="text/css",
+            content=css
+        )
+        self.book.add_item(nav_css)
+
+        if digest:
+            edition_hash = self.last_edition_hash = digest.hexdigest()
+        self.book.set_identifier(self._identifier(edition_hash, volume))
+
+        epub.write_epub(filename, self.book, {'mtime': self._modified()})
+        # ebooklib stamps every member with the current time
+        normalize_archive(filename)
+
+    def _write_streaming(self, nyt_articles, filename, volume=None, edition_hash=None):
+        """Write the book chapter by chapter; only TOC metadata is held in memory"""
+        digest = None
+        if edition_hash is None:
+            # A generator: hash the articles as they stream past; the identifier is only written on close
+            digest = self._edition_digest()
+            nyt_articles = self._hashing(nyt_articles, digest)
+        with StreamingEpubWriter(filename, self._title(volume),
+                                 identifier=self._identifier(edition_hash, volume) if edition_hash else None,
+                                 language='en', author='NYT Business', modified=self._modified()) as writer:
+            writer.add_stylesheet('style/nav.css', self._get_css(), item_id='style_nav')
+
+            cover = self._read_cover()
+            if cover:
+                writer.set_cover(*cover)
+                logger.info(f"Added cover image: {self.cover_image_path}")
+
+            render = self.chapter_cache.get if self.chapter_cache else render_chapter
+            for page_id, title, xhtml, images in self._iter_pages(nyt_articles, render):
+                for href, path in images:
+                    with open(path, 'rb') as f:
+                        writer.add_image(href, f.read(), 'image/jpeg')
+                writer.add_chapter(f'{page_id}.xhtml', title, xhtml, item_id=page_id)
+
+            if digest:
+                self.last_edition_hash = digest.hexdigest()
+                writer.identifier = self._identifier(self.last_edition_hash, volume)
+
+    def _iter_pages(self, nyt_articles, render=render_chapter):
+        """
+        Render the book's pages in reading order
+
+        Args:
+            nyt_articles: Article dictionaries
+            render: Chapter renderer (article -> XHTML, or CompressedData from a ChapterCache)
+
+        Yields:
+            (page id, TOC title, XHTML document, images) for each article,
+            preceded by a section title page where the section changes (if
+            enabled). images are (href, file path) pairs not yet in the book.
+        """
+        section = None
+        added_images = set()
+        for i, article in enumerate(nyt_articles, 1):
+            if self.section_dividers and article.get('section') and article['section'] != section:
+                section = article['section']
+                title = section.replace('_', ' ').title()
+                yield f'section_{i}', title, render_section_divider(title), []
+
+            images = []
+            for image in article.get('images') or []:
+                href = image_href(image['path'])
+                if href not in added_images:
+                    added_images.add(href)
+                    images.append((href, image['path']))
+            yield f'article_{i}', article.get("headline", "Article"), render(article), images
+
+    def _create_chapter(self, xhtml, chapter_id, title):
+        """Create an EPUB chapter from a rendered XHTML page"""
         # Create chapter
         chapter = epub.EpubHtml(
             title=title,
             file_name=f'{chapter_id}.xhtml',
             lang='en'
         )
-        chapter.content = html_content
+        # As bytes, so ebooklib's parser accepts the XML declaration
+        chapter.content = xhtml.encode('utf-8')
 
         return chapter
 
@@ -232,6 +445,26 @@ class EpubFormatter:
             color: #0066cc;
             text-decoration: none;
         }
+
+        .figure {
+            text-align: center;
+            margin: 1em 0;
+        }
+
+        .figure img {
+            max-width: 100%;
+        }
+
+        .caption {
+            font-size: 0.8em;
+            color: #666;
+        }
+
+        .divider h1 {
+            margin-top: 40%;
+            text-align: center;
+            border-bottom: none;
+        }
         '''
 
 
@@ -0,0 +1,146 @@
+"""
+Chapter Render Cache
+Renders and compresses each distinct article once, for any number of editions and runs
+"""
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from formatters.templates import TEMPLATE_VERSION, image_href, render_chapter
+from formatters.zip_stream import CompressedData, compress
+from utils.atomic_file import atomic_write
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# On-disk entry header: compression method, CRC-32, uncompressed size
+_ENTRY_HEADER = struct.Struct('<BII')
+
+
+def render_key(article, lang='en', level=6):
+    """
+    Cache key for an article's rendered chapter
+
+    Covers every field the chapter template reads, the template version and
+    the compression level, so editing the template or the article gives a new
+    entry instead of a stale one.
+    """
+    fields = [
+        TEMPLATE_VERSION, lang, level,
+        article.get('headline', 'No title'), article.get('author', ''), article.get('date', ''),
+        article.get('content', ''), article.get('url', ''),
+        [(image_href(image['path']), image.get('caption', '')) for image in article.get('images') or []],
+    ]
+    return hashlib.sha256(json.dumps(fields, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class ChapterCache:
+    def __init__(self, cache_dir='cache/chapters', level=6, lang='en', ttl_hours=72):
+        """
+        Initialize the chapter cache
+
+        Entries are the compressed zip members of rendered chapters, so an
+        edition built from cached chapters copies them into the archive
+        without rendering or deflating anything. They are kept in memory for
+        the process and on disk for later runs.
+
+        Args:
+            cache_dir: Directory for cached chapters (None: memory only)
+            level: Deflate level the chapters are compressed with
+            lang: Chapter language
+            ttl_hours: Disk entries unused for longer than this are removed by
+                       evict_expired() (None or 0: keep forever)
+        """
+        self.cache_dir = cache_dir
+        self.level = level
+        self.lang = lang
+        self.ttl = ttl_hours * 3600 if ttl_hours else None
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        """Disk location of an entry"""
+        return os.path.join(self.cache_dir, f'{key[:32]}.chapter')
+
+    def _load(self, key):
+        """Read an entry from disk, or None (a hit renews the entry's TTL)"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                method, crc, size = _ENTRY_HEADER.unpack(f.read(_ENTRY_HEADER.size))
+                member = CompressedData(method, crc, size, f.read())
+            os.utime(path)
+            return member
+        except (OSError, struct.error):
+            return None
+
+    def _store(self, key, member):
+        """Atomically write an entry to disk"""
+        try:
+            with atomic_write(self._path(key), 'wb') as f:
+                f.write(_ENTRY_HEADER.pack(member.method, member.crc, member.size))
+                f.write(member.data)
+        except OSError as e:
+            logger.warning(f"Could not cache chapter: {e}")
+
+    def get(self, article):
+        """
+        Compressed chapter for an article, rendered only on a cache miss
+
+        Returns:
+            CompressedData of the complete XHTML document
+        """
+        key = render_key(article, self.lang, self.level)
+        member = self.entries.get(key)
+        if member is None and self.cache_dir:
+            member = self._load(key)
+        if member is None:
+            self.misses += 1
+            member = compress(render_chapter(article, self.lang), self.level)
+            if self.cache_dir:
+                self._store(key, member)
+        else:
+            self.hits += 1
+        self.entries[key] = member
+        return member
+
+    def evict_expired(self):
+        """
+        Delete disk entries not used within the TTL
+
+        Returns:
+            Number of evicted chapters
+        """
+        if not (self.ttl and self.cache_dir):
+            return 0
+
+        cutoff = time.time() - self.ttl
+        evicted = 0
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.chapter'):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                        evicted += 1
+                except OSError:
+                    continue
+
+        if evicted:
+            logger.info(f"Evicted {evicted} expired chapters from cache")
+        return evicted
+
+    def stats(self):
+        """Hit and miss counts since the cache was created"""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries)}
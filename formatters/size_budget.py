@@ -0,0 +1,241 @@
+"""
+Size Budget
+Plans an edition to fit an email attachment limit: drop images, truncate articles, then split into volumes
+"""
+
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from formatters.templates import (
+    AUTHOR_LINE, CAPTION_LINE, CHAPTER, DATE_LINE, FIGURE, SOURCE_LINE, image_href, render_chapter
+)
+from formatters.zip_stream import compress
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Gmail's limit on the whole encoded message
+ATTACHMENT_LIMIT_MB = 25
+# Room for the message headers, body text and MIME boundaries
+MIME_OVERHEAD = 64 * 1024
+# Per page: zip headers plus its manifest, spine, nav and NCX entries
+PAGE_OVERHEAD = 600
+# Package documents, container and stylesheet of an empty book
+BOOK_OVERHEAD = 8 * 1024
+# Compressed chapter size above which an article counts as long (roughly 100 KB of text)
+LONG_ARTICLE_BYTES = 32 * 1024
+
+# Markup around each paragraph of a chapter ('    <p>' ... '</p>\n')
+PARAGRAPH_MARKUP = 12
+# Longest escape of a single character ('"' -> '&quot;', "'" -> '&#x27;') adds this many bytes
+ESCAPE_GROWTH = 5
+
+
+def _literal_bytes(*templates):
+    """Bytes of fixed markup in templates, excluding their fields"""
+    return sum(len(literal.encode('utf-8')) for template in templates for literal, _, _ in template.ops)
+
+
+CHAPTER_MARKUP = _literal_bytes(CHAPTER, AUTHOR_LINE, DATE_LINE, SOURCE_LINE)
+FIGURE_MARKUP = _literal_bytes(FIGURE, CAPTION_LINE)
+
+TRUNCATION_NOTE = 'This article was shortened to fit the delivery size limit. The full text is at the link below.'
+
+
+def attachment_budget(limit_mb=ATTACHMENT_LIMIT_MB):
+    """
+    Largest EPUB that fits in a message of limit_mb once base64-encoded
+
+    Base64 turns every 3 bytes into 4, so only three quarters of the limit is
+    available for the file itself.
+    """
+    return int(limit_mb * 1024 * 1024 * 3 / 4) - MIME_OVERHEAD
+
+
+def truncate_to_link(article, paragraphs=1):
+    """
+    Copy of an article cut down to its opening paragraphs and a note pointing to the source link
+
+    The rendered chapter keeps its headline, byline and source link.
+    """
+    lead = [para for para in article.get('content', '').split('\n\n') if para.strip()][:paragraphs]
+    truncated = dict(article, content='\n\n'.join(lead + [TRUNCATION_NOTE]), images=[])
+    truncated['truncated'] = True
+    return truncated
+
+
+class SizeBudget:
+    def __init__(self, max_bytes, chapter_cache=None, fixed_bytes=0, level=6, long_article_bytes=LONG_ARTICLE_BYTES):
+        """
+        Initialize the planner
+
+        Args:
+            max_bytes: Largest allowed EPUB file, e.g. attachment_budget()
+            chapter_cache: Optional ChapterCache; sizes are then measured on (and
+                           leave behind) the same compressed chapters the book uses
+            fixed_bytes: Per-volume content outside the articles (e.g. the cover image)
+            level: Deflate level the chapters are written with
+            long_article_bytes: Only chapters larger than this are truncated
+        """
+        self.max_bytes = max_bytes
+        self.chapter_cache = chapter_cache
+        self.fixed_bytes = BOOK_OVERHEAD + fixed_bytes
+        self.level = level
+        self.long_article_bytes = long_article_bytes
+        self._image_sizes = {}
+
+    def chapter_bound(self, article, lang='en'):
+        """
+        Upper bound on an article's compressed chapter size, without rendering or compressing
+
+        Every field is assumed to escape to its longest form and deflate to
+        expand slightly, so the real chapter is never larger.
+        """
+        content = article.get('content', '')
+        images = article.get('images') or []
+        # Field values as often as the chapter template repeats them
+        fields = [
+            lang, lang, article.get('headline', 'No title'), article.get('headline', 'No title'),
+            article.get('author', ''), article.get('date', ''), article.get('url', ''), article.get('url', ''),
+            content,
+        ]
+        for image in images:
+            fields += [image_href(image['path']), image.get('caption', ''), image.get('caption', '')]
+
+        raw = CHAPTER_MARKUP + FIGURE_MARKUP * len(images) + PARAGRAPH_MARKUP * (content.count('\n\n') + 1)
+        for value in fields:
+            value = str(value)
+            raw += len(value.encode('utf-8')) + ESCAPE_GROWTH * sum(value.count(c) for c in '&<>"\'')
+        # Raw deflate never grows data by more than a few bytes per block
+        return raw + raw // 1000 + 64 + PAGE_OVERHEAD
+
+    def upper_bound(self, articles):
+        """Upper bound on the EPUB size for a list of articles, computed without rendering"""
+        return self.fixed_bytes + sum(self.chapter_bound(a) for a in articles) + self._images_size(articles)
+
+    def chapter_size(self, article):
+        """Compressed size of an article's chapter"""
+        if self.chapter_cache:
+            member = self.chapter_cache.get(article)
+        else:
+            member = compress(render_chapter(article), self.level)
+        return len(member.data) + PAGE_OVERHEAD
+
+    def image_size(self, path):
+        """Size of a processed image file (stored uncompressed in the book)"""
+        if path not in self._image_sizes:
+            try:
+                self._image_sizes[path] = os.path.getsize(path) + PAGE_OVERHEAD
+            except OSError:
+                self._image_sizes[path] = 0
+        return self._image_sizes[path]
+
+    def _images_size(self, articles):
+        """Bytes of the distinct images the articles use (shared images are stored once)"""
+        images = {image_href(image['path']): image['path'] for a in articles for image in a.get('images') or []}
+        return sum(self.image_size(path) for path in images.values())
+
+    def measure(self, articles):
+        """Estimated EPUB size for a list of articles"""
+        return self.fixed_bytes + sum(self.chapter_size(a) for a in articles) + self._images_size(articles)
+
+    def _drop_images(self, articles, sizes):
+        """
+        Remove images, article by article with the heaviest first, until the edition fits
+
+        Returns:
+            (new total, number of articles that lost their images)
+        """
+        heaviest = sorted(
+            (i for i, a in enumerate(articles) if a.get('images')),
+            key=lambda i: self._images_size([articles[i]]),
+            reverse=True,
+        )
+        total = self.fixed_bytes + sum(sizes) + self._images_size(articles)
+        dropped = 0
+        for i in heaviest:
+            if total <= self.max_bytes:
+                break
+            articles[i] = dict(articles[i], images=[])
+            sizes[i] = self.chapter_size(articles[i])
+            total = self.fixed_bytes + sum(sizes) + self._images_size(articles)
+            dropped += 1
+        return total, dropped
+
+    def _truncate(self, articles, sizes, total):
+        """
+        Cut long articles down to a link, longest first, until the edition fits
+
+        Returns:
+            (new total, number of truncated articles)
+        """
+        truncated = 0
+        for i in sorted(range(len(articles)), key=lambda i: sizes[i], reverse=True):
+            if total <= self.max_bytes or sizes[i] <= self.long_article_bytes:
+                break
+            short = truncate_to_link(articles[i])
+            short_size = self.chapter_size(short)
+            if short_size < sizes[i]:
+                total -= sizes[i] - short_size
+                articles[i], sizes[i] = short, short_size
+                truncated += 1
+        return total, truncated
+
+    def _split(self, articles, sizes):
+        """Pack articles into volumes in reading order; every volume carries its own images"""
+        volumes, current, current_size = [], [], self.fixed_bytes
+        for article, size in zip(articles, sizes):
+            size += self._images_size([article])
+            if current and current_size + size > self.max_bytes:
+                volumes.append(current)
+                current, current_size = [], self.fixed_bytes
+            current.append(article)
+            current_size += size
+        if current:
+            volumes.append(current)
+        return volumes
+
+    def plan(self, articles):
+        """
+        Fit an edition into the budget
+
+        Degrades only as far as needed, in this order: drop images (heaviest
+        articles first), truncate long articles to their opening and a link
+        (longest first), and finally split into volumes of whole articles.
+
+        Args:
+            articles: Article dictionaries in reading order (not modified)
+
+        Returns:
+            List of volumes, each a list of (possibly degraded copies of) the articles
+        """
+        articles = list(articles)
+        # Most editions are far below the limit: skip rendering and compressing them to find out
+        if self.upper_bound(articles) <= self.max_bytes:
+            return [articles]
+
+        sizes = [self.chapter_size(a) for a in articles]
+        total = self.fixed_bytes + sum(sizes) + self._images_size(articles)
+        if total <= self.max_bytes:
+            return [articles]
+
+        mb = 1024 * 1024
+        logger.info(f"Edition is about {total / mb:.1f} MB; budget is {self.max_bytes / mb:.1f} MB")
+        total, dropped = self._drop_images(articles, sizes)
+        if total <= self.max_bytes:
+            logger.info(f"Dropped the images of {dropped} articles to fit: about {total / mb:.1f} MB")
+            return [articles]
+
+        total, truncated = self._truncate(articles, sizes, total)
+        if total <= self.max_bytes:
+            logger.info(f"Dropped the images of {dropped} articles and truncated {truncated} to fit: "
+                        f"about {total / mb:.1f} MB")
+            return [articles]
+
+        volumes = self._split(articles, sizes)
+        logger.warning(f"Edition exceeds the budget with images dropped ({dropped} articles) and "
+                       f"{truncated} long articles truncated; splitting into {len(volumes)} volumes")
+        return volumes
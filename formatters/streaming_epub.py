@@ -0,0 +1,220 @@
+"""
+Streaming EPUB Writer
+Writes an EPUB archive member by member, keeping only manifest/TOC metadata in memory
+"""
+
+from datetime import datetime, timezone
+import logging
+import os
+import sys
+import uuid
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from formatters.templates import render_cover_page, render_toc, xml_escape
+from formatters.zip_stream import CompressedData, ZipStream
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CONTAINER_XML = '''<?xml version="1.0" encoding="UTF-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles>
+    <rootfile full-path="EPUB/content.opf" media-type="application/oebps-package+xml"/>
+  </rootfiles>
+</container>
+'''
+
+# All content lives under this directory, as with ebooklib
+CONTENT_DIR = 'EPUB/'
+
+
+class StreamingEpubWriter:
+    def __init__(self, path, title, identifier=None, language='en', author=None, compresslevel=6,
+                 modified=None):
+        """
+        Open an EPUB archive for writing
+
+        The mimetype and container are written immediately; every stylesheet,
+        image and chapter goes into the archive as soon as it is added. Only
+        their manifest entries are kept until close() writes the package
+        document, NCX and navigation document.
+
+        Args:
+            path: Output file path (or a writable binary file object); a path only
+                  receives the book once it is complete
+            title: Book title
+            identifier: Unique book identifier (default: a random UUID URN); it is
+                        only written on close(), so it may be set after the chapters
+            language: Book language
+            author: Optional author name
+            compresslevel: Deflate level for the compressed members
+            modified: Last-modified datetime recorded in the metadata (default: now)
+        """
+        self.title = title
+        self.identifier = identifier or f'urn:uuid:{uuid.uuid4()}'
+        self.language = language
+        self.author = author
+        self.modified = (modified or datetime.now(timezone.utc)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        self.manifest = []  # (id, href, media type, properties)
+        self.spine = []     # (item id, linear) in reading order
+        self.toc = []       # (href, title)
+        self.cover_id = None
+        self.closed = False
+
+        self.zip = ZipStream(path, level=compresslevel)
+        # The mimetype must be the first member and stored uncompressed
+        self.zip.write('mimetype', 'application/epub+zip', compress_level=None)
+        self.zip.write('META-INF/container.xml', CONTAINER_XML)
+
+    def _add(self, item_id, href, media_type, data, properties=None, compress_level=-1):
+        """
+        Write a member under the content directory and record it in the manifest
+
+        data may be CompressedData (e.g. from a ChapterCache), which is copied
+        into the archive as-is.
+        """
+        if isinstance(data, CompressedData):
+            self.zip.write_compressed(CONTENT_DIR + href, data)
+        else:
+            self.zip.write(CONTENT_DIR + href, data, compress_level=compress_level)
+        self.manifest.append((item_id, href, media_type, properties))
+
+    def add_stylesheet(self, href, css, item_id='style'):
+        """Add a CSS file"""
+        self._add(item_id, href, 'text/css', css)
+
+    def add_image(self, href, data, media_type, item_id=None):
+        """
+        Add an image
+
+        Returns:
+            The image's manifest id
+        """
+        item_id = item_id or f'image_{len(self.manifest)}'
+        # JPEG and PNG are already compressed; deflating them again only costs time
+        self._add(item_id, href, media_type, data, compress_level=None)
+        return item_id
+
+    def set_cover(self, href, data, media_type):
+        """Add the cover image (marked as such for readers that show it in the library) and a cover page"""
+        self.cover_id = 'cover-img'
+        self._add(self.cover_id, href, media_type, data, properties='cover-image', compress_level=None)
+        self._add('cover', 'cover.xhtml', 'application/xhtml+xml',
+                  render_cover_page(href, self.title, lang=self.language))
+        self.spine.insert(0, ('cover', False))
+
+    def add_chapter(self, href, title, xhtml, item_id=None):
+        """
+        Add a chapter and append it to the reading order and table of contents
+
+        Args:
+            href: File name inside the book, e.g. 'article_1.xhtml'
+            title: Table of contents entry
+            xhtml: Complete XHTML document (an XML declaration is added if missing),
+                   or its CompressedData member as produced by a ChapterCache
+            item_id: Optional manifest id (default: derived from the position)
+        """
+        item_id = item_id or f'chapter_{len(self.spine) + 1}'
+        if not isinstance(xhtml, CompressedData):
+            # Only leading whitespace is invalid before the XML declaration; keeping the rest
+            # makes a rendered chapter identical to its ChapterCache copy
+            xhtml = xhtml.lstrip()
+            if not xhtml.startswith('<?xml'):
+                xhtml = '<?xml version="1.0" encoding="utf-8"?>\n' + xhtml
+        self._add(item_id, href, 'application/xhtml+xml', xhtml)
+        self.spine.append((item_id, True))
+        self.toc.append((href, title))
+
+    def _ncx_document(self):
+        """EPUB 2 NCX table of contents (used by older Kindle firmware)"""
+        points = ''.join(
+            f'    <navPoint id="navpoint-{i}" playOrder="{i}">\n'
+            f'      <navLabel><text>{xml_escape(title)}</text></navLabel>\n'
+            f'      <content src="{xml_escape(href)}"/>\n'
+            f'    </navPoint>\n'
+            for i, (href, title) in enumerate(self.toc, 1)
+        )
+        return (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/" version="2005-1">\n'
+            '  <head>\n'
+            f'    <meta name="dtb:uid" content="{xml_escape(self.identifier)}"/>\n'
+            '    <meta name="dtb:depth" content="1"/>\n'
+            '  </head>\n'
+            f'  <docTitle><text>{xml_escape(self.title)}</text></docTitle>\n'
+            '  <navMap>\n'
+            f'{points}'
+            '  </navMap>\n'
+            '</ncx>\n'
+        )
+
+    def _package_document(self):
+        """OPF package document: metadata, manifest and spine"""
+        items = ''.join(
+            f'    <item id="{item_id}" href="{xml_escape(href)}" media-type="{media_type}"'
+            + (f' properties="{properties}"' if properties else '')
+            + '/>\n'
+            for item_id, href, media_type, properties in self.manifest
+        )
+        itemrefs = ''.join(
+            f'    <itemref idref="{item_id}"' + ('' if linear else ' linear="no"') + '/>\n'
+            for item_id, linear in self.spine
+        )
+        author = f'    <dc:creator id="creator">{xml_escape(self.author)}</dc:creator>\n' if self.author else ''
+        cover = f'    <meta name="cover" content="{self.cover_id}"/>\n' if self.cover_id else ''
+        return (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<package xmlns="http://www.idpf.org/2007/opf" unique-identifier="id" version="3.0">\n'
+            '  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:opf="http://www.idpf.org/2007/opf">\n'
+            f'    <dc:identifier id="id">{xml_escape(self.identifier)}</dc:identifier>\n'
+            f'    <dc:title>{xml_escape(self.title)}</dc:title>\n'
+            f'    <dc:language>{self.language}</dc:language>\n'
+            f'    <meta property="dcterms:modified">{self.modified}</meta>\n'
+            f'{author}'
+            f'{cover}'
+            '  </metadata>\n'
+            '  <manifest>\n'
+            f'{items}'
+            '    <item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>\n'
+            '    <item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>\n'
+            '  </manifest>\n'
+            '  <spine toc="ncx">\n'
+            '    <itemref idref="nav"/>\n'
+            f'{itemrefs}'
+            '  </spine>\n'
+            '</package>\n'
+        )
+
+    def close(self):
+        """Write the navigation and package documents and finish the archive"""
+        if self.closed:
+            return
+        try:
+            self.zip.write(CONTENT_DIR + 'nav.xhtml', render_toc(self.title, self.toc, lang=self.language))
+            self.zip.write(CONTENT_DIR + 'toc.ncx', self._ncx_document())
+            self.zip.write(CONTENT_DIR + 'content.opf', self._package_document())
+        except BaseException:
+            self.abort()
+            raise
+        self.zip.close()
+        self.closed = True
+        logger.debug(f"Wrote EPUB with {len(self.toc)} chapters")
+
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+
+    def abort(self):
+        """Give up on the book: nothing is written to the output path"""
+        if self.closed:
+            return
+        self.zip.abort()
+        self.closed = True
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit (a failed build is discarded, never left half-written)"""
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
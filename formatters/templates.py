@@ -0,0 +1,201 @@
+"""
+XHTML Templates
+Precompiled, escaping templates for chapters and front matter
+"""
+
+from html import escape
+import os
+import re
+
+# Bump whenever template output changes (rendered chapters cached elsewhere become stale)
+TEMPLATE_VERSION = 2
+
+# Characters that are not allowed in XML documents at all (deleted by str.translate)
+_XML_INVALID = dict.fromkeys([*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20), 0xfffe, 0xffff])
+_FIELD = re.compile(r'\{(\w+)(!raw)?\}')
+
+
+def xml_escape(value, quote=True):
+    """Escape text for XHTML content and attribute values (quote=False: element text only)"""
+    return escape(str(value).translate(_XML_INVALID), quote=quote)
+
+
+class Template:
+    def __init__(self, source):
+        """
+        Compile a template
+
+        The source is split once into literal chunks and fields. {name} fields
+        are escaped when rendered; {name!raw} fields are inserted as-is and
+        must already be markup (e.g. the output of another template).
+
+        Args:
+            source: Template text with {name} / {name!raw} placeholders
+        """
+        self.ops = []  # (literal, field name or None, raw)
+        position = 0
+        for match in _FIELD.finditer(source):
+            self.ops.append((source[position:match.start()], match.group(1), bool(match.group(2))))
+            position = match.end()
+        self.ops.append((source[position:], None, False))
+
+    def render(self, **fields):
+        """Render to a string; missing fields render empty"""
+        out = []
+        for literal, name, raw in self.ops:
+            out.append(literal)
+            if name is not None:
+                value = fields.get(name, '')
+                out.append(value if raw else xml_escape(value))
+        return ''.join(out)
+
+
+XHTML_HEAD = (
+    '<?xml version="1.0" encoding="utf-8"?>\n'
+    '<!DOCTYPE html>\n'
+    '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" lang="{lang}" xml:lang="{lang}">\n'
+)
+
+CHAPTER = Template(
+    XHTML_HEAD +
+    '<head>\n'
+    '  <title>{headline}</title>\n'
+    '  <link rel="stylesheet" href="style/nav.css" type="text/css"/>\n'
+    '</head>\n'
+    '<body>\n'
+    '  <h1>{headline}</h1>\n'
+    '{byline!raw}'
+    '{dateline!raw}'
+    '{figures!raw}'
+    '  <div class="content">\n'
+    '{body!raw}'
+    '  </div>\n'
+    '{source!raw}'
+    '</body>\n'
+    '</html>\n'
+)
+AUTHOR_LINE = Template('  <p class="author">By {author}</p>\n')
+DATE_LINE = Template('  <p class="date">{date}</p>\n')
+FIGURE = Template(
+    '  <div class="figure">\n'
+    '    <img src="{src}" alt="{caption}"/>\n'
+    '{caption_line!raw}'
+    '  </div>\n'
+)
+CAPTION_LINE = Template('    <p class="caption">{caption}</p>\n')
+SOURCE_LINE = Template('  <p class="url"><small>Source: <a href="{url}">{url}</a></small></p>\n')
+
+COVER_PAGE = Template(
+    XHTML_HEAD +
+    '<head>\n'
+    '  <title>{title}</title>\n'
+    '  <style type="text/css">body { margin: 0; text-align: center; } img { max-width: 100%; max-height: 100%; }</style>\n'
+    '</head>\n'
+    '<body>\n'
+    '  <section epub:type="cover"><img src="{image}" alt="{title}"/></section>\n'
+    '</body>\n'
+    '</html>\n'
+)
+
+TOC_PAGE = Template(
+    XHTML_HEAD +
+    '<head><title>{title}</title></head>\n'
+    '<body>\n'
+    '  <nav epub:type="toc" id="id" role="doc-toc">\n'
+    '    <h2>{title}</h2>\n'
+    '    <ol>\n'
+    '{entries!raw}'
+    '    </ol>\n'
+    '  </nav>\n'
+    '</body>\n'
+    '</html>\n'
+)
+TOC_ENTRY = Template('      <li><a href="{href}">{title}</a></li>\n')
+
+SECTION_DIVIDER = Template(
+    XHTML_HEAD +
+    '<head>\n'
+    '  <title>{title}</title>\n'
+    '  <link rel="stylesheet" href="style/nav.css" type="text/css"/>\n'
+    '</head>\n'
+    '<body>\n'
+    '  <section class="divider" epub:type="part">\n'
+    '    <h1>{title}</h1>\n'
+    '{subtitle_line!raw}'
+    '  </section>\n'
+    '</body>\n'
+    '</html>\n'
+)
+SUBTITLE_LINE = Template('    <p class="date">{subtitle}</p>\n')
+
+
+def image_href(path):
+    """Location of a processed image inside the book"""
+    return 'images/' + os.path.basename(path)
+
+
+def render_chapter(article, lang='en'):
+    """
+    Render an article as a complete XHTML chapter
+
+    Args:
+        article: Article dictionary (headline, author, date, content, url and
+                 optionally 'images' as [{'path', 'caption'}])
+        lang: Document language
+    """
+    author = article.get('author', '')
+    date = article.get('date', '')
+    url = article.get('url', '')
+    content = article.get('content', '')
+
+    # Escape the body once (element text: quotes need no escaping), then split it into paragraphs
+    paragraphs = (para.strip() for para in xml_escape(content, quote=False).split('\n\n'))
+    body = ''.join([f'    <p>{para}</p>\n' for para in paragraphs if para])
+
+    figures = ''.join([
+        FIGURE.render(
+            src=image_href(image['path']),
+            caption=image.get('caption', ''),
+            caption_line=CAPTION_LINE.render(caption=image['caption']) if image.get('caption') else '',
+        )
+        for image in article.get('images') or []
+    ])
+
+    return CHAPTER.render(
+        lang=lang,
+        headline=article.get('headline', 'No title'),
+        byline=AUTHOR_LINE.render(author=author) if author else '',
+        dateline=DATE_LINE.render(date=date) if date else '',
+        figures=figures,
+        body=body,
+        source=SOURCE_LINE.render(url=url) if url else '',
+    )
+
+
+def render_cover_page(image_href, title, lang='en'):
+    """Cover page showing the cover image"""
+    return COVER_PAGE.render(lang=lang, image=image_href, title=title)
+
+
+def render_toc(title, entries, lang='en'):
+    """
+    EPUB 3 navigation document
+
+    Args:
+        title: Book title
+        entries: (href, title) pairs in reading order
+    """
+    return TOC_PAGE.render(
+        lang=lang,
+        title=title,
+        entries=''.join(TOC_ENTRY.render(href=href, title=entry) for href, entry in entries),
+    )
+
+
+def render_section_divider(title, subtitle=None, lang='en'):
+    """Title page introducing a section of the edition"""
+    return SECTION_DIVIDER.render(
+        lang=lang,
+        title=title,
+        subtitle_line=SUBTITLE_LINE.render(subtitle=subtitle) if subtitle else '',
+    )
@@ -0,0 +1,185 @@
+"""
+Zip Stream
+Minimal forward-only zip writer that can copy already-compressed members without recompressing
+"""
+
+from collections import namedtuple
+import os
+import struct
+import sys
+import zipfile
+import zlib
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.atomic_file import AtomicFile, atomic_write
+
+# Compression methods
+STORED = 0
+DEFLATED = 8
+
+# Earliest timestamp a zip entry can carry; used for every member so identical content gives identical bytes
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+# A member's payload as written to the archive
+CompressedData = namedtuple('CompressedData', ['method', 'crc', 'size', 'data'])
+
+
+def compress(data, level=6):
+    """
+    Compress member data once so it can be written into any number of archives
+
+    Args:
+        data: Member contents (str is encoded as UTF-8)
+        level: Deflate level, or None to store uncompressed
+
+    Returns:
+        CompressedData
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    crc = zlib.crc32(data)
+    if level is None:
+        return CompressedData(STORED, crc, len(data), data)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)  # raw deflate, as zip expects
+    return CompressedData(DEFLATED, crc, len(data), compressor.compress(data) + compressor.flush())
+
+
+def _dos_time(date_time):
+    """(year, month, day, hour, minute, second) -> (DOS time, DOS date)"""
+    year, month, day, hour, minute, second = date_time
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+class ZipStream:
+    def __init__(self, path, date_time=None, level=6):
+        """
+        Open a zip archive for writing
+
+        Members are written in the order they are added, each with its final
+        sizes in the local header, so the file is never seeked or rewritten.
+        Only the central directory entries are kept in memory. A path is
+        written through a temporary file that only replaces it on close(), so
+        an archive that is abort()ed never appears there.
+
+        Args:
+            path: Output file path, or a writable binary file object
+            date_time: Timestamp for every member (default: the zip epoch, for reproducible archives)
+            level: Default deflate level for write()
+        """
+        self.own_file = isinstance(path, str)
+        self.output = AtomicFile(path, 'wb') if self.own_file else None
+        self.fp = self.output.file if self.own_file else path
+        self.dos_time, self.dos_date = _dos_time(date_time or ZIP_EPOCH)
+        self.level = level
+        self.offset = 0
+        self.entries = []  # (name bytes, flags, CompressedData, local header offset)
+        self.names = set()
+        self.closed = False
+
+    @property
+    def compressed_size(self):
+        """Bytes written so far (excluding the central directory)"""
+        return self.offset
+
+    def write(self, name, data, compress_level=-1):
+        """
+        Compress and write a member
+
+        Args:
+            name: Member path
+            data: Contents (str or bytes)
+            compress_level: Deflate level, None to store, -1 for the stream's default
+        """
+        level = self.level if compress_level == -1 else compress_level
+        return self.write_compressed(name, compress(data, level))
+
+    def write_compressed(self, name, member):
+        """
+        Write a member from already-compressed data (copied as-is)
+
+        Returns:
+            Number of bytes the member added to the archive
+        """
+        if name in self.names:
+            raise ValueError(f"Duplicate zip member: {name}")
+        encoded = name.encode('utf-8')
+        flags = 0 if encoded.isascii() else 0x800  # bit 11: UTF-8 file name
+
+        header = struct.pack(
+            '<IHHHHHIIIHH',
+            0x04034b50, 20, flags, member.method, self.dos_time, self.dos_date,
+            member.crc, len(member.data), member.size, len(encoded), 0
+        )
+        self.fp.write(header)
+        self.fp.write(encoded)
+        self.fp.write(member.data)
+
+        self.entries.append((encoded, flags, member, self.offset))
+        self.names.add(name)
+        written = len(header) + len(encoded) + len(member.data)
+        self.offset += written
+        return written
+
+    def close(self):
+        """Write the central directory and close the file"""
+        if self.closed:
+            return
+        try:
+            self._write_directory()
+        except BaseException:
+            self.abort()
+            raise
+        if self.own_file:
+            self.output.commit()
+        else:
+            self.fp.flush()
+        self.closed = True
+
+    def _write_directory(self):
+        """Write the central directory records and the end-of-directory record"""
+        directory_offset = self.offset
+        directory_size = 0
+        for encoded, flags, member, header_offset in self.entries:
+            record = struct.pack(
+                '<IHHHHHHIIIHHHHHII',
+                0x02014b50, 20, 20, flags, member.method, self.dos_time, self.dos_date,
+                member.crc, len(member.data), member.size, len(encoded), 0, 0, 0, 0,
+                0o100644 << 16, header_offset
+            )
+            self.fp.write(record)
+            self.fp.write(encoded)
+            directory_size += len(record) + len(encoded)
+
+        self.fp.write(struct.pack(
+            '<IHHHHIIH',
+            0x06054b50, 0, 0, len(self.entries), len(self.entries), directory_size, directory_offset, 0
+        ))
+
+    def abort(self):
+        """Stop writing without finishing the archive; a path given to the constructor is left untouched"""
+        if self.closed:
+            return
+        if self.own_file:
+            self.output.discard()
+        self.closed = True
+
+
+def normalize_archive(path, date_time=None, level=6):
+    """
+    Rewrite a zip archive written by another library with fixed timestamps
+
+    Members keep their order and stored/deflated choice, so the result is
+    byte-for-byte reproducible for the same content.
+
+    Args:
+        path: Archive to rewrite in place
+        date_time: Timestamp for every member (default: the zip epoch)
+        level: Deflate level for the deflated members
+    """
+    with zipfile.ZipFile(path) as source, atomic_write(path, 'wb') as f:
+        stream = ZipStream(f, date_time=date_time, level=level)
+        for info in source.infolist():
+            stored = info.compress_type == zipfile.ZIP_STORED
+            stream.write(info.filename, source.read(info), compress_level=None if stored else -1)
+        stream.close()
@@ -4,16 +4,20 @@ Kindle News Delivery - Main Script
 Orchestrates the scraping, formatting, and delivery of news to Kindle
 """
 
+import argparse
+import hashlib
 import yaml
 import logging
 import sys
 from datetime import datetime
 import os
 
-from scrapers import NYTScraperSelenium
-from scrapers.nyt_scraper_api import NYTScraperAPI
-from formatters import EpubFormatter
-from utils import KindleSender
+# Scraper, formatter and sender backends (Selenium, BeautifulSoup, ebooklib, smtplib)
+# are imported lazily, only once the run actually needs them
+from scrapers import get_scraper
+from formatters import get_formatter
+from utils import ArticleStore, QuotaGovernor, HostThrottle, DeliveryState, is_newer
+from utils import ChromeDriverResolver, set_driver_resolver
 
 # Setup logging
 logging.basicConfig(
@@ -43,9 +47,91 @@ def load_config(config_file='config.yaml'):
         sys.exit(1)
 
 
-def scrape_news(config):
-    """Scrape news from NYT"""
+# Settings of the process-wide driver resolver, so it is only replaced when they change
+_driver_resolver_settings = None
+
+
+def configure_driver_resolver(config):
+    """
+    Resolve chromedriver from the local cache (and optionally never download) per the config
+
+    Configured once per process: later calls with the same settings keep the
+    resolver, and the driver path it already resolved.
+    """
+    global _driver_resolver_settings
+    cache_dir = config.get('cache', {}).get('directory', 'cache')
+    settings = (os.path.join(cache_dir, 'drivers'), bool(config.get('selenium', {}).get('driver_offline')))
+    if settings == _driver_resolver_settings:
+        return
+    set_driver_resolver(ChromeDriverResolver(cache_dir=settings[0], offline=settings[1]))
+    _driver_resolver_settings = settings
+
+
+def create_selenium_scraper(config, article_store=None, refresh=False, browser_pool=None):
+    """Create the Selenium scraper from the nyt and selenium sections of the config"""
+    from utils import SessionStore
+
+    configure_driver_resolver(config)
+    selenium_config = config.get('selenium', {})
+    cache_dir = config.get('cache', {}).get('directory', 'cache')
+    workers = selenium_config.get('workers', 1)
+    throttle = HostThrottle(
+        max_concurrent=selenium_config.get('max_requests_per_host', workers),
+        min_interval=selenium_config.get('min_request_interval', 1.0)
+    )
+    return get_scraper('selenium')(
+        config['nyt']['email'],
+        config['nyt']['password'],
+        headless=True,
+        article_store=article_store,
+        refresh=refresh,
+        browser_pool=browser_pool,
+        workers=workers,
+        throttle=throttle,
+        hybrid=selenium_config.get('hybrid_fetch', True),
+        extraction=selenium_config.get('extraction', 'in_page'),
+        pipeline=selenium_config.get('pipeline', True),
+        parse_workers=selenium_config.get('parse_workers', 2),
+        parse_processes=selenium_config.get('parse_processes', False),
+        session_store=SessionStore(
+            os.path.join(cache_dir, 'nyt_session.enc'),
+            secret=config['nyt']['password']
+        ) if selenium_config.get('persist_session', True) else None,
+        profile_dir=selenium_config.get('profile_dir')
+    )
+
+
+def is_up_to_date(scraper, nyt_articles):
+    """True if a scrape returned nothing only because every candidate was already delivered"""
+    return not nyt_articles and scraper.candidates > 0 and scraper.already_delivered == scraper.candidates
+
+
+def scrape_news(config, since=None, exclude_urls=None, browser_pool=None):
+    """
+    Scrape news from NYT
+
+    Args:
+        config: Configuration dictionary
+        since: Delta mode - only keep articles published after this ISO timestamp
+        exclude_urls: Delta mode - canonical URLs already delivered for this edition
+        browser_pool: Optional BrowserPool keeping Selenium browsers warm across runs
+
+    Returns:
+        (articles, up_to_date) - up_to_date is True when the scraper found
+        candidates and every one of them was already delivered, as opposed to
+        finding nothing because the scrape failed
+    """
     max_articles = config.get('news', {}).get('max_articles', 10)
+    sections = config.get('news', {}).get('sections')
+    cache_config = config.get('cache', {})
+    cache_dir = cache_config.get('directory', 'cache')
+    refresh = config.get('news', {}).get('refresh_articles', False)
+
+    article_store = ArticleStore(
+        os.path.join(cache_dir, 'articles.db'),
+        ttl_hours=cache_config.get('article_ttl_hours', 72)
+    )
+    article_store.evict_expired()
 
     nyt_articles = []
 
@@ -54,10 +140,36 @@ def scrape_news(config):
     if api_key:
         try:
             logger.info("Starting NYT Business scraping with API...")
-            nyt_scraper = NYTScraperAPI(api_key)
-            nyt_articles = nyt_scraper.scrape(max_articles=max_articles)
+            nyt_config = config.get('nyt', {})
+            quota = QuotaGovernor(
+                os.path.join(cache_dir, 'nyt_quota.db'),
+                per_minute=nyt_config.get('requests_per_minute', 5),
+                per_day=nyt_config.get('requests_per_day', 500)
+            )
+            nyt_scraper = get_scraper('api')(
+                api_key,
+                cache_dir=cache_dir,
+                article_store=article_store,
+                rate_limiter=quota
+            )
+            nyt_articles = nyt_scraper.scrape(
+                max_articles=max_articles,
+                feeds=sections,
+                since=since,
+                exclude_urls=exclude_urls
+            )
             logger.info(f"Successfully scraped {len(nyt_articles)} NYT articles via API")
-            return nyt_articles
+            remaining = quota.remaining()
+            logger.info(f"NYT API quota remaining: {remaining['minute']} this minute, {remaining['daily']} today")
+
+            # The API only provides abstracts; fetch full text with the subscriber login
+            if nyt_articles and nyt_config.get('full_text') and nyt_config.get('email'):
+                try:
+                    create_selenium_scraper(config, article_store, refresh, browser_pool).fill_full_text(nyt_articles)
+                except Exception as e:
+                    logger.error(f"Error fetching full text, keeping abstracts: {e}")
+
+            return nyt_articles, is_up_to_date(nyt_scraper, nyt_articles)
         except Exception as e:
             logger.error(f"Error scraping NYT via API: {e}")
             logger.info("Falling back to Selenium scraping...")
@@ -66,34 +178,163 @@ def scrape_news(config):
     if not nyt_articles:
         try:
             logger.info("Starting NYT Business scraping with Selenium...")
-            nyt_scraper = NYTScraperSelenium(
-                config['nyt']['email'],
-                config['nyt']['password'],
-                headless=True
+            nyt_scraper = create_selenium_scraper(config, article_store, refresh, browser_pool)
+            nyt_articles = nyt_scraper.scrape(
+                max_articles=max_articles,
+                since=since,
+                exclude_urls=exclude_urls
             )
-            nyt_articles = nyt_scraper.scrape(max_articles=max_articles)
             logger.info(f"Successfully scraped {len(nyt_articles)} NYT articles via Selenium")
+            return nyt_articles, is_up_to_date(nyt_scraper, nyt_articles)
         except Exception as e:
             logger.error(f"Error scraping NYT with Selenium: {e}")
 
-    return nyt_articles
+    return nyt_articles, False
+
+
+def prepare_images(config, nyt_articles):
+    """Download and convert article images if enabled in the config"""
+    images_config = config.get('images', {})
+    if not images_config.get('enabled', False):
+        return nyt_articles
+
+    from utils import ImagePipeline
+
+    cache_dir = config.get('cache', {}).get('directory', 'cache')
+    try:
+        pipeline = ImagePipeline(
+            os.path.join(cache_dir, 'images'),
+            max_size=(images_config.get('max_width', 1072), images_config.get('max_height', 1448)),
+            quality=images_config.get('quality', 60),
+            grayscale=images_config.get('grayscale', True),
+            workers=images_config.get('workers', 4)
+        )
+        return pipeline.process(nyt_articles)
+    except Exception as e:
+        logger.error(f"Error processing images, formatting without them: {e}")
+        return nyt_articles
+
 
+def create_cover_pipeline(config=None):
+    """Create the cover pipeline if epub.normalize_cover is on, else None"""
+    if not (config or {}).get('epub', {}).get('normalize_cover', True):
+        return None
+    from formatters.cover import CoverPipeline
+    cache_dir = (config or {}).get('cache', {}).get('directory', 'cache')
+    return CoverPipeline(os.path.join(cache_dir, 'covers'))
+
+
+def create_chapter_cache(config=None):
+    """Create the on-disk chapter cache, evicting chapters unused for cache.chapter_ttl_hours"""
+    from formatters.render_cache import ChapterCache
+
+    cache_config = (config or {}).get('cache', {})
+    chapter_cache = ChapterCache(
+        os.path.join(cache_config.get('directory', 'cache'), 'chapters'),
+        ttl_hours=cache_config.get('chapter_ttl_hours', 72)
+    )
+    chapter_cache.evict_expired()
+    return chapter_cache
+
+
+def create_formatter(config=None):
+    """Create the EPUB formatter configured in the epub section"""
+    epub_config = (config or {}).get('epub', {})
+    backend = epub_config.get('backend', 'ebooklib')
+    chapter_cache = None
+    if backend == 'streaming' and epub_config.get('chapter_cache', True):
+        chapter_cache = create_chapter_cache(config)
+
+    return get_formatter('epub')(
+        backend=backend,
+        section_dividers=epub_config.get('section_dividers', False),
+        cover_pipeline=create_cover_pipeline(config),
+        dated_cover=epub_config.get('dated_cover', False),
+        chapter_cache=chapter_cache
+    )
+
+
+def create_assembler(config=None):
+    """Create the assembler for the editions list; every edition shares one chapter cache"""
+    from formatters.editions import EditionAssembler
+
+    epub_config = (config or {}).get('epub', {})
+    return EditionAssembler(
+        chapter_cache=create_chapter_cache(config) if epub_config.get('chapter_cache', True) else None,
+        cover_pipeline=create_cover_pipeline(config),
+        section_dividers=epub_config.get('section_dividers', False),
+        max_bytes=attachment_budget(config)
+    )
+
+
+def select_editions(config, edition=None):
+    """
+    Edition specs from the editions list of the config
+
+    Args:
+        config: Configuration dictionary
+        edition: Only this edition (from --edition), if given
+
+    Returns:
+        List of edition dictionaries; empty when the config has no editions list
+    """
+    editions = config.get('editions') or []
+    for spec in editions:
+        if not spec.get('name'):
+            raise ValueError("Every entry in editions needs a name")
+    if edition and editions:
+        editions = [spec for spec in editions if spec['name'] == edition]
+        if not editions:
+            raise ValueError(f"Edition '{edition}' is not in the editions list")
+    return editions
+
+
+def attachment_budget(config=None):
+    """Largest EPUB that fits email.max_attachment_mb, or None if unlimited"""
+    max_attachment_mb = (config or {}).get('email', {}).get('max_attachment_mb', 25)
+    if not max_attachment_mb:
+        return None
+    from formatters.size_budget import attachment_budget as budget_for
+    return budget_for(max_attachment_mb)
+
+
+def edition_hash(nyt_articles, config=None, formatter=None):
+    """Content hash of the edition the articles would produce, or None if it cannot be computed"""
+    try:
+        formatter = formatter or create_formatter(config)
+        return formatter.edition_hash(nyt_articles, attachment_budget(config))
+    except Exception as e:
+        logger.warning(f"Could not compute the edition hash: {e}")
+        return None
 
-def format_news(nyt_articles):
-    """Format articles for Kindle"""
+
+def format_news(nyt_articles, config=None, formatter=None):
+    """
+    Format articles for Kindle
+
+    Returns:
+        List of EPUB files to send (several when the edition is split to fit
+        email.max_attachment_mb), or None on failure
+    """
     try:
         logger.info("Formatting articles for Kindle as EPUB...")
-        formatter = EpubFormatter()
-        epub_file = formatter.format_for_kindle(nyt_articles)
+        formatter = formatter or create_formatter(config)
+        max_bytes = attachment_budget(config)
+        if max_bytes:
+            epub_files = formatter.format_volumes(nyt_articles, max_bytes)
+        else:
+            epub_files = [formatter.format_for_kindle(nyt_articles)]
         logger.info("Formatting complete")
-        return epub_file
+        return epub_files
     except Exception as e:
         logger.error(f"Error formatting articles: {e}")
         return None
 
 
-def send_to_kindle(config, epub_file):
-    """Send formatted content to Kindle"""
+def send_to_kindle(config, epub_file, subject=None, recipient=None):
+    """Send formatted content to Kindle (recipient defaults to kindle.email)"""
+    from utils import KindleSender
+
     try:
         logger.info("Sending to Kindle...")
 
@@ -104,11 +345,10 @@ def send_to_kindle(config, epub_file):
             config['email']['sender_password']
         )
 
-        today = datetime.now().strftime('%m-%d-%y')
-        subject = today
+        subject = subject or datetime.now().strftime('%m-%d-%y')
 
         success = sender.send_to_kindle(
-            config['kindle']['email'],
+            recipient or config['kindle']['email'],
             epub_file,
             subject=subject
         )
@@ -125,6 +365,15 @@ def send_to_kindle(config, epub_file):
         return False
 
 
+def volume_digest(epub_file):
+    """SHA-256 of a built EPUB file, identifying a volume across retries"""
+    digest = hashlib.sha256()
+    with open(epub_file, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
 def save_backup(epub_file):
     """EPUB file is already saved, just return the path"""
     if epub_file and os.path.exists(epub_file):
@@ -135,8 +384,100 @@ def save_backup(epub_file):
         return None
 
 
-def main():
-    """Main execution function"""
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Kindle News Delivery')
+    parser.add_argument('--edition', help="Edition name used for delivery tracking (default: news.edition or 'daily')")
+    parser.add_argument('--delta', action='store_true',
+                        help='Only deliver articles newer than the last delivery of this edition')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Scrape and format the edition but do not send it or record the delivery')
+    parser.add_argument('--force', action='store_true',
+                        help='Send the edition even if it is identical to the last one delivered')
+    return parser.parse_args(argv)
+
+
+def deliver_edition(config, args, edition, nyt_articles, formatter, delivery_state, recipient=None):
+    """
+    Format one edition and send it, one message per volume
+
+    Skips the edition if it is identical to its last delivery, and after an
+    interrupted delivery resends only the volumes that did not go out.
+
+    Args:
+        config: Configuration dictionary
+        args: Parsed command line arguments (force, dry_run)
+        edition: Edition name used for delivery tracking
+        nyt_articles: The edition's articles
+        formatter: EpubFormatter to build it with
+        delivery_state: DeliveryState
+        recipient: Kindle address (default: kindle.email)
+
+    Returns:
+        True if the edition was delivered (or had nothing new to send)
+    """
+    # Skip identical editions (retries, overlapping triggers) before any formatting work
+    current_hash = edition_hash(nyt_articles, config, formatter)
+    if current_hash and not (args.force or args.dry_run) and current_hash == delivery_state.get_edition_hash(edition):
+        logger.info(f"Edition '{edition}' is unchanged since its last delivery ({current_hash[:12]}). Nothing to send.")
+        return True
+
+    # Format articles as EPUB (split into volumes if it would exceed the attachment limit)
+    epub_files = format_news(nyt_articles, config, formatter)
+
+    if not epub_files:
+        logger.error(f"Failed to format edition '{edition}'.")
+        return False
+
+    # Save backup (already saved by formatter)
+    backup_files = [save_backup(epub_file) for epub_file in epub_files]
+    backup_file = ', '.join(f for f in backup_files if f)
+
+    if args.dry_run:
+        logger.info(f"Dry run - not sending. Edition '{edition}' saved to: {backup_file}")
+        return True
+
+    # Send to Kindle, one message per volume; a retry of the same book skips volumes already delivered
+    today = datetime.now().strftime('%m-%d-%y')
+    multi_volume = len(epub_files) > 1
+    sent_volumes = delivery_state.get_sent_volumes(edition, current_hash) if multi_volume and not args.force else set()
+    success = True
+    for number, epub_file in enumerate(epub_files, 1):
+        digest = volume_digest(epub_file) if multi_volume else None
+        if digest in sent_volumes:
+            logger.info(f"Volume {number}/{len(epub_files)} was already delivered, skipping it")
+            continue
+        subject = f'{today} ({number}/{len(epub_files)})' if multi_volume else today
+        if not send_to_kindle(config, epub_file, subject=subject, recipient=recipient):
+            success = False
+            break
+        if multi_volume:
+            delivery_state.record_volume(edition, current_hash, digest)
+
+    # Advance the edition's high-water mark only once the articles are delivered
+    if success:
+        delivery_state.record(edition, nyt_articles, edition_hash=current_hash)
+        if backup_file:
+            logger.info(f"Edition '{edition}' backup saved to: {backup_file}")
+    elif backup_file:
+        logger.info(f"Edition '{edition}' content saved to: {backup_file}")
+    return success
+
+
+def main(argv=None, browser_pool=None):
+    """
+    Main execution function
+
+    Without an editions list one edition is built from every scraped article.
+    With one, the articles are scraped once and each listed edition is built
+    from that pool (its sections, cap, cover and recipient) and sent on its own.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv)
+        browser_pool: Optional BrowserPool supplied by a long-running caller such as the scheduler
+    """
+    args = parse_args(argv)
+
     logger.info("="*80)
     logger.info("Kindle News Delivery - Starting")
     logger.info(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -145,37 +486,85 @@ def main():
     # Load configuration
     config = load_config()
 
+    news_config = config.get('news', {})
+    delta = args.delta or news_config.get('delta', False)
+    cache_dir = config.get('cache', {}).get('directory', 'cache')
+    delivery_state = DeliveryState(os.path.join(cache_dir, 'delivery_state.json'))
+
+    try:
+        editions = select_editions(config, args.edition)
+    except ValueError as e:
+        logger.error(f"{e}. Exiting.")
+        sys.exit(1)
+    names = [spec['name'] for spec in editions] or [args.edition or news_config.get('edition', 'daily')]
+
+    since, exclude_urls = None, None
+    if delta:
+        # One scrape serves every edition: skip only what all of them already have
+        since, exclude_urls = delivery_state.get_common_mark(names)
+        logger.info(f"Delta mode for edition(s) {', '.join(names)}: "
+                    f"{len(exclude_urls)} delivered URLs, last published {since}")
+
     # Scrape news
-    nyt_articles = scrape_news(config)
+    nyt_articles, up_to_date = scrape_news(config, since=since, exclude_urls=exclude_urls, browser_pool=browser_pool)
 
     if not nyt_articles:
+        if up_to_date:
+            logger.info(f"No new articles since the last delivery of {', '.join(names)}. Nothing to send.")
+            return 0
         logger.error("No articles were scraped. Exiting.")
         sys.exit(1)
 
     logger.info(f"Total articles scraped: {len(nyt_articles)} NYT")
 
-    # Format articles as EPUB
-    epub_file = format_news(nyt_articles)
-
-    if not epub_file:
-        logger.error("Failed to format articles. Exiting.")
-        sys.exit(1)
+    # Downscaled grayscale images for the e-ink screen
+    prepare_images(config, nyt_articles)
 
-    # Save backup (already saved by formatter)
-    backup_file = save_backup(epub_file)
-
-    # Send to Kindle
-    success = send_to_kindle(config, epub_file)
+    if not editions:
+        try:
+            formatter = create_formatter(config)
+        except Exception as e:
+            logger.error(f"Failed to create the EPUB formatter: {e}. Exiting.")
+            sys.exit(1)
+        success = deliver_edition(config, args, names[0], nyt_articles, formatter, delivery_state)
+    else:
+        try:
+            assembler = create_assembler(config)
+        except Exception as e:
+            logger.error(f"Failed to create the edition assembler: {e}. Exiting.")
+            sys.exit(1)
+        # Selenium-scraped articles carry no section, so section filters would select nothing
+        has_sections = any(a.get('section') for a in nyt_articles)
+        success = True
+        for spec in editions:
+            name = spec['name']
+            sections = spec.get('sections')
+            if sections and not has_sections:
+                logger.warning(f"Scraped articles have no sections; edition '{name}' gets every article")
+                sections = None
+            articles = assembler.select(nyt_articles, sections, spec.get('max_articles'))
+            if delta:
+                articles = [a for a in articles if is_newer(a, *delivery_state.get_mark(name))]
+            if not articles:
+                logger.info(f"No new articles for edition '{name}'. Nothing to send.")
+                continue
+            formatter = assembler.formatter(
+                name,
+                cover_image_path=spec.get('cover'),
+                dated_cover=spec.get('dated_cover', config.get('epub', {}).get('dated_cover', False)),
+                section_dividers=spec.get('section_dividers')
+            )
+            logger.info(f"Edition '{name}': {len(articles)} articles")
+            if not deliver_edition(config, args, name, articles, formatter, delivery_state, spec.get('recipient')):
+                success = False
+        stats = assembler.chapter_cache.stats()
+        logger.info(f"Chapters rendered: {stats['misses']}, reused across editions: {stats['hits']}")
 
     logger.info("="*80)
     if success:
         logger.info("Kindle News Delivery - Completed Successfully")
-        if backup_file:
-            logger.info(f"Backup saved to: {backup_file}")
     else:
         logger.error("Kindle News Delivery - Failed")
-        if backup_file:
-            logger.info(f"Content saved to: {backup_file}")
     logger.info("="*80)
 
     return 0 if success else 1
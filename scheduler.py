@@ -10,7 +10,7 @@ import logging
 from datetime import datetime
 import sys
 
-from main import main as run_delivery, load_config
+from main import main as run_delivery, load_config, configure_driver_resolver
 
 logging.basicConfig(
     level=logging.INFO,
@@ -23,11 +23,29 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Browsers stay open and logged in between scheduled runs
+browser_pool = None
+
+
+def create_browser_pool(config):
+    """Create the warm browser pool from the selenium section of the config"""
+    from utils import BrowserPool
+
+    configure_driver_resolver(config)
+    selenium_config = config.get('selenium', {})
+    return BrowserPool(
+        headless=True,
+        size=selenium_config.get('pool_size', 1),
+        max_pages=selenium_config.get('max_pages_per_browser', 100),
+        max_memory_mb=selenium_config.get('max_browser_memory_mb', 1500)
+    )
+
+
 def job():
     """Job to run daily"""
     logger.info("Starting scheduled news delivery...")
     try:
-        run_delivery()
+        run_delivery([], browser_pool=browser_pool)
     except Exception as e:
         logger.error(f"Error in scheduled job: {e}", exc_info=True)
 
@@ -45,6 +63,9 @@ def main():
 
     logger.info(f"Scheduled to run daily at {delivery_time}")
 
+    global browser_pool
+    browser_pool = create_browser_pool(config)
+
     # Schedule the job
     schedule.every().day.at(delivery_time).do(job)
 
@@ -63,6 +84,7 @@ def main():
             time.sleep(60)  # Check every minute
     except KeyboardInterrupt:
         logger.info("\nScheduler stopped by user")
+        browser_pool.close()
         sys.exit(0)
 
 
@@ -1,4 +1,36 @@
-from .nyt_scraper_selenium import NYTScraperSelenium
-from .nyt_scraper_api import NYTScraperAPI
+"""
+Scrapers
+Backends are imported on first use, so Selenium and BeautifulSoup are only
+loaded when the browser scraper is actually selected
+"""
 
-__all__ = ['NYTScraperSelenium', 'NYTScraperAPI']
+import importlib
+
+# Registry: backend name -> (module, class name)
+SCRAPERS = {
+    'api': ('.nyt_scraper_api', 'NYTScraperAPI'),
+    'selenium': ('.nyt_scraper_selenium', 'NYTScraperSelenium'),
+}
+
+__all__ = ['NYTScraperSelenium', 'NYTScraperAPI', 'get_scraper']
+
+
+def get_scraper(name):
+    """
+    Get a scraper class by backend name, importing its module on demand
+
+    Args:
+        name: Backend name from SCRAPERS ('api' or 'selenium')
+    """
+    if name not in SCRAPERS:
+        raise ValueError(f"Unknown scraper: {name}")
+    module_name, class_name = SCRAPERS[name]
+    return getattr(importlib.import_module(module_name, __name__), class_name)
+
+
+def __getattr__(name):
+    """Lazy access to scraper classes, e.g. `from scrapers import NYTScraperAPI`"""
+    for backend, (_, class_name) in SCRAPERS.items():
+        if class_name == name:
+            return get_scraper(backend)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
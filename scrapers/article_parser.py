@@ -0,0 +1,63 @@
+"""
+Article Parser
+Extracts headline, byline, date and body text from NYT article HTML
+"""
+
+import logging
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scrapers.parsing import make_soup, ARTICLE_SCOPE
+from scrapers.extraction import default_extractor
+from scrapers.structured_data import extract_article_data
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Fewer structured paragraphs than this means the payload is a teaser, not the body
+MIN_STRUCTURED_PARAGRAPHS = 3
+
+
+def parse_article_html(html, url):
+    """
+    Parse an article page
+
+    Shared by the browser and plain-HTTP fetch paths.
+
+    Args:
+        html: Page HTML
+        url: Article URL
+
+    Returns:
+        Article dictionary, or None if no body text was found
+    """
+    # Structured data first (JSON-LD / preloaded state): no DOM parse when it carries the body
+    structured = extract_article_data(html)
+    if structured and len(structured['paragraphs']) >= MIN_STRUCTURED_PARAGRAPHS:
+        logger.debug("Article extracted from structured data")
+        fields = structured
+        fields['headline'] = fields['headline'] or "No title"
+    else:
+        # Only the article subtrees are built, with the fastest available parser
+        soup = make_soup(html, ARTICLE_SCOPE)
+        fields = default_extractor.extract(soup)
+
+        # Structured metadata is cleaner than DOM text where both exist
+        if structured:
+            for field in ('headline', 'author', 'date'):
+                if structured[field]:
+                    fields[field] = structured[field]
+
+    if not fields['paragraphs']:
+        logger.warning(f"No content found for article: {fields['headline']}")
+        return None
+
+    return {
+        'headline': fields['headline'],
+        'author': fields['author'],
+        'date': fields['date'],
+        'content': '\n\n'.join(fields['paragraphs']),
+        'url': url
+    }
@@ -0,0 +1,247 @@
+"""
+Article Extraction
+Single-pass extractor filling headline, body, byline and date in one walk of the tree
+"""
+
+from bs4 import Tag
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _has_class(tag, wanted):
+    """True if the tag has the given CSS class"""
+    return wanted in (tag.get('class') or ())
+
+
+def _class_contains(tag, fragment):
+    """True if any of the tag's CSS classes contains the fragment (case-insensitive)"""
+    return any(fragment in cls.lower() for cls in (tag.get('class') or ()))
+
+
+# Body container rules in priority order (lower index wins)
+BODY_RULES = [
+    ('section', lambda tag: tag.get('name') == 'articleBody'),
+    ('article', None),
+    ('div', lambda tag: _has_class(tag, 'StoryBodyCompanionColumn')),
+    ('div', lambda tag: _has_class(tag, 'article-body')),
+    ('div', lambda tag: _class_contains(tag, 'article')),
+    ('main', None),
+]
+
+# Byline rules in priority order
+AUTHOR_RULES = [
+    ('span', lambda tag: _has_class(tag, 'last-byline')),
+    ('p', lambda tag: _has_class(tag, 'byline')),
+    ('span', lambda tag: tag.get('itemprop') == 'name'),
+    ('div', lambda tag: _has_class(tag, 'author')),
+]
+
+# Paragraph filters
+MIN_BODY_PARAGRAPH = 20
+MIN_FALLBACK_PARAGRAPH = 50
+FALLBACK_SKIP_WORDS = ('cookie', 'subscribe', 'advertisement', 'sign up')
+
+
+def _compile(rules):
+    """Index rules by tag name: {name: [(rank, predicate), ...]}"""
+    compiled = {}
+    for rank, (name, predicate) in enumerate(rules):
+        compiled.setdefault(name, []).append((rank, predicate))
+    return compiled
+
+
+def _match(compiled, tag):
+    """Best (lowest) rank of a rule matching the tag, or None"""
+    for rank, predicate in compiled.get(tag.name, ()):
+        if predicate is None or predicate(tag):
+            return rank
+    return None
+
+
+class ArticleExtractor:
+    def __init__(self, body_rules=BODY_RULES, author_rules=AUTHOR_RULES):
+        """
+        Initialize the extractor
+
+        Rules are compiled once into per-tag-name lookup tables, so each
+        node of the document is tested against only the rules for its tag.
+
+        Args:
+            body_rules: (tag name, predicate or None) body container rules, best first
+            author_rules: (tag name, predicate or None) byline rules, best first
+        """
+        self.body_rules = _compile(body_rules)
+        self.author_rules = _compile(author_rules)
+
+    def extract(self, soup):
+        """
+        Extract article fields in a single walk over the document
+
+        The body is the paragraphs of the first container matching the best
+        body rule; if it has none, substantive paragraphs from anywhere on the
+        page are used instead.
+
+        Args:
+            soup: BeautifulSoup document (may be scoped)
+
+        Returns:
+            Dictionary with 'headline', 'author', 'date' and 'paragraphs'
+        """
+        headline = None
+        date_text = None
+        author_tag, author_rank = None, None
+        containers = {}      # rank -> first container element
+        container_rank = {}  # id(container element) -> rank
+        paragraphs = {}      # rank -> paragraph texts inside that container
+        fallback = []
+
+        for node in soup.descendants:
+            if not isinstance(node, Tag):
+                continue
+            name = node.name
+
+            if name == 'h1' and headline is None:
+                headline = node.get_text(strip=True)
+            elif name == 'time' and date_text is None:
+                date_text = node.get('datetime', '') or node.get_text(strip=True)
+
+            rank = _match(self.author_rules, node)
+            if rank is not None and (author_rank is None or rank < author_rank):
+                author_tag, author_rank = node, rank
+
+            rank = _match(self.body_rules, node)
+            if rank is not None and rank not in containers:
+                containers[rank] = node
+                container_rank[id(node)] = rank
+
+            if name == 'p':
+                text = node.get_text(strip=True)
+                if not text:
+                    continue
+
+                # Containers precede their paragraphs in document order, so every
+                # enclosing container is already known when a paragraph is reached
+                if len(text) > MIN_BODY_PARAGRAPH:
+                    for parent in node.parents:
+                        parent_rank = container_rank.get(id(parent))
+                        if parent_rank is not None:
+                            paragraphs.setdefault(parent_rank, []).append(text)
+
+                if len(text) > MIN_FALLBACK_PARAGRAPH:
+                    lowered = text.lower()
+                    if not any(skip in lowered for skip in FALLBACK_SKIP_WORDS):
+                        fallback.append(text)
+
+        body = []
+        if containers:
+            best = min(containers)
+            logger.debug(f"Found article body with rule {best}: <{containers[best].name}>")
+            body = paragraphs.get(best, [])
+
+        if not body:
+            logger.warning("No article body found with selectors, trying all p tags")
+            body = fallback
+
+        author_text = ""
+        if author_tag is not None:
+            # Clean up common prefixes
+            author_text = author_tag.get_text(strip=True).replace('By ', '').replace('by ', '')
+
+        return {
+            'headline': headline if headline is not None else "No title",
+            'author': author_text,
+            'date': date_text or "",
+            'paragraphs': body,
+        }
+
+
+# Shared instance - rules are compiled once per process
+default_extractor = ArticleExtractor()
+
+
+# In-page counterpart of ArticleExtractor, run inside the browser so only a small
+# JSON object (not the multi-megabyte page source) crosses the WebDriver wire.
+# Takes one argument: whether to also collect story links (section pages).
+IN_PAGE_EXTRACTION_SCRIPT = r"""
+function (includeLinks) {
+    const text = el => (el && el.textContent || '').replace(/\s+/g, ' ').trim();
+    const result = {headline: '', byline: '', date: '', paragraphs: [], links: []};
+
+    // Structured data first
+    for (const script of document.querySelectorAll('script[type="application/ld+json"]')) {
+        let data;
+        try { data = JSON.parse(script.textContent); } catch (e) { continue; }
+        const items = [].concat(data).flatMap(d => (d && d['@graph']) ? [d].concat(d['@graph']) : [d]);
+        for (const item of items) {
+            if (!item || typeof item !== 'object') continue;
+            const types = [].concat(item['@type'] || []);
+            if (!result.headline && types.some(t => /Article$/.test(t))) {
+                result.headline = item.headline || '';
+                result.date = item.datePublished || '';
+                result.byline = [].concat(item.author || [])
+                    .map(a => (a && a.name) || (typeof a === 'string' ? a : ''))
+                    .filter(Boolean).join(' and ');
+            }
+            if (includeLinks) {
+                for (const list of [item, item.mainEntity]) {
+                    if (!list || !Array.isArray(list.itemListElement)) continue;
+                    for (const element of list.itemListElement) {
+                        const entry = (element && element.item) || element || {};
+                        const url = entry.url || (element && element.url);
+                        if (url) result.links.push({url: url, headline: entry.name || entry.headline || ''});
+                    }
+                }
+            }
+        }
+    }
+
+    if (!result.headline) {
+        const h1 = document.querySelector('h1');
+        result.headline = h1 ? text(h1) : '';
+    }
+    if (!result.date) {
+        const time = document.querySelector('time');
+        if (time) result.date = time.getAttribute('datetime') || text(time);
+    }
+    if (!result.byline) {
+        for (const selector of ['span.last-byline', 'p.byline', 'span[itemprop="name"]', 'div.author']) {
+            const el = document.querySelector(selector);
+            if (el) { result.byline = text(el).replace(/\bby /gi, ''); break; }
+        }
+    }
+
+    const bodySelectors = [
+        'section[name="articleBody"]', 'article', 'div.StoryBodyCompanionColumn',
+        'div.article-body', 'div[class*="article" i]', 'main'
+    ];
+    for (const selector of bodySelectors) {
+        const body = document.querySelector(selector);
+        if (!body) continue;
+        result.paragraphs = Array.from(body.querySelectorAll('p')).map(text).filter(t => t.length > 20);
+        break;
+    }
+    if (!result.paragraphs.length) {
+        const skip = /cookie|subscribe|advertisement|sign up/i;
+        result.paragraphs = Array.from(document.querySelectorAll('p')).map(text)
+            .filter(t => t.length > 50 && !skip.test(t));
+    }
+
+    if (includeLinks && !result.links.length) {
+        const seen = new Set();
+        const anchors = Array.from(document.querySelectorAll(
+            'article a[href], .story-wrapper a[href], h2 a[href], h3 a[href]'
+        )).concat(Array.from(document.querySelectorAll('h2, h3')).map(h => h.closest('a[href]')).filter(Boolean));
+        for (const a of anchors) {
+            if (seen.has(a.href)) continue;
+            seen.add(a.href);
+            const heading = a.querySelector('h1, h2, h3, h4');
+            result.links.push({url: a.href, headline: text(a) || text(heading)});
+            if (result.links.length >= 200) break;
+        }
+    }
+
+    return result;
+}
+"""
@@ -0,0 +1,102 @@
+"""
+NYT HTTP Article Fetcher
+Fetches article pages over plain HTTP using cookies from a logged-in browser
+"""
+
+import requests
+import logging
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.http_client import HttpClient
+from scrapers.article_parser import parse_article_html
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Markers of a paywall / registration wall or a page that only renders with JavaScript
+PAYWALL_MARKERS = (
+    'id="gateway-content"',
+    'data-testid="paywall',
+)
+BLOCKED_URL_PARTS = ('/auth/login', 'myaccount.nytimes.com', '/subscription')
+
+# Below this amount of body text the page is treated as truncated by a paywall
+MIN_PARAGRAPHS = 3
+MIN_CONTENT_CHARS = 600
+
+
+class NYTHttpFetcher:
+    def __init__(self, cookies, user_agent=None, http_client=None):
+        """
+        Initialize the HTTP fetcher
+
+        Args:
+            cookies: Cookie dictionaries exported from a logged-in browser
+            user_agent: User agent of that browser (sessions can be tied to it)
+            http_client: Optional HttpClient; by default a dedicated pooled client
+                         is used so NYT cookies never leak to other hosts' requests
+        """
+        self.http = http_client or HttpClient(cache_dir=None)
+        if user_agent:
+            self.http.session.headers['User-Agent'] = user_agent
+        self.http.session.headers['Accept'] = 'text/html,application/xhtml+xml'
+        self.http.session.headers['Accept-Language'] = 'en-US,en;q=0.9'
+
+        for cookie in cookies:
+            self.http.session.cookies.set(
+                cookie['name'],
+                cookie['value'],
+                domain=cookie.get('domain'),
+                path=cookie.get('path', '/')
+            )
+
+    def _is_blocked(self, response, html):
+        """Detect a paywall, login redirect or JS-only shell"""
+        if response.status_code in (401, 402, 403):
+            return True
+        if any(part in response.url for part in BLOCKED_URL_PARTS):
+            return True
+        return any(marker in html for marker in PAYWALL_MARKERS)
+
+    def fetch(self, url):
+        """
+        Fetch and parse an article over HTTP
+
+        Args:
+            url: Article URL
+
+        Returns:
+            Article dictionary, or None if the page needs the browser
+            (paywall, login wall, JS-only render, or an error)
+        """
+        try:
+            response = self.http.get(url, timeout=30)
+            html = response.text
+
+            if self._is_blocked(response, html):
+                logger.info(f"Paywall or login wall over HTTP, needs browser: {url}")
+                return None
+            response.raise_for_status()
+
+            article = parse_article_html(html, url)
+            if not article:
+                return None
+
+            paragraphs = article['content'].split('\n\n')
+            if len(paragraphs) < MIN_PARAGRAPHS or len(article['content']) < MIN_CONTENT_CHARS:
+                logger.info(f"Article body looks truncated over HTTP, needs browser: {url}")
+                return None
+
+            logger.info(f"Fetched article over HTTP: {article['headline']}")
+            return article
+
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"HTTP fetch failed for {url}: {e}")
+            return None
+
+    def close(self):
+        """Close pooled connections"""
+        self.http.close()
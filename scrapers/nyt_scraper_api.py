@@ -4,24 +4,76 @@ Uses official NYT API to fetch articles - more reliable than web scraping
 """
 
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import zip_longest
 import logging
 import time
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.http_client import SERVER_ERROR_STATUSES, get_shared_client, retry_after
+from utils.delivery_state import is_newer
+from utils.rate_limiter import QuotaExceeded
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Most Popular API lists
+POPULAR_KINDS = ('viewed', 'emailed', 'shared')
+
 
 class NYTScraperAPI:
-    def __init__(self, api_key):
+    def __init__(self, api_key, http_client=None, cache_dir='cache', article_store=None, rate_limiter=None,
+                 rate_limit_retries=2):
         """
         Initialize NYT API Scraper
 
         Args:
             api_key: NYT API key
+            http_client: Optional HttpClient (defaults to the process-wide pooled client)
+            cache_dir: Base directory for on-disk caches
+            article_store: Optional ArticleStore; stored full-text copies replace the abstract
+            rate_limiter: Optional QuotaGovernor shared with other processes using the same key
+            rate_limit_retries: Times to retry a 429 response, each retry taking a new token
         """
         self.api_key = api_key
+        self.article_store = article_store
+        self.rate_limiter = rate_limiter
+        self.rate_limit_retries = rate_limit_retries
         self.base_url = "https://api.nytimes.com/svc"
+        # 429s are retried here rather than in the adapter, so every attempt is metered by the governor
+        self.http = http_client or get_shared_client(
+            os.path.join(cache_dir, 'http'), retry_statuses=SERVER_ERROR_STATUSES
+        )
+        # Outcome of the last scrape(): articles listed, and how many of them were already delivered
+        self.candidates = 0
+        self.already_delivered = 0
+
+    def _get_json(self, url):
+        """
+        Fetch a JSON payload from the API over the pooled, revalidating client
+
+        Every attempt, including a retry after 429 Too Many Requests, takes a
+        token from the rate limiter first. The Retry-After wait is capped.
+        """
+        params = {
+            'api-key': self.api_key
+        }
+        for attempt in range(self.rate_limit_retries + 1):
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            try:
+                return self.http.get_json(url, params=params, timeout=30)
+            except requests.exceptions.HTTPError as e:
+                response = e.response
+                if response is None or response.status_code != 429 or attempt == self.rate_limit_retries:
+                    raise
+                delay = retry_after(response)
+                logger.warning(f"NYT API rate limited (429), retrying in {delay:.1f}s")
+                time.sleep(delay)
 
     def get_top_stories(self, section='business', max_articles=10):
         """
@@ -40,14 +92,7 @@ class NYTScraperAPI:
             # Top Stories API endpoint
             url = f"{self.base_url}/topstories/v2/{section}.json"
 
-            params = {
-                'api-key': self.api_key
-            }
-
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-
-            data = response.json()
+            data = self._get_json(url)
 
             if data.get('status') != 'OK':
                 logger.error(f"API returned non-OK status: {data.get('status')}")
@@ -64,8 +109,12 @@ class NYTScraperAPI:
                     'date': item.get('published_date', ''),
                     'abstract': item.get('abstract', ''),
                     'url': item.get('url', ''),
-                    'content': self._format_article_content(item)
+                    'section': item.get('section', ''),
+                    'image_urls': self._image_urls(item),
+                    'content': self._format_article_content(item),
+                    'full_text': False
                 }
+                self._apply_stored_content(article, item)
 
                 articles.append(article)
                 logger.info(f"Found article: {article['headline']}")
@@ -73,6 +122,10 @@ class NYTScraperAPI:
             logger.info(f"Successfully fetched {len(articles)} articles from NYT API")
             return articles
 
+        except QuotaExceeded as e:
+            # Not an empty feed: let the caller fall back to another source
+            logger.error(f"NYT API quota exhausted: {e}")
+            raise
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching from NYT API: {e}")
             return []
@@ -80,31 +133,25 @@ class NYTScraperAPI:
             logger.error(f"Unexpected error: {e}")
             return []
 
-    def get_most_popular(self, period=1, max_articles=10):
+    def get_most_popular(self, period=1, max_articles=10, kind='viewed'):
         """
         Fetch most popular articles from NYT Most Popular API
 
         Args:
             period: Time period in days (1, 7, or 30)
             max_articles: Maximum number of articles to return
+            kind: Popularity list (viewed, emailed, or shared)
 
         Returns:
             List of article dictionaries
         """
         try:
-            logger.info(f"Fetching most popular articles from past {period} day(s) via API...")
-
-            # Most Popular API endpoint - most viewed
-            url = f"{self.base_url}/mostpopular/v2/viewed/{period}.json"
-
-            params = {
-                'api-key': self.api_key
-            }
+            logger.info(f"Fetching most {kind} articles from past {period} day(s) via API...")
 
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
+            # Most Popular API endpoint - most viewed/emailed/shared
+            url = f"{self.base_url}/mostpopular/v2/{kind}/{period}.json"
 
-            data = response.json()
+            data = self._get_json(url)
 
             if data.get('status') != 'OK':
                 logger.error(f"API returned non-OK status: {data.get('status')}")
@@ -121,8 +168,12 @@ class NYTScraperAPI:
                     'date': item.get('published_date', ''),
                     'abstract': item.get('abstract', ''),
                     'url': item.get('url', ''),
-                    'content': self._format_article_content(item)
+                    'section': item.get('section', ''),
+                    'image_urls': self._image_urls(item),
+                    'content': self._format_article_content(item),
+                    'full_text': False
                 }
+                self._apply_stored_content(article, item)
 
                 articles.append(article)
                 logger.info(f"Found article: {article['headline']}")
@@ -130,6 +181,10 @@ class NYTScraperAPI:
             logger.info(f"Successfully fetched {len(articles)} popular articles from NYT API")
             return articles
 
+        except QuotaExceeded as e:
+            # Not an empty feed: let the caller fall back to another source
+            logger.error(f"NYT API quota exhausted: {e}")
+            raise
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching from NYT API: {e}")
             return []
@@ -137,6 +192,45 @@ class NYTScraperAPI:
             logger.error(f"Unexpected error: {e}")
             return []
 
+    def _apply_stored_content(self, article, item):
+        """Replace the abstract-only content with a stored full-text copy, unless the story was updated since"""
+        if not self.article_store or not article['url']:
+            return
+
+        stored = self.article_store.get(
+            article['url'],
+            updated_after=item.get('updated_date') or item.get('updated')
+        )
+        if stored and stored.get('content'):
+            article['content'] = stored['content']
+            article['full_text'] = True
+            if stored.get('author') and not article['author']:
+                article['author'] = stored['author']
+
+    def _image_urls(self, item):
+        """
+        Pick the largest rendition of each image attached to an API result
+
+        Top Stories lists renditions under 'multimedia'; Most Popular nests
+        them under 'media' -> 'media-metadata'.
+
+        Returns:
+            List of {'url', 'caption'} dictionaries
+        """
+        images = []
+        multimedia = [m for m in item.get('multimedia') or [] if m.get('type', 'image') == 'image']
+        if multimedia:
+            largest = max(multimedia, key=lambda m: m.get('width') or 0)
+            images.append({'url': largest.get('url'), 'caption': largest.get('caption', '')})
+
+        for media in item.get('media') or []:
+            renditions = media.get('media-metadata') or []
+            if media.get('type') == 'image' and renditions:
+                largest = max(renditions, key=lambda m: m.get('width') or 0)
+                images.append({'url': largest.get('url'), 'caption': media.get('caption', '')})
+
+        return [image for image in images if image['url']]
+
     def _format_article_content(self, item):
         """
         Format article content from API response
@@ -168,21 +262,112 @@ class NYTScraperAPI:
 
         return '\n\n'.join(parts) if parts else 'Content not available via API.'
 
-    def scrape(self, max_articles=10, use_popular=False):
+    def fetch_feed(self, feed, max_articles=10):
+        """
+        Fetch a single feed by name
+
+        Args:
+            feed: Feed spec such as 'topstories/business', 'mostpopular/viewed'
+                  or 'mostpopular/emailed/7'. A bare name is treated as a
+                  Top Stories section.
+            max_articles: Maximum number of articles to return
+
+        Returns:
+            List of article dictionaries
+        """
+        parts = feed.strip('/').split('/')
+
+        if parts[0] == 'mostpopular':
+            kind = parts[1] if len(parts) > 1 else 'viewed'
+            period = int(parts[2]) if len(parts) > 2 else 1
+            if kind not in POPULAR_KINDS:
+                logger.error(f"Unknown Most Popular list: {kind}")
+                return []
+            return self.get_most_popular(period=period, max_articles=max_articles, kind=kind)
+
+        if parts[0] == 'topstories':
+            section = parts[1] if len(parts) > 1 else 'home'
+        else:
+            section = parts[0]
+        return self.get_top_stories(section=section, max_articles=max_articles)
+
+    def scrape_feeds(self, feeds, max_articles=10, max_workers=4):
+        """
+        Fetch several feeds concurrently, then merge and dedupe by URL
+
+        Feeds are fetched on a bounded thread pool so the total time is close
+        to the slowest single request. Results are interleaved round-robin in
+        feed order so every feed is represented before any is exhausted.
+
+        Args:
+            feeds: List of feed specs (see fetch_feed)
+            max_articles: Maximum number of articles to return in total
+            max_workers: Maximum number of concurrent requests
+
+        Returns:
+            List of article dictionaries
+        """
+        logger.info(f"Fetching {len(feeds)} feeds concurrently: {', '.join(feeds)}")
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(feeds)))) as executor:
+            feed_results = list(executor.map(
+                lambda feed: self.fetch_feed(feed, max_articles=max_articles),
+                feeds
+            ))
+
+        articles = []
+        seen_urls = set()
+        for round_items in zip_longest(*feed_results):
+            for article in round_items:
+                if article is None or not article.get('url') or article['url'] in seen_urls:
+                    continue
+                seen_urls.add(article['url'])
+                articles.append(article)
+
+        articles = articles[:max_articles]
+        logger.info(f"Merged {len(articles)} unique articles from {len(feeds)} feeds")
+        return articles
+
+    def scrape(self, max_articles=10, use_popular=False, feeds=None, max_workers=4,
+               since=None, exclude_urls=None):
         """
         Main scraping function - compatible with existing code interface
 
+        After the call, self.candidates is the number of articles the feeds
+        returned and self.already_delivered how many of them the delta filter
+        dropped, so an empty result can be told apart from a failed request.
+
         Args:
             max_articles: Maximum number of articles to fetch
             use_popular: If True, use Most Popular API instead of Top Stories
+            feeds: Optional list of feed specs to fetch concurrently (see fetch_feed)
+            max_workers: Maximum number of concurrent feed requests
+            since: Delta mode - only return articles published after this ISO timestamp
+            exclude_urls: Delta mode - set of canonical URLs that were already delivered
 
         Returns:
             List of article dictionaries
         """
-        if use_popular:
-            return self.get_most_popular(period=1, max_articles=max_articles)
+        delta = bool(since or exclude_urls)
+        # In delta mode look further down the feeds, since the top entries are usually already delivered
+        candidate_limit = max_articles * 3 if delta else max_articles
+
+        if feeds:
+            articles = self.scrape_feeds(feeds, max_articles=candidate_limit, max_workers=max_workers)
+        elif use_popular:
+            articles = self.get_most_popular(period=1, max_articles=candidate_limit)
         else:
-            return self.get_top_stories(section='business', max_articles=max_articles)
+            articles = self.get_top_stories(section='business', max_articles=candidate_limit)
+        self.candidates = len(articles)
+        self.already_delivered = 0
+
+        if delta:
+            new_articles = [a for a in articles if is_newer(a, since, exclude_urls)]
+            self.already_delivered = len(articles) - len(new_articles)
+            logger.info(f"Delta mode: {len(new_articles)} of {len(articles)} candidates are new")
+            articles = new_articles
+
+        return articles[:max_articles]
 
 
 if __name__ == "__main__":
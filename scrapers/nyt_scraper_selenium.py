@@ -6,8 +6,10 @@ More reliable scraper using Selenium WebDriver for authentication
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime
+import queue
+import threading
 import time
 import random
 import logging
@@ -16,37 +18,97 @@ import os
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.webdriver_manager import WebDriverManager
+from utils.webdriver_manager import WebDriverManager, USER_AGENT
+from utils.delivery_state import is_newer
+from utils.rate_limiter import HostThrottle
+from scrapers.article_parser import parse_article_html
+from scrapers.parsing import make_soup, SECTION_SCOPE
+from scrapers.structured_data import extract_story_links
+from scrapers.extraction import IN_PAGE_EXTRACTION_SCRIPT
+from scrapers.nyt_http_fetcher import NYTHttpFetcher
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Account page (redirects to the login form when signed out) and the login cookie
+ACCOUNT_URL = "https://myaccount.nytimes.com/"
+SESSION_COOKIE = "NYT-S"
+
 
 class NYTScraperSelenium:
-    def __init__(self, email, password, headless=True):
+    def __init__(self, email, password, headless=True, article_store=None, refresh=False, browser_pool=None,
+                 workers=1, throttle=None, hybrid=False, extraction='in_page', pipeline=False,
+                 parse_workers=2, parse_processes=False, session_store=None, profile_dir=None):
+        """
+        Initialize NYT Selenium Scraper
+
+        Args:
+            email: NYT subscriber email
+            password: NYT subscriber password
+            headless: Run browser in headless mode
+            article_store: Optional ArticleStore; articles already stored are not refetched
+            refresh: If True, refetch every article even when it is stored
+            browser_pool: Optional BrowserPool; a warm, already logged-in browser is
+                          leased from it instead of starting (and quitting) a new one
+            workers: Number of browsers fetching article bodies in parallel
+            throttle: Optional HostThrottle limiting concurrent/rapid requests per host
+            hybrid: Fetch article pages over plain HTTP with the login cookies,
+                    using the browser only for paywalled or JS-only pages
+            extraction: 'in_page' to extract fields inside the browser and return only
+                        them, or 'html' to transfer page_source and parse it in Python
+                        (in_page falls back to html when it finds no body)
+            pipeline: With a single browser, load the next article while the previous
+                      page is parsed on a worker pool
+            parse_workers: Size of the pipeline's parse pool
+            parse_processes: Parse in worker processes instead of threads
+            session_store: Optional SessionStore; a saved, still valid login session is
+                           restored instead of logging in again
+            profile_dir: Optional Chrome user-data-dir for the login browser, reused
+                         between runs (keeps cookies and cached static assets)
+        """
         self.email = email
         self.password = password
         self.headless = headless
-        self.wm = WebDriverManager(headless=headless)
+        self.article_store = article_store
+        self.refresh = refresh
+        self.browser_pool = browser_pool
+        self.workers = max(1, workers)
+        self.throttle = throttle or HostThrottle(max_concurrent=self.workers, min_interval=1.0)
+        self.hybrid = hybrid
+        self.extraction = extraction
+        self.pipeline = pipeline
+        self.parse_workers = max(1, parse_workers)
+        self.parse_processes = parse_processes
+        self.http_fetcher = None
+        self.session_store = session_store
+        self.wm = WebDriverManager(headless=headless, user_data_dir=profile_dir)
         self.driver = None
+        # Outcome of the last scrape(): articles listed, and how many of them were already delivered
+        self.candidates = 0
+        self.already_delivered = 0
 
     def login(self):
         """Login to NYT with subscriber credentials using Selenium"""
         try:
+            self.driver = self.wm.get_driver()
+            if self.wm.authenticated:
+                logger.info("Reusing logged-in NYT browser session")
+                self.wm.use_profile_blocking('article')
+                return True
+
+            if self._restore_session():
+                return True
+
             logger.info("Logging into NYT with Selenium...")
-            self.driver = self.wm.create_driver()
+            ready = self.wm.readiness()
 
             # Navigate to NYT login page
             login_url = "https://myaccount.nytimes.com/auth/login"
-            self.driver.get(login_url)
-
-            # Longer initial wait to let page fully load and appear more human-like
-            time.sleep(5)
+            self.wm.navigate(login_url)
+            ready.wait_for_document_ready(timeout=15, state='interactive')
 
-            # Wait for and fill in email - try multiple strategies
-            email_field = None
+            # Wait for and fill in email - probe all selectors together
             try:
-                # Try different selectors for email field
                 email_selectors = [
                     (By.ID, "email"),
                     (By.NAME, "email"),
@@ -55,16 +117,10 @@ class NYTScraperSelenium:
                     (By.XPATH, "//input[@name='email']")
                 ]
 
-                for by_type, selector in email_selectors:
-                    try:
-                        email_field = self.wm.wait_for_element(by_type, selector, timeout=5)
-                        if email_field:
-                            logger.info(f"Found email field with {by_type}: {selector}")
-                            break
-                    except:
-                        continue
+                email_field, selector = ready.find_first(email_selectors, timeout=15)
 
                 if email_field:
+                    logger.info(f"Found email field with {selector[0]}: {selector[1]}")
                     email_field.clear()
                     time.sleep(random.uniform(0.5, 1.5))  # Random delay to appear human
                     email_field.send_keys(self.email)
@@ -79,84 +135,66 @@ class NYTScraperSelenium:
                 self.wm.take_screenshot("nyt_email_error.png")
                 return False
 
-            # Click continue/next button if exists
+            password_selectors = [
+                (By.ID, "password"),
+                (By.NAME, "password"),
+                (By.CSS_SELECTOR, "input[type='password']"),
+                (By.XPATH, "//input[@type='password']")
+            ]
+
+            # Click continue/next button if exists (the password field may already be shown)
             try:
                 continue_selectors = [
-                    "//button[contains(text(), 'Continue')]",
-                    "//button[contains(text(), 'continue')]",
-                    "//button[@type='submit']"
+                    (By.XPATH, "//button[contains(text(), 'Continue')]"),
+                    (By.XPATH, "//button[contains(text(), 'continue')]"),
+                    (By.XPATH, "//button[@type='submit']")
                 ]
 
-                for selector in continue_selectors:
-                    try:
-                        continue_button = self.driver.find_element(By.XPATH, selector)
+                password_field, _ = ready.find_first(password_selectors, timeout=0, clickable=True)
+                if not password_field:
+                    continue_button, _ = ready.find_first(continue_selectors, timeout=3, clickable=True)
+                    if continue_button:
                         continue_button.click()
                         logger.info("Clicked Continue button")
-                        time.sleep(random.uniform(2.5, 4.5))  # Random delay
-                        break
-                    except:
-                        continue
-            except:
+            except Exception:
                 pass  # Button might not exist, continue anyway
 
-            # Wait for and fill in password - try multiple strategies
-            password_field = None
+            # Wait for and fill in password once it is interactable
             password_entered = False
             try:
-                # Wait longer for page to load after Continue
-                time.sleep(4)
-
-                # Try different selectors for password field
-                password_selectors = [
-                    (By.ID, "password"),
-                    (By.NAME, "password"),
-                    (By.CSS_SELECTOR, "input[type='password']"),
-                    (By.XPATH, "//input[@type='password']")
-                ]
+                password_field, selector = ready.find_first(password_selectors, timeout=20, clickable=True)
+
+                if password_field:
+                    logger.info(f"Found clickable password field with {selector[0]}: {selector[1]}")
+
+                    # Let the form's scripts settle before interacting
+                    ready.wait_for_dom_quiet(quiet_ms=300, timeout=2)
 
-                for by_type, selector in password_selectors:
+                    # Try to interact with the field
                     try:
-                        # Use wait_for_clickable instead for better interaction readiness
-                        password_field = self.wm.wait_for_clickable(by_type, selector, timeout=10)
-                        if password_field:
-                            logger.info(f"Found clickable password field with {by_type}: {selector}")
-
-                            # Additional wait for JavaScript to finish
-                            time.sleep(1)
-
-                            # Try to interact with the field
-                            try:
-                                # Use JavaScript to set value as fallback
-                                self.driver.execute_script(
-                                    "arguments[0].value = arguments[1];",
-                                    password_field,
-                                    self.password
-                                )
-                                # Trigger input event
-                                self.driver.execute_script(
-                                    "arguments[0].dispatchEvent(new Event('input', { bubbles: true }));",
-                                    password_field
-                                )
-                                logger.info("Entered password via JavaScript")
-                                password_entered = True
-                                break
-                            except Exception as js_error:
-                                logger.warning(f"JavaScript method failed: {js_error}, trying send_keys")
-                                try:
-                                    password_field.click()
-                                    time.sleep(0.5)
-                                    password_field.clear()
-                                    password_field.send_keys(self.password)
-                                    logger.info("Entered password via send_keys")
-                                    password_entered = True
-                                    break
-                                except Exception as send_error:
-                                    logger.warning(f"send_keys failed: {send_error}")
-                                    continue
-
-                    except Exception as e:
-                        logger.warning(f"Failed with {by_type} {selector}: {str(e)[:100]}")
-                        continue
+                        # Use JavaScript to set value as fallback
+                        self.driver.execute_script(
+                            "arguments[0].value = arguments[1];",
+                            password_field,
+                            self.password
+                        )
+                        # Trigger input event
+                        self.driver.execute_script(
+                            "arguments[0].dispatchEvent(new Event('input', { bubbles: true }));",
+                            password_field
+                        )
+                        logger.info("Entered password via JavaScript")
+                        password_entered = True
+                    except Exception as js_error:
+                        logger.warning(f"JavaScript method failed: {js_error}, trying send_keys")
+                        try:
+                            password_field.click()
+                            password_field.clear()
+                            password_field.send_keys(self.password)
+                            logger.info("Entered password via send_keys")
+                            password_entered = True
+                        except Exception as send_error:
+                            logger.warning(f"send_keys failed: {send_error}")
 
                 if not password_entered:
                     logger.error("Could not enter password with any method")
@@ -172,22 +210,16 @@ class NYTScraperSelenium:
             # Click submit/login button - handle potential CAPTCHA
             try:
                 submit_selectors = [
-                    "//button[@type='submit']",
-                    "//button[contains(text(), 'Log in')]",
-                    "//button[contains(text(), 'Login')]",
+                    (By.XPATH, "//button[@type='submit']"),
+                    (By.XPATH, "//button[contains(text(), 'Log in')]"),
+                    (By.XPATH, "//button[contains(text(), 'Login')]"),
                 ]
 
-                submit_button = None
-                for selector in submit_selectors:
-                    try:
-                        submit_button = self.wm.wait_for_clickable(By.XPATH, selector, timeout=5)
-                        if submit_button:
-                            break
-                    except:
-                        continue
+                submit_button, _ = ready.find_first(submit_selectors, timeout=5, clickable=True)
 
                 if submit_button:
                     # Try JavaScript click if regular click is intercepted
+                    login_timeout = 20
                     try:
                         submit_button.click()
                         logger.info("Clicked submit button")
@@ -201,11 +233,18 @@ class NYTScraperSelenium:
                             # Check for CAPTCHA
                             if "captcha" in str(click_error).lower() or "intercepted" in str(click_error).lower():
                                 logger.error("CAPTCHA or overlay detected - waiting longer")
-                                time.sleep(20)  # Extended wait for CAPTCHA
+                                login_timeout = 40  # Extended wait for CAPTCHA
                             else:
                                 return False
 
-                    time.sleep(10)  # Wait longer for login to complete
+                    # Wait for the login redirect instead of a fixed delay
+                    redirected = ready.wait_until(
+                        lambda: "auth/login" not in self.driver.current_url,
+                        timeout=login_timeout,
+                        description="login redirect"
+                    )
+                    if redirected:
+                        ready.wait_for_document_ready(timeout=10, state='interactive')
                 else:
                     logger.error("Could not find submit button")
                     return False
@@ -214,13 +253,18 @@ class NYTScraperSelenium:
                 logger.error(f"Error clicking submit: {e}")
                 return False
 
-            # Check if login was successful
+            # Check if login was successful: the browser must have left the login form
             current_url = self.driver.current_url
-            if "auth/login" not in current_url or "nytimes.com" in current_url:
+            if redirected and "auth/login" not in current_url:
                 logger.info("Successfully logged into NYT")
+                self.wm.authenticated = True
+                if self.session_store:
+                    self.session_store.save(self.wm.export_cookies())
+                # From here on only section and article pages are loaded
+                self.wm.use_profile_blocking('article')
                 return True
             else:
-                logger.error(f"Login may have failed. Current URL: {current_url}")
+                logger.error(f"Login failed. Current URL: {current_url}")
                 # Take screenshot for debugging
                 self.wm.take_screenshot("nyt_login_failed.png")
                 return False
@@ -229,6 +273,45 @@ class NYTScraperSelenium:
             logger.error(f"Error during NYT login: {e}")
             return False
 
+    def _session_is_valid(self):
+        """Open the account page and check it does not redirect to the login form"""
+        self.wm.navigate(ACCOUNT_URL)
+        self.wm.readiness().wait_for_document_ready(timeout=15, state='interactive')
+        return "auth/login" not in self.driver.current_url
+
+    def _restore_session(self):
+        """
+        Reuse a login saved by an earlier run (encrypted cookies and/or the browser profile)
+
+        Returns:
+            True if the browser is now logged in without going through login()
+        """
+        cookies = self.session_store.load() if self.session_store else None
+        if cookies and not any(c['name'] == SESSION_COOKIE for c in cookies):
+            logger.info("Saved login session has expired")
+            self.session_store.clear()
+            cookies = None
+
+        if not cookies and not self.wm.user_data_dir:
+            return False
+
+        try:
+            if cookies:
+                self.wm.import_cookies(cookies, "https://www.nytimes.com/")
+            if not self._session_is_valid():
+                logger.info("Saved login session is no longer valid, logging in again")
+                if self.session_store:
+                    self.session_store.clear()
+                return False
+        except Exception as e:
+            logger.warning(f"Could not restore saved login session: {e}")
+            return False
+
+        logger.info("Restored saved NYT login session")
+        self.wm.authenticated = True
+        self.wm.use_profile_blocking('article')
+        return True
+
     def get_todays_articles(self, max_articles=10):
         """Fetch today's top articles from NYT Business section"""
         try:
@@ -247,15 +330,45 @@ class NYTScraperSelenium:
                     break
 
                 logger.info(f"Trying URL: {url}")
-                self.driver.get(url)
-                time.sleep(3)
+                self.wm.navigate(url)
+                ready = self.wm.readiness()
+                ready.wait_for_selector("article, div.story-wrapper, section.story-wrapper", timeout=10)
 
                 # Scroll to load more content
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-                time.sleep(2)
+                ready.wait_for_dom_quiet(quiet_ms=500, timeout=3)
+
+                if self.extraction == 'in_page':
+                    links = self._in_page_links()
+                    if links:
+                        for link in links:
+                            if len(articles) >= max_articles:
+                                break
+                            self._add_story(articles, link['url'], link['headline'])
+                        continue
+
+                page_source = self.driver.page_source
+
+                # Structured data first: the JSON-LD story list needs no DOM parse
+                for story in extract_story_links(page_source):
+                    if len(articles) >= max_articles:
+                        break
+                    article_url = story['url']
+                    if article_url.startswith('/'):
+                        article_url = 'https://www.nytimes.com' + article_url
+                    if article_url not in [a['url'] for a in articles]:
+                        headline = story['headline'] or article_url
+                        logger.info(f"Found article: {headline}")
+                        articles.append({
+                            'headline': headline,
+                            'url': article_url
+                        })
 
-                # Get page source and parse with BeautifulSoup
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+                if len(articles) >= max_articles:
+                    continue
+
+                # Fall back to DOM heuristics - parse only the story blocks and links
+                soup = make_soup(page_source, SECTION_SCOPE)
 
                 # Find article links - NYT uses various structures
                 selectors = [
@@ -283,17 +396,6 @@ class NYTScraperSelenium:
                         link = element.find_parent('a')
 
                     if link and link.get('href'):
-                        article_url = link.get('href')
-
-                        # Make absolute URL
-                        if article_url.startswith('/'):
-                            article_url = 'https://www.nytimes.com' + article_url
-
-                        # Check if it's an article URL (contains year)
-                        current_year = datetime.now().year
-                        if f'/{current_year}/' not in article_url and f'/{current_year-1}/' not in article_url:
-                            continue
-
                         # Get headline
                         headline = link.get_text(strip=True)
                         if not headline:
@@ -301,12 +403,7 @@ class NYTScraperSelenium:
                             if h_tag:
                                 headline = h_tag.get_text(strip=True)
 
-                        if headline and article_url and article_url not in [a['url'] for a in articles]:
-                            logger.info(f"Found article: {headline}")
-                            articles.append({
-                                'headline': headline,
-                                'url': article_url
-                            })
+                        self._add_story(articles, link.get('href'), headline)
 
             logger.info(f"Found {len(articles)} articles")
             return articles
@@ -315,132 +412,388 @@ class NYTScraperSelenium:
             logger.error(f"Error fetching NYT articles: {e}")
             return []
 
-    def get_article_content(self, url):
-        """Fetch full article content"""
+    def _add_story(self, articles, article_url, headline):
+        """Append a section-page story link if it is a recent article not yet listed"""
+        if article_url.startswith('/'):
+            article_url = 'https://www.nytimes.com' + article_url
+
+        # Check if it's an article URL (contains year)
+        current_year = datetime.now().year
+        if f'/{current_year}/' not in article_url and f'/{current_year-1}/' not in article_url:
+            return
+
+        if headline and article_url not in [a['url'] for a in articles]:
+            logger.info(f"Found article: {headline}")
+            articles.append({
+                'headline': headline,
+                'url': article_url
+            })
+
+    def _in_page_links(self):
+        """Collect story links of the loaded section page inside the browser"""
         try:
-            logger.info(f"Fetching article content from {url}")
-
-            self.driver.get(url)
-            time.sleep(random.uniform(3, 5))  # Random delay for article page load
-
-            # Scroll to load full content - NYT loads content dynamically
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-            time.sleep(1)
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(random.uniform(2, 3))  # Wait for dynamic content to load
-
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-
-            # Extract article metadata
-            headline = soup.find('h1')
-            headline_text = headline.get_text(strip=True) if headline else "No title"
-
-            # Extract article body - try multiple selectors and approaches
-            article_body = None
-            body_selectors = [
-                ('section', {'name': 'articleBody'}),
-                ('article', {}),
-                ('div', {'class': 'StoryBodyCompanionColumn'}),
-                ('div', {'class': 'article-body'}),
-                ('div', {'class': lambda x: x and 'article' in x.lower()}),
-                ('main', {}),
-            ]
+            result = self.wm.evaluate(IN_PAGE_EXTRACTION_SCRIPT, True) or {}
+            return result.get('links') or []
+        except Exception as e:
+            logger.warning(f"In-page link extraction failed, parsing page source: {e}")
+            return []
 
-            for tag, attrs in body_selectors:
-                article_body = soup.find(tag, attrs)
-                if article_body:
-                    logger.debug(f"Found article body with {tag} {attrs}")
-                    break
+    def _extract_in_page(self, wm, url):
+        """
+        Extract the loaded article inside the browser
 
-            paragraphs = []
-            if article_body:
-                # Get all paragraphs
-                for p in article_body.find_all('p'):
-                    text = p.get_text(strip=True)
-                    # Filter out short paragraphs that might be ads or UI elements
-                    if text and len(text) > 20:
-                        paragraphs.append(text)
-
-            # Fallback: try to get all p tags from the page if no article body found
-            if not paragraphs:
-                logger.warning("No article body found with selectors, trying all p tags")
-                all_p_tags = soup.find_all('p')
-                for p in all_p_tags:
-                    text = p.get_text(strip=True)
-                    # More strict filtering for fallback
-                    if text and len(text) > 50 and not any(skip in text.lower() for skip in ['cookie', 'subscribe', 'advertisement', 'sign up']):
-                        paragraphs.append(text)
-
-            # Extract author
-            author_text = ""
-            author_selectors = [
-                ('span', {'class': 'last-byline'}),
-                ('p', {'class': 'byline'}),
-                ('span', {'itemprop': 'name'}),
-                ('div', {'class': 'author'}),
-            ]
+        Returns:
+            Article dictionary, or None if no body was found (the caller then
+            falls back to parsing page_source)
+        """
+        try:
+            result = wm.evaluate(IN_PAGE_EXTRACTION_SCRIPT, False) or {}
+        except Exception as e:
+            logger.warning(f"In-page extraction failed, parsing page source: {e}")
+            return None
 
-            for tag, attrs in author_selectors:
-                author = soup.find(tag, attrs)
-                if author:
-                    author_text = author.get_text(strip=True)
-                    # Clean up common prefixes
-                    author_text = author_text.replace('By ', '').replace('by ', '')
-                    break
+        if not result.get('paragraphs'):
+            return None
 
-            # Extract date
-            date_elem = soup.find('time')
-            date_text = ""
-            if date_elem:
-                date_text = date_elem.get('datetime', '')
-                if not date_text:
-                    date_text = date_elem.get_text(strip=True)
+        headline = result.get('headline') or "No title"
+        logger.info(f"Successfully extracted in page: {headline} ({len(result['paragraphs'])} paragraphs)")
+        return {
+            'headline': headline,
+            'author': result.get('byline', ''),
+            'date': result.get('date', ''),
+            'content': '\n\n'.join(result['paragraphs']),
+            'url': url
+        }
+
+    def _capture_article(self, url, wm):
+        """
+        Load an article page in the browser and take what the parser needs from it
+
+        Returns:
+            (article, None) when in-page extraction found the body, otherwise
+            (None, page_source) for parsing in Python
+        """
+        driver = wm.driver
+        logger.info(f"Fetching article content from {url}")
+
+        wm.navigate(url)
+        ready = wm.readiness()
+        ready.wait_for_selector("section[name='articleBody'] p, article p", timeout=10)
+
+        # Scroll to load full content - NYT loads content dynamically
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        ready.wait_for_network_idle(idle_ms=500, timeout=5)
+        ready.wait_for_dom_quiet(quiet_ms=300, timeout=2)
+
+        if self.extraction == 'in_page':
+            article = self._extract_in_page(wm, url)
+            if article:
+                return article, None
+        return None, driver.page_source
+
+    def get_article_content(self, url, wm=None):
+        """
+        Fetch full article content
+
+        Args:
+            url: Article URL
+            wm: WebDriverManager to load the page in (defaults to the scraper's own browser)
+        """
+        wm = wm or self.wm
+        try:
+            article, html = self._capture_article(url, wm)
+            if not article:
+                article = parse_article_html(html, url)
 
-            if not paragraphs:
-                logger.warning(f"No content found for article: {headline_text}")
+            if not article:
                 # Take screenshot for debugging
-                self.wm.take_screenshot(f"nyt_article_no_content_{int(time.time())}.png")
+                wm.take_screenshot(f"nyt_article_no_content_{int(time.time())}.png")
                 # Log useful debug info
-                logger.debug(f"Page title: {self.driver.title}")
-                logger.debug(f"Number of p tags found: {len(soup.find_all('p'))}")
+                logger.debug(f"Page title: {wm.driver.title}")
                 return None
 
-            return {
-                'headline': headline_text,
-                'author': author_text,
-                'date': date_text,
-                'content': '\n\n'.join(paragraphs),
-                'url': url
-            }
+            return article
 
         except Exception as e:
             logger.error(f"Error fetching article content: {e}")
             return None
 
-    def scrape(self, max_articles=10):
-        """Main scraping function"""
+    def _fetch_pipelined(self, urls):
+        """
+        Fetch article bodies with one browser, overlapping page loads with parsing
+
+        While article N's page source is parsed on the worker pool the browser
+        already loads article N+1. At most two pages per parse worker wait in
+        the queue; beyond that the browser waits for the parsers to catch up.
+        Results keep list order.
+        """
+        logger.info(f"Fetching {len(urls)} articles, parsing on {self.parse_workers} "
+                    f"{'processes' if self.parse_processes else 'threads'} while pages load")
+
+        executor_class = ProcessPoolExecutor if self.parse_processes else ThreadPoolExecutor
+        pending = threading.BoundedSemaphore(self.parse_workers * 2)
+        results = [None] * len(urls)
+        futures = {}
+
+        with executor_class(max_workers=self.parse_workers) as executor:
+            for index, url in enumerate(urls):
+                try:
+                    # Be polite with rate limiting - only the page load holds the slot
+                    with self.throttle.slot(url):
+                        article, html = self._capture_article(url, self.wm)
+                except Exception as e:
+                    logger.error(f"Error fetching article content: {e}")
+                    continue
+
+                if article:
+                    results[index] = article
+                    continue
+
+                pending.acquire()
+                future = executor.submit(parse_article_html, html, url)
+                future.add_done_callback(lambda _: pending.release())
+                futures[index] = future
+
+            for index, future in futures.items():
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    logger.error(f"Error parsing article {urls[index]}: {e}")
+                if results[index] is None:
+                    logger.warning(f"No content found for {urls[index]}")
+
+        return results
+
+    def _lease_worker(self, cookies):
+        """Get an extra browser for parallel fetching, logged in via the main session's cookies"""
+        wm = self.browser_pool.acquire(blocking=False) if self.browser_pool else None
+        pooled = wm is not None
+        if wm is None:
+            wm = WebDriverManager(headless=self.headless, profile='article')
+            wm.create_driver()
+        else:
+            wm.use_profile_blocking('article')
+
+        if not wm.authenticated:
+            wm.import_cookies(cookies, "https://www.nytimes.com/")
+            wm.authenticated = True
+        return wm, pooled
+
+    def _fetch_parallel(self, urls):
+        """
+        Fetch article bodies concurrently in several browsers sharing the login cookies
+
+        Each worker owns one browser; a per-host throttle caps how many pages
+        load at once and how quickly requests start. Results keep list order.
+        """
+        worker_count = min(self.workers, len(urls))
+        logger.info(f"Fetching {len(urls)} articles with {worker_count} parallel browsers")
+
+        cookies = self.wm.export_cookies()
+        workers = queue.Queue()
+        workers.put(self.wm)
+        extra = []
+        try:
+            for _ in range(worker_count - 1):
+                try:
+                    wm, pooled = self._lease_worker(cookies)
+                except Exception as e:
+                    logger.warning(f"Could not start extra browser, continuing with fewer workers: {e}")
+                    break
+                extra.append((wm, pooled))
+                workers.put(wm)
+
+            def fetch(url):
+                wm = workers.get()
+                try:
+                    with self.throttle.slot(url):
+                        return self.get_article_content(url, wm=wm)
+                finally:
+                    workers.put(wm)
+
+            with ThreadPoolExecutor(max_workers=len(extra) + 1) as executor:
+                return list(executor.map(fetch, urls))
+
+        finally:
+            for wm, pooled in extra:
+                if pooled:
+                    self.browser_pool.release(wm)
+                else:
+                    wm.quit()
+
+    def _fetch_over_http(self, urls):
+        """Fetch article pages over plain HTTP with the browser's login cookies (None where the browser is needed)"""
+        if self.http_fetcher is None:
+            self.http_fetcher = NYTHttpFetcher(self.wm.export_cookies(), user_agent=USER_AGENT)
+
+        fetched = []
+        for url in urls:
+            with self.throttle.slot(url):
+                fetched.append(self.http_fetcher.fetch(url))
+        return fetched
+
+    def fetch_articles(self, urls):
+        """
+        Fetch full content for a list of article URLs (requires a logged-in browser)
+
+        In hybrid mode pages are fetched over plain HTTP first, and only pages
+        behind a paywall or needing JavaScript are loaded in the browser.
+
+        Returns:
+            List of article dictionaries (None where fetching failed), in URL order
+        """
+        fetched = [None] * len(urls)
+        if self.hybrid and urls:
+            fetched = self._fetch_over_http(urls)
+
+        browser_indices = [i for i, article in enumerate(fetched) if article is None]
+        if not browser_indices:
+            return fetched
+
+        browser_urls = [urls[i] for i in browser_indices]
+        if self.hybrid:
+            logger.info(f"Falling back to the browser for {len(browser_urls)} of {len(urls)} articles")
+
+        if self.workers > 1 and len(browser_urls) > 1:
+            browser_fetched = self._fetch_parallel(browser_urls)
+        elif self.pipeline and len(browser_urls) > 1:
+            browser_fetched = self._fetch_pipelined(browser_urls)
+        else:
+            browser_fetched = []
+            for url in browser_urls:
+                # Be polite with rate limiting
+                with self.throttle.slot(url):
+                    browser_fetched.append(self.get_article_content(url))
+
+        for index, article in zip(browser_indices, browser_fetched):
+            fetched[index] = article
+        return fetched
+
+    def fill_full_text(self, articles):
+        """
+        Replace abstract-only content (e.g. from NYTScraperAPI) with the full article text
+
+        Articles marked 'full_text' already have their body and are left alone.
+
+        Args:
+            articles: Article dictionaries; updated in place
+
+        Returns:
+            The same list
+        """
+        pending = [a for a in articles if a.get('url') and not a.get('full_text')]
+        if not pending:
+            return articles
+
+        if self.browser_pool:
+            self.wm = self.browser_pool.acquire()
+
+        try:
+            if not self.login():
+                logger.error("Failed to login to NYT, keeping abstracts")
+                return articles
+
+            logger.info(f"Fetching full text for {len(pending)} articles")
+            for article, full in zip(pending, self.fetch_articles([a['url'] for a in pending])):
+                if not full:
+                    continue
+                article['content'] = full['content']
+                article['author'] = article.get('author') or full['author']
+                article['full_text'] = True
+                if self.article_store:
+                    self.article_store.put(article)
+
+            return articles
+
+        finally:
+            self._release_browser()
+
+    def _release_browser(self):
+        """Clean up the driver (pooled drivers stay warm for the next run)"""
+        if self.http_fetcher:
+            self.http_fetcher.close()
+            self.http_fetcher = None
+        if self.browser_pool:
+            self.browser_pool.release(self.wm)
+        else:
+            self.wm.quit()
+        self.driver = None
+
+    def scrape(self, max_articles=10, since=None, exclude_urls=None):
+        """
+        Main scraping function
+
+        After the call, self.candidates is the number of articles listed and
+        self.already_delivered how many of them the delta filters dropped, so
+        an empty result can be told apart from a failed scrape.
+
+        Args:
+            max_articles: Maximum number of articles to fetch
+            since: Delta mode - drop articles published at or before this ISO timestamp
+            exclude_urls: Delta mode - set of canonical URLs already delivered; their
+                          bodies are never fetched
+
+        Returns:
+            List of article dictionaries
+        """
+        self.candidates = 0
+        self.already_delivered = 0
+        if self.browser_pool:
+            self.wm = self.browser_pool.acquire()
+
         try:
             if not self.login():
                 logger.error("Failed to login to NYT")
                 return []
 
+            # In delta mode look further down the section, since the top entries are usually already delivered
+            delta = bool(since or exclude_urls)
+            candidate_limit = max_articles * 3 if delta else max_articles
+
             # Get article list
-            article_list = self.get_todays_articles(max_articles)
+            article_list = self.get_todays_articles(candidate_limit)
+            self.candidates = len(article_list)
+
+            if exclude_urls:
+                article_list = [a for a in article_list if is_newer(a, exclude_urls=exclude_urls)]
+                self.already_delivered = self.candidates - len(article_list)
+                logger.info(f"Delta mode: {len(article_list)} of {self.candidates} listed articles are new")
+            article_list = article_list[:max_articles]
+
+            # Fetch full content for each article, reusing stored copies
+            articles_with_content = [None] * len(article_list)
+            to_fetch = []
+            for index, article_info in enumerate(article_list):
+                if self.article_store and not self.refresh:
+                    stored = self.article_store.get(article_info['url'])
+                    if stored:
+                        logger.info(f"Using stored article: {stored['headline']}")
+                        articles_with_content[index] = stored
+                        continue
+                to_fetch.append(index)
+
+            urls = [article_list[index]['url'] for index in to_fetch]
+            fetched = self.fetch_articles(urls)
+
+            for index, content in zip(to_fetch, fetched):
+                articles_with_content[index] = content
+                if content and self.article_store:
+                    self.article_store.put(content)
 
-            # Fetch full content for each article
-            articles_with_content = []
-            for article_info in article_list:
-                content = self.get_article_content(article_info['url'])
-                if content:
-                    articles_with_content.append(content)
-                time.sleep(2)  # Be polite with rate limiting
+            articles_with_content = [a for a in articles_with_content if a]
+
+            if since:
+                fetched_count = len(articles_with_content)
+                articles_with_content = [a for a in articles_with_content if is_newer(a, since)]
+                self.already_delivered += fetched_count - len(articles_with_content)
 
             logger.info(f"Successfully scraped {len(articles_with_content)} NYT articles")
             return articles_with_content
 
         finally:
             # Always clean up the driver
-            self.wm.quit()
+            self._release_browser()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+"""
+HTML Parsing
+Pluggable BeautifulSoup backends with scoped parsing of only the subtrees extractors need
+"""
+
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4 import FeatureNotFound
+import logging
+import os
+import sys
+
+try:
+    from bs4.filter import ElementFilter
+except ImportError:  # beautifulsoup4 < 4.13: SoupStrainer passes (name, attrs) to a name function
+    ElementFilter = None
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scrapers.extraction import AUTHOR_RULES, BODY_RULES
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Parser backends in order of preference: lxml is several times faster,
+# html.parser is the lenient pure-Python fallback for pages lxml mangles
+PARSER_BACKENDS = ['lxml', 'html.parser']
+
+
+class _StartTag:
+    """A tag about to be parsed, as seen by extraction rule predicates (name and attributes only)"""
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = dict(attrs or {})
+        classes = self.attrs.get('class')
+        if isinstance(classes, str):
+            self.attrs['class'] = classes.split()
+
+    def get(self, key, default=None):
+        return self.attrs.get(key, default)
+
+
+def rule_scope(tag_names, *rule_sets):
+    """
+    Parse-only filter keeping the given tags plus every tag an extraction rule matches
+
+    Top-level tags are tested against the rules' own predicates (class,
+    itemprop, ...), so the scoped tree holds every element the extractor
+    would find in the full document. Subtrees of kept tags are kept whole.
+
+    Args:
+        tag_names: Tag names always kept (e.g. 'h1', 'time', 'p')
+        rule_sets: (tag name, predicate or None) rule lists, e.g. BODY_RULES
+
+    Returns:
+        A parse_only filter for make_soup()
+    """
+    always = set(tag_names)
+    rules = {}
+    for rule_set in rule_sets:
+        for name, predicate in rule_set:
+            rules.setdefault(name, []).append(predicate)
+
+    def keep(name, attrs=None):
+        if name in always:
+            return True
+        tag = _StartTag(name, attrs)
+        return any(predicate is None or predicate(tag) for predicate in rules.get(name, ()))
+
+    if ElementFilter is None:
+        return SoupStrainer(keep)
+
+    class RuleScope(ElementFilter):
+        def allow_tag_creation(self, nsprefix, name, attrs):
+            return keep(name, attrs)
+
+        def allow_string_creation(self, string):
+            return False  # Text outside the kept tags, as with a SoupStrainer on names
+
+    return RuleScope()
+
+
+# Article pages: headline, time, paragraphs and everything the body and byline rules match
+ARTICLE_SCOPE = rule_scope(['h1', 'time', 'p'], BODY_RULES, AUTHOR_RULES)
+
+# Section pages: story blocks, story headlines and links
+SECTION_SCOPE = SoupStrainer(['article', 'section', 'h2', 'h3', 'a'])
+
+
+def set_parser_backends(backends):
+    """
+    Choose which parser backends make_soup() tries, in order
+
+    Args:
+        backends: List of BeautifulSoup feature names, e.g. ['lxml', 'html.parser']
+    """
+    PARSER_BACKENDS[:] = backends
+
+
+def make_soup(html, scope=None, backends=None):
+    """
+    Parse HTML with the fastest available backend
+
+    Falls back to the next backend when a parser is not installed, raises,
+    or produces an empty tree for the requested scope (malformed markup).
+
+    Args:
+        html: Page HTML
+        scope: Optional SoupStrainer (or rule_scope() filter) limiting the tree to the needed subtrees
+        backends: Parser backends to try (defaults to PARSER_BACKENDS)
+
+    Returns:
+        BeautifulSoup
+    """
+    backends = backends or PARSER_BACKENDS
+    soup = None
+
+    for backend in backends:
+        try:
+            soup = BeautifulSoup(html, backend, parse_only=scope)
+        except FeatureNotFound:
+            logger.debug(f"Parser backend not installed: {backend}")
+            continue
+        except Exception as e:
+            logger.warning(f"Parser backend {backend} failed, trying next: {e}")
+            continue
+
+        if soup.find() is not None:
+            return soup
+        logger.debug(f"Parser backend {backend} produced an empty tree, trying next")
+
+    if soup is None:
+        soup = BeautifulSoup(html, 'html.parser', parse_only=scope)
+    return soup
@@ -0,0 +1,174 @@
+"""
+Structured Data
+Reads article metadata and story lists from the JSON payloads embedded in NYT pages
+(JSON-LD script tags and the preloaded app state) without parsing the DOM
+"""
+
+import json
+import logging
+import re
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+JSON_LD_PATTERN = re.compile(
+    r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL
+)
+PRELOADED_STATE_PATTERN = re.compile(r'window\.__preloadedData\s*=\s*')
+ARTICLE_TYPES = ('NewsArticle', 'Article', 'ReportageNewsArticle', 'AnalysisNewsArticle', 'OpinionNewsArticle')
+
+_decoder = json.JSONDecoder()
+
+
+def iter_json_ld(html):
+    """
+    Yield every JSON-LD object on the page
+
+    Only the script tags' contents are decoded; lists and @graph
+    containers are flattened.
+    """
+    for match in JSON_LD_PATTERN.finditer(html):
+        try:
+            data = json.loads(match.group(1))
+        except ValueError:
+            continue
+
+        stack = data if isinstance(data, list) else [data]
+        for item in stack:
+            if not isinstance(item, dict):
+                continue
+            yield item
+            for nested in item.get('@graph', []):
+                if isinstance(nested, dict):
+                    yield nested
+
+
+def read_preloaded_state(html):
+    """
+    Decode the preloaded app state object (window.__preloadedData)
+
+    Decoding starts at the assignment and stops at the end of the object,
+    so the rest of the page is never scanned.
+
+    Returns:
+        Parsed state, or None if absent or not decodable
+    """
+    match = PRELOADED_STATE_PATTERN.search(html)
+    if not match:
+        return None
+
+    try:
+        state, _ = _decoder.raw_decode(html, match.end())
+        return state
+    except ValueError:
+        pass
+
+    # The state is a JS literal and may contain `undefined`; retry on the script body alone
+    end = html.find('</script>', match.end())
+    if end == -1:
+        return None
+    script = re.sub(r':\s*undefined\b', ':null', html[match.end():end])
+    try:
+        state, _ = _decoder.raw_decode(script)
+        return state
+    except ValueError:
+        logger.debug("Could not decode preloaded state")
+        return None
+
+
+def _types(item):
+    """Normalize @type to a tuple"""
+    value = item.get('@type', ())
+    return tuple(value) if isinstance(value, list) else (value,)
+
+
+def _author_names(author):
+    """Join author names from a JSON-LD author field"""
+    if isinstance(author, list):
+        return ' and '.join(name for name in (_author_names(a) for a in author) if name)
+    if isinstance(author, dict):
+        return author.get('name', '')
+    return author or ''
+
+
+def _walk(node):
+    """Yield every dict in a nested JSON structure"""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            yield current
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+
+
+def _state_paragraphs(state):
+    """Collect body paragraph text from ParagraphBlock nodes of the preloaded state"""
+    # Prefer the article body so promos and related-story blocks are not picked up
+    body = next((node['sprinkledBody'] for node in _walk(state) if isinstance(node.get('sprinkledBody'), dict)), state)
+
+    paragraphs = []
+    for node in _walk(body):
+        if node.get('__typename') != 'ParagraphBlock':
+            continue
+        text = ''.join(
+            part.get('text', '') for part in node.get('content', []) if isinstance(part, dict)
+        ).strip()
+        if text:
+            paragraphs.append(text)
+    return paragraphs
+
+
+def extract_article_data(html):
+    """
+    Read article fields from structured data
+
+    Returns:
+        Dictionary with 'headline', 'author', 'date' and 'paragraphs'
+        (empty strings/list for anything not present), or None if the page
+        has no article structured data
+    """
+    fields = None
+    for item in iter_json_ld(html):
+        if not any(t in ARTICLE_TYPES for t in _types(item)):
+            continue
+        fields = {
+            'headline': item.get('headline', ''),
+            'author': _author_names(item.get('author')),
+            'date': item.get('datePublished', ''),
+            'paragraphs': [p.strip() for p in item.get('articleBody', '').split('\n') if p.strip()],
+        }
+        break
+
+    if fields is None or not fields['paragraphs']:
+        state = read_preloaded_state(html)
+        if state is not None:
+            fields = fields or {'headline': '', 'author': '', 'date': '', 'paragraphs': []}
+            fields['paragraphs'] = _state_paragraphs(state)
+
+    return fields
+
+
+def extract_story_links(html):
+    """
+    Read the story list of a section page from structured data
+
+    Returns:
+        List of {'headline', 'url'} dictionaries in page order
+    """
+    stories = []
+    for item in iter_json_ld(html):
+        main_entity = item.get('mainEntity')
+        containers = [item] + ([main_entity] if isinstance(main_entity, dict) else [])
+        for container in containers:
+            for element in container.get('itemListElement', []):
+                if not isinstance(element, dict):
+                    continue
+                entry = element.get('item') if isinstance(element.get('item'), dict) else element
+                url = entry.get('url') or element.get('url')
+                headline = entry.get('name') or entry.get('headline') or ''
+                if url:
+                    stories.append({'headline': headline, 'url': url})
+    return stories
@@ -0,0 +1,67 @@
+"""
+Baseline Extraction
+The original find()-based extraction from the Selenium scraper, kept as the reference behaviour for the golden tests
+"""
+
+from bs4 import BeautifulSoup
+
+
+def baseline_extract(html):
+    """
+    Extract article fields exactly as the scraper did before the extraction engine
+
+    Returns:
+        Dictionary with 'headline', 'author', 'date' and 'paragraphs'
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+
+    headline = soup.find('h1')
+    headline_text = headline.get_text(strip=True) if headline else "No title"
+
+    article_body = None
+    body_selectors = [
+        ('section', {'name': 'articleBody'}),
+        ('article', {}),
+        ('div', {'class': 'StoryBodyCompanionColumn'}),
+        ('div', {'class': 'article-body'}),
+        ('div', {'class': lambda x: x and 'article' in x.lower()}),
+        ('main', {}),
+    ]
+    for tag, attrs in body_selectors:
+        article_body = soup.find(tag, attrs)
+        if article_body:
+            break
+
+    paragraphs = []
+    if article_body:
+        for p in article_body.find_all('p'):
+            text = p.get_text(strip=True)
+            if text and len(text) > 20:
+                paragraphs.append(text)
+
+    if not paragraphs:
+        for p in soup.find_all('p'):
+            text = p.get_text(strip=True)
+            if text and len(text) > 50 and not any(
+                    skip in text.lower() for skip in ['cookie', 'subscribe', 'advertisement', 'sign up']):
+                paragraphs.append(text)
+
+    author_text = ""
+    author_selectors = [
+        ('span', {'class': 'last-byline'}),
+        ('p', {'class': 'byline'}),
+        ('span', {'itemprop': 'name'}),
+        ('div', {'class': 'author'}),
+    ]
+    for tag, attrs in author_selectors:
+        author = soup.find(tag, attrs)
+        if author:
+            author_text = author.get_text(strip=True).replace('By ', '').replace('by ', '')
+            break
+
+    date_elem = soup.find('time')
+    date_text = ""
+    if date_elem:
+        date_text = date_elem.get('datetime', '') or date_elem.get_text(strip=True)
+
+    return {'headline': headline_text, 'author': author_text, 'date': date_text, 'paragraphs': paragraphs}
@@ -0,0 +1,10 @@
+"""
+Test configuration
+Makes the repository's packages importable the same way the scripts do
+"""
+
+import os
+import sys
+
+# Add the repository root to the path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
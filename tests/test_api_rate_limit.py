@@ -0,0 +1,95 @@
+"""
+NYT API rate limit tests
+429 responses are retried by the scraper, one governor token per attempt, never inside the adapter
+"""
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import threading
+
+import pytest
+import requests
+
+from scrapers import nyt_scraper_api
+from scrapers.nyt_scraper_api import NYTScraperAPI
+from utils.http_client import MAX_RETRY_AFTER, SERVER_ERROR_STATUSES, HttpClient, retry_after
+from utils.rate_limiter import QuotaExceeded
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.tokens = 0
+
+    def acquire(self, max_wait=None):
+        self.tokens += 1
+
+
+class TooManyRequests(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        self.send_response(429)
+        self.send_header('Retry-After', '0')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    TooManyRequests.hits = 0
+    httpd = HTTPServer(('127.0.0.1', 0), TooManyRequests)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}/topstories/v2/business.json'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def response_with(headers):
+    response = requests.Response()
+    response.headers.update(headers)
+    return response
+
+
+def test_retry_after_is_capped():
+    assert retry_after(response_with({'Retry-After': '5'})) == 5
+    assert retry_after(response_with({'Retry-After': '86400'})) == MAX_RETRY_AFTER
+    assert retry_after(response_with({'Retry-After': 'soon'}), default=2) == 2
+    assert retry_after(response_with({'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'})) == 0
+
+
+def test_adapter_leaves_429_to_the_caller(server):
+    client = HttpClient(cache_dir=None, backoff_factor=0, retry_statuses=SERVER_ERROR_STATUSES)
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get_json(server)
+    assert TooManyRequests.hits == 1
+
+
+def test_every_429_retry_takes_a_token(server, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(nyt_scraper_api.time, 'sleep', sleeps.append)
+    limiter = CountingLimiter()
+    api = NYTScraperAPI(
+        'key', http_client=HttpClient(cache_dir=None, backoff_factor=0, retry_statuses=SERVER_ERROR_STATUSES),
+        rate_limiter=limiter, rate_limit_retries=2
+    )
+    with pytest.raises(requests.exceptions.HTTPError):
+        api._get_json(server)
+    assert TooManyRequests.hits == 3
+    assert limiter.tokens == 3
+    assert sleeps == [0, 0]
+
+
+def test_quota_exhaustion_is_not_an_empty_feed():
+    class ExhaustedLimiter:
+        def acquire(self, max_wait=None):
+            raise QuotaExceeded('Daily quota of 500 requests used up for nyt-api')
+
+    api = NYTScraperAPI('key', http_client=HttpClient(cache_dir=None), rate_limiter=ExhaustedLimiter())
+    with pytest.raises(QuotaExceeded):
+        api.scrape(max_articles=5)
+    with pytest.raises(QuotaExceeded):
+        api.scrape(max_articles=5, feeds=['topstories/business', 'mostpopular/viewed'])
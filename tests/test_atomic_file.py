@@ -0,0 +1,40 @@
+"""
+Atomic write tests
+A failed write must leave the previous file intact and no temporary file behind
+"""
+
+import os
+import stat
+
+import pytest
+
+from utils.atomic_file import atomic_write
+
+
+def test_replaces_file(tmp_path):
+    path = tmp_path / 'state.json'
+    path.write_text('old')
+    with atomic_write(str(path), encoding='utf-8') as f:
+        f.write('new')
+    assert path.read_text() == 'new'
+    assert os.listdir(tmp_path) == ['state.json']
+
+
+def test_failure_keeps_old_file_and_removes_temp(tmp_path):
+    path = tmp_path / 'state.json'
+    path.write_text('old')
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(path)) as f:
+            f.write('partial')
+            raise RuntimeError('interrupted')
+    assert path.read_text() == 'old'
+    assert os.listdir(tmp_path) == ['state.json']
+
+
+def test_creates_directory_and_sets_permissions(tmp_path):
+    path = tmp_path / 'cache' / 'session.enc'
+    with atomic_write(str(path), 'wb', permissions=0o600) as f:
+        f.write(b'secret')
+    assert path.read_bytes() == b'secret'
+    if os.name == 'posix':
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
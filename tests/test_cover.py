@@ -0,0 +1,89 @@
+"""
+Cover pipeline tests
+Covers are padded to the Kindle size once and cached; a cover that cannot be processed is embedded unchanged
+"""
+
+import os
+
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+from formatters.cover import CoverPipeline
+
+SIZE = (300, 400)
+
+
+def source(tmp_path, mode, name='cover.png', size=(600, 300), color='red'):
+    path = str(tmp_path / name)
+    Image.new(mode, size, color).save(path)
+    return path
+
+
+def covers(tmp_path, **options):
+    return CoverPipeline(cache_dir=str(tmp_path / 'covers'), size=SIZE, **options)
+
+
+@pytest.mark.parametrize('mode, name', [('RGBA', 'cover.png'), ('P', 'cover.png'), ('CMYK', 'cover.jpg')])
+def test_any_mode_is_padded_to_a_grayscale_jpeg(tmp_path, mode, name):
+    with Image.open(covers(tmp_path).normalized(source(tmp_path, mode, name))) as cover:
+        assert cover.format == 'JPEG'
+        assert cover.mode == 'L'
+        assert cover.size == SIZE
+        assert cover.getpixel((0, 0)) > 250  # white padding above the letterboxed image
+
+
+def test_color_covers_stay_rgb(tmp_path):
+    with Image.open(covers(tmp_path, grayscale=False).normalized(source(tmp_path, 'RGB'))) as cover:
+        assert cover.mode == 'RGB'
+        assert cover.size == SIZE
+
+
+def test_normalized_cover_is_cached_until_the_source_changes(tmp_path):
+    pipeline = covers(tmp_path)
+    path = source(tmp_path, 'RGB')
+    first = pipeline.normalized(path)
+    assert pipeline.normalized(path) == first
+
+    source(tmp_path, 'RGB', size=(200, 200), color='blue')
+    os.utime(path, ns=(0, 0))
+    assert pipeline.normalized(path) != first
+
+
+def test_lower_quality_gives_smaller_covers(tmp_path):
+    path = str(tmp_path / 'cover.png')
+    Image.effect_noise((600, 800), 64).save(path)
+    low = covers(tmp_path, quality=20).normalized(path)
+    high = covers(tmp_path, quality=90).normalized(path)
+    assert os.path.getsize(low) < os.path.getsize(high)
+
+
+def test_dated_cover_is_cached_per_date(tmp_path):
+    pipeline = covers(tmp_path)
+    path = source(tmp_path, 'RGB')
+    monday = pipeline.dated(path, 'Monday, October 19, 2026')
+    assert pipeline.dated(path, 'Monday, October 19, 2026') == monday
+    assert pipeline.dated(path, 'Tuesday, October 20, 2026') != monday
+    with Image.open(monday) as cover:
+        assert cover.size == SIZE
+        assert cover.getpixel((0, SIZE[1] - 1)) < 5  # black date band
+
+
+def test_prepare_returns_a_jpeg(tmp_path):
+    path, media_type = covers(tmp_path).prepare(source(tmp_path, 'RGBA'), 'Sunday, October 18, 2026')
+    assert media_type == 'image/jpeg'
+    assert path.startswith(str(tmp_path / 'covers'))
+
+
+@pytest.mark.parametrize('name, media_type', [('cover.png', 'image/png'), ('cover.jpg', 'image/jpeg')])
+def test_undecodable_cover_is_embedded_unchanged(tmp_path, name, media_type):
+    path = str(tmp_path / name)
+    with open(path, 'wb') as f:
+        f.write(b'not an image')
+    assert covers(tmp_path).prepare(path) == (path, media_type)
+
+
+def test_without_pillow_the_cover_is_embedded_unchanged(tmp_path, monkeypatch):
+    monkeypatch.setattr('formatters.cover.Image', None)
+    path = source(tmp_path, 'RGB')
+    assert covers(tmp_path).prepare(path, 'Sunday, October 18, 2026') == (path, 'image/png')
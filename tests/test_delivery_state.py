@@ -0,0 +1,33 @@
+"""
+Delivery state tests
+Interrupted multi-volume deliveries resume with the volumes that were not sent
+"""
+
+from utils.delivery_state import DeliveryState
+
+ARTICLES = [{'url': 'https://www.nytimes.com/2026/10/18/business/a.html', 'date': '2026-10-18T08:00:00-04:00'}]
+
+
+def test_sent_volumes_are_kept_for_the_same_book(tmp_path):
+    state = DeliveryState(str(tmp_path / 'state.json'))
+    state.record_volume('daily', 'book-1', 'vol-1')
+    state.record_volume('daily', 'book-1', 'vol-2')
+    assert state.get_sent_volumes('daily', 'book-1') == {'vol-1', 'vol-2'}
+    assert state.get_edition_hash('daily') is None
+
+
+def test_sent_volumes_reset_for_a_different_book(tmp_path):
+    state = DeliveryState(str(tmp_path / 'state.json'))
+    state.record_volume('daily', 'book-1', 'vol-1')
+    assert state.get_sent_volumes('daily', 'book-2') == set()
+    state.record_volume('daily', 'book-2', 'vol-9')
+    assert state.get_sent_volumes('daily', 'book-1') == set()
+    assert state.get_sent_volumes('daily', 'book-2') == {'vol-9'}
+
+
+def test_full_delivery_clears_progress(tmp_path):
+    state = DeliveryState(str(tmp_path / 'state.json'))
+    state.record_volume('daily', 'book-1', 'vol-1')
+    state.record('daily', ARTICLES, edition_hash='book-1')
+    assert state.get_sent_volumes('daily', 'book-1') == set()
+    assert state.get_edition_hash('daily') == 'book-1'
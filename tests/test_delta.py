@@ -0,0 +1,56 @@
+"""
+Delta mode tests
+An empty delta edition must only count as success when every candidate was already delivered
+"""
+
+import requests
+
+from main import is_up_to_date
+from scrapers.nyt_scraper_api import NYTScraperAPI
+from utils.article_store import canonical_url
+
+STORIES = [
+    {'title': f'Story {n}', 'url': f'https://www.nytimes.com/2026/10/18/business/story-{n}.html',
+     'published_date': f'2026-10-18T0{n}:00:00-04:00'}
+    for n in range(6)
+]
+
+
+class FakeHttp:
+    def __init__(self, payload=None, error=None):
+        self.payload = payload
+        self.error = error
+
+    def get_json(self, url, params=None, timeout=30):
+        if self.error:
+            raise self.error
+        return self.payload
+
+
+def scraper(http):
+    return NYTScraperAPI('key', http_client=FakeHttp(**http))
+
+
+def test_all_candidates_delivered_is_up_to_date():
+    api = scraper({'payload': {'status': 'OK', 'results': STORIES}})
+    delivered = {canonical_url(story['url']) for story in STORIES}
+    articles = api.scrape(max_articles=2, exclude_urls=delivered)
+    assert articles == []
+    assert api.candidates == len(STORIES)
+    assert is_up_to_date(api, articles)
+
+
+def test_failed_request_is_not_up_to_date():
+    api = scraper({'error': requests.exceptions.ConnectionError('down')})
+    articles = api.scrape(max_articles=2, exclude_urls={'https://www.nytimes.com/x'})
+    assert articles == []
+    assert not is_up_to_date(api, articles)
+
+
+def test_delta_looks_past_delivered_articles():
+    api = scraper({'payload': {'status': 'OK', 'results': STORIES}})
+    delivered = {canonical_url(story['url']) for story in STORIES[:2]}
+    articles = api.scrape(max_articles=2, exclude_urls=delivered)
+    assert [a['headline'] for a in articles] == ['Story 2', 'Story 3']
+    assert api.already_delivered == 2
+    assert not is_up_to_date(api, articles)
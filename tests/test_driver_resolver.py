@@ -0,0 +1,83 @@
+"""
+ChromeDriver resolver tests
+A cached or PATH driver is used whenever Chrome's version cannot be matched
+"""
+
+import pytest
+
+from utils import driver_resolver
+from utils.driver_resolver import ChromeDriverResolver
+
+
+@pytest.fixture
+def resolver(tmp_path, monkeypatch):
+    monkeypatch.setattr(driver_resolver.shutil, 'which', lambda name: None)
+    monkeypatch.delenv(driver_resolver.OFFLINE_ENV, raising=False)
+    resolver = ChromeDriverResolver(cache_dir=str(tmp_path / 'drivers'), offline=False)
+    monkeypatch.setattr(resolver, '_download', lambda: pytest.fail('should not download'))
+    return resolver
+
+
+def cache_driver(resolver, tmp_path, version):
+    driver = tmp_path / f'chromedriver-{version}'
+    driver.write_text('')
+    resolver._record(str(driver), version)
+    return str(driver)
+
+
+def test_matching_cached_driver(resolver, tmp_path, monkeypatch):
+    cache_driver(resolver, tmp_path, '119.0.6045.105')
+    driver = cache_driver(resolver, tmp_path, '120.0.6099.109')
+    monkeypatch.setattr(resolver, 'chrome_version', lambda: '120.0.6099.110')
+    assert resolver.resolve() == driver
+
+
+def test_unknown_chrome_version_uses_newest_cached_driver(resolver, tmp_path, monkeypatch):
+    cache_driver(resolver, tmp_path, '119.0.6045.105')
+    driver = cache_driver(resolver, tmp_path, '120.0.6099.109')
+    monkeypatch.setattr(resolver, 'chrome_version', lambda: None)
+    assert resolver.resolve() == driver
+
+
+def test_unknown_chrome_version_without_local_driver_downloads(resolver, monkeypatch):
+    monkeypatch.setattr(resolver, 'chrome_version', lambda: None)
+    monkeypatch.setattr(resolver, '_download', lambda: '/downloaded/chromedriver')
+    assert resolver.resolve() == '/downloaded/chromedriver'
+
+
+def test_offline_env_overrides_config(tmp_path, monkeypatch):
+    monkeypatch.setenv(driver_resolver.OFFLINE_ENV, '1')
+    assert ChromeDriverResolver(cache_dir=str(tmp_path), offline=False).offline
+    monkeypatch.setenv(driver_resolver.OFFLINE_ENV, '')
+    assert not ChromeDriverResolver(cache_dir=str(tmp_path), offline=False).offline
+    assert ChromeDriverResolver(cache_dir=str(tmp_path), offline=True).offline
+
+
+def test_driver_resolver_is_configured_once(tmp_path, monkeypatch):
+    import main
+
+    monkeypatch.setattr(main, '_driver_resolver_settings', None)
+    monkeypatch.setattr(driver_resolver, '_default_resolver', None)
+    config = {'cache': {'directory': str(tmp_path)}, 'selenium': {'driver_offline': False}}
+    main.configure_driver_resolver(config)
+    resolver = driver_resolver.get_driver_resolver()
+    main.configure_driver_resolver(config)
+    assert driver_resolver.get_driver_resolver() is resolver
+
+    main.configure_driver_resolver({'cache': {'directory': str(tmp_path)}, 'selenium': {'driver_offline': True}})
+    assert driver_resolver.get_driver_resolver().offline
+
+
+def test_windows_reads_the_registry(resolver, monkeypatch):
+    monkeypatch.setattr(driver_resolver.sys, 'platform', 'win32')
+    monkeypatch.setattr(driver_resolver, '_read_registry_version', lambda: '120.0.6099.110')
+    monkeypatch.setattr(driver_resolver, '_read_version', lambda binary: pytest.fail('--version is silent on Windows'))
+    assert resolver.chrome_version() == '120.0.6099.110'
+
+
+def test_windows_falls_back_to_the_file_version(resolver, monkeypatch):
+    monkeypatch.setattr(driver_resolver.sys, 'platform', 'win32')
+    monkeypatch.setattr(driver_resolver, 'WINDOWS_CHROME_BINARIES', [r'C:\Chrome\chrome.exe'])
+    monkeypatch.setattr(driver_resolver, '_read_registry_version', lambda: None)
+    monkeypatch.setattr(driver_resolver, '_read_file_version', lambda binary: '121.0.6167.85')
+    assert resolver.chrome_version() == '121.0.6167.85'
@@ -0,0 +1,90 @@
+"""
+Edition tests
+Editions from the config are built from one scrape, named by content and sent to their own recipients
+"""
+
+import os
+import time
+
+import main
+from formatters.editions import EditionAssembler
+from formatters.render_cache import ChapterCache
+
+POOL = [
+    {'headline': f'Story {n}', 'author': 'A Reporter', 'date': f'2026-10-18T0{n}:00:00-04:00',
+     'url': f'https://www.nytimes.com/2026/10/18/{section}/story-{n}.html', 'section': section,
+     'content': f'Paragraph one of story {n}.\n\nParagraph two.'}
+    for n, section in enumerate(['business', 'technology', 'business', 'technology', 'business'])
+]
+
+CONFIG = {
+    'kindle': {'email': 'default@kindle.com'},
+    'email': {'max_attachment_mb': 25},
+    'epub': {'normalize_cover': False},
+    'cache': {'directory': 'cache'},
+    'editions': [
+        {'name': 'business', 'sections': ['business'], 'max_articles': 2, 'recipient': 'biz@kindle.com'},
+        {'name': 'tech', 'sections': ['technology']},
+    ],
+}
+
+
+def test_assemble_names_files_by_content(tmp_path):
+    assembler = EditionAssembler(output_dir=str(tmp_path), max_bytes=10 * 1024 * 1024)
+    first = assembler.assemble(POOL, 'business', sections=['business'])
+    second = assembler.assemble(POOL, 'business', sections=['business'])
+    assert first == second
+    assert len(first) == 1 and os.path.basename(first[0]).startswith('business_')
+    assert assembler.chapter_cache.stats()['misses'] == 3
+
+
+def test_main_sends_each_edition_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sent = []
+    monkeypatch.setattr(main, 'load_config', lambda: CONFIG)
+    monkeypatch.setattr(main, 'scrape_news', lambda config, **kwargs: ([dict(a) for a in POOL], False))
+    monkeypatch.setattr(main, 'send_to_kindle',
+                        lambda config, epub_file, subject=None, recipient=None: sent.append((recipient, epub_file)) or True)
+
+    assert main.main([]) == 0
+    assert [recipient for recipient, _ in sent] == ['biz@kindle.com', None]
+    assert os.path.basename(sent[0][1]).startswith('business_')
+    assert os.path.basename(sent[1][1]).startswith('tech_')
+
+    # Unchanged editions are not sent again
+    assert main.main([]) == 0
+    assert len(sent) == 2
+
+    assert main.main(['--edition', 'tech', '--force']) == 0
+    assert [recipient for recipient, _ in sent[2:]] == [None]
+
+
+def test_chapter_cache_evicts_unused_entries(tmp_path):
+    cache = ChapterCache(str(tmp_path), ttl_hours=1)
+    cache.get(POOL[0])
+    cache.get(POOL[1])
+    stale, fresh = sorted(os.path.join(tmp_path, name) for name in os.listdir(tmp_path))
+    old = time.time() - 2 * 3600
+    os.utime(stale, (old, old))
+
+    assert cache.evict_expired() == 1
+    assert os.listdir(tmp_path) == [os.path.basename(fresh)]
+
+
+def test_select_ignores_section_case():
+    pool = [dict(POOL[0], section='Business'), dict(POOL[1], section='U.S.'), POOL[2]]
+    selected = EditionAssembler.select(pool, sections=['business', 'u.s.'], max_articles=2)
+    assert [a['section'] for a in selected] == ['Business', 'U.S.']
+
+
+def test_editions_fall_back_to_every_article_without_sections(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sent = []
+    unsectioned = [{k: v for k, v in a.items() if k != 'section'} for a in POOL]
+    monkeypatch.setattr(main, 'load_config', lambda: CONFIG)
+    monkeypatch.setattr(main, 'scrape_news', lambda config, **kwargs: ([dict(a) for a in unsectioned], False))
+    monkeypatch.setattr(main, 'send_to_kindle',
+                        lambda config, epub_file, subject=None, recipient=None: sent.append(recipient) or True)
+
+    assert main.main([]) == 0
+    assert sent == ['biz@kindle.com', None]
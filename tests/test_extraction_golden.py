@@ -0,0 +1,54 @@
+"""
+Golden-file extraction tests
+Saved article pages must extract to the saved fields, with every parser path and the original extraction
+"""
+
+import json
+import os
+
+import pytest
+
+from baseline_extraction import baseline_extract
+from scrapers.article_parser import parse_article_html
+from scrapers.extraction import ArticleExtractor
+from scrapers.parsing import ARTICLE_SCOPE, make_soup
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+PAGES = sorted(name[:-len('.html')] for name in os.listdir(FIXTURES) if name.endswith('.html'))
+
+
+def load(page):
+    """(page HTML, expected fields) for a fixture"""
+    with open(os.path.join(FIXTURES, f'{page}.html'), encoding='utf-8') as f:
+        html = f.read()
+    with open(os.path.join(FIXTURES, f'{page}.json'), encoding='utf-8') as f:
+        expected = json.load(f)
+    return html, expected
+
+
+@pytest.mark.parametrize('page', PAGES)
+def test_baseline_matches_golden(page):
+    html, expected = load(page)
+    assert baseline_extract(html) == expected
+
+
+@pytest.mark.parametrize('page', PAGES)
+@pytest.mark.parametrize('backend', ['lxml', 'html.parser'])
+@pytest.mark.parametrize('scoped', [False, True], ids=['full', 'scoped'])
+def test_extractor_matches_golden(page, backend, scoped):
+    html, expected = load(page)
+    soup = make_soup(html, ARTICLE_SCOPE if scoped else None, backends=[backend])
+    assert ArticleExtractor().extract(soup) == expected
+
+
+@pytest.mark.parametrize('page', PAGES)
+def test_parse_article_html_matches_golden(page):
+    html, expected = load(page)
+    article = parse_article_html(html, 'https://www.nytimes.com/2026/01/09/business/example.html')
+    assert article == {
+        'headline': expected['headline'],
+        'author': expected['author'],
+        'date': expected['date'],
+        'content': '\n\n'.join(expected['paragraphs']),
+        'url': 'https://www.nytimes.com/2026/01/09/business/example.html',
+    }
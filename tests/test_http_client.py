@@ -0,0 +1,85 @@
+"""
+HTTP client tests
+Cached JSON is revalidated with ETag / Last-Modified: 304 serves the cache, 200 replaces it
+"""
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import json
+import os
+import threading
+
+import pytest
+
+from utils.http_client import HttpClient
+
+LAST_MODIFIED = 'Sun, 18 Oct 2026 06:00:00 GMT'
+
+
+class Feed(BaseHTTPRequestHandler):
+    etag = '"v1"'
+    body = {'results': ['first']}
+    requests = []
+
+    def do_GET(self):
+        type(self).requests.append(dict(self.headers))
+        if self.headers.get('If-None-Match') == type(self).etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        payload = json.dumps(type(self).body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', type(self).etag)
+        self.send_header('Last-Modified', LAST_MODIFIED)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Feed.etag, Feed.body, Feed.requests = '"v1"', {'results': ['first']}, []
+    httpd = HTTPServer(('127.0.0.1', 0), Feed)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}/topstories/v2/business.json'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_not_modified_serves_the_cached_body(server, tmp_path):
+    client = HttpClient(cache_dir=str(tmp_path), backoff_factor=0)
+    assert client.get_json(server, params={'api-key': 'secret'}) == {'results': ['first']}
+    assert 'If-None-Match' not in Feed.requests[0]
+
+    assert client.get_json(server, params={'api-key': 'secret'}) == {'results': ['first']}
+    assert Feed.requests[1]['If-None-Match'] == '"v1"'
+    assert Feed.requests[1]['If-Modified-Since'] == LAST_MODIFIED
+
+
+def test_changed_response_rewrites_the_cache(server, tmp_path):
+    client = HttpClient(cache_dir=str(tmp_path), backoff_factor=0)
+    client.get_json(server)
+
+    Feed.etag, Feed.body = '"v2"', {'results': ['second']}
+    assert client.get_json(server) == {'results': ['second']}
+
+    (entry,) = os.listdir(tmp_path)
+    with open(tmp_path / entry, encoding='utf-8') as f:
+        cached = json.load(f)
+    assert cached['etag'] == '"v2"' and cached['data'] == {'results': ['second']}
+
+    # The fresh copy is what the next 304 serves
+    assert client.get_json(server) == {'results': ['second']}
+    assert Feed.requests[-1]['If-None-Match'] == '"v2"'
+
+
+def test_secrets_stay_out_of_the_cache(server, tmp_path):
+    client = HttpClient(cache_dir=str(tmp_path), backoff_factor=0)
+    client.get_json(server, params={'api-key': 'secret'})
+    (entry,) = os.listdir(tmp_path)
+    with open(tmp_path / entry, encoding='utf-8') as f:
+        assert 'secret' not in f.read()
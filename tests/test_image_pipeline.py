@@ -0,0 +1,146 @@
+"""
+Image pipeline tests
+Any source mode becomes a bounded JPEG for e-ink; images that cannot be fetched or decoded are dropped
+"""
+
+from io import BytesIO
+import os
+
+import pytest
+import requests
+
+Image = pytest.importorskip('PIL.Image')
+
+from utils.image_pipeline import ImagePipeline
+
+
+def encode(image, fmt):
+    """Image -> bytes in the given format"""
+    output = BytesIO()
+    image.save(output, fmt)
+    return output.getvalue()
+
+
+def decode(data):
+    image = Image.open(BytesIO(data))
+    image.load()
+    return image
+
+
+def noisy(mode, size):
+    """Image with detail in it, so JPEG quality changes the output size"""
+    return Image.effect_noise(size, 64).convert(mode)
+
+
+SOURCES = {
+    'rgba': lambda: encode(Image.new('RGBA', (300, 200), (255, 0, 0, 128)), 'PNG'),
+    'palette': lambda: encode(Image.new('RGB', (300, 200), 'blue').convert('P'), 'PNG'),
+    'cmyk': lambda: encode(Image.new('CMYK', (300, 200), (0, 255, 255, 0)), 'JPEG'),
+}
+
+
+class FakeResponse:
+    def __init__(self, content, status=200):
+        self.content = content
+        self.status_code = status
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f'{self.status_code} error')
+
+
+class FakeHttp:
+    def __init__(self, responses):
+        self.responses = responses
+        self.requested = []
+
+    def get(self, url, timeout=None):
+        self.requested.append(url)
+        response = self.responses[url]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def pipeline(tmp_path, http=None, **options):
+    return ImagePipeline(cache_dir=str(tmp_path / 'images'), http_client=http or FakeHttp({}), **options)
+
+
+@pytest.mark.parametrize('source', sorted(SOURCES))
+def test_any_mode_becomes_a_grayscale_jpeg(tmp_path, source):
+    image = decode(pipeline(tmp_path).convert(SOURCES[source]()))
+    assert image.format == 'JPEG'
+    assert image.mode == 'L'
+    assert image.size == (300, 200)
+
+
+@pytest.mark.parametrize('source', sorted(SOURCES))
+def test_any_mode_becomes_an_rgb_jpeg_in_color(tmp_path, source):
+    image = decode(pipeline(tmp_path, grayscale=False).convert(SOURCES[source]()))
+    assert image.format == 'JPEG'
+    assert image.mode == 'RGB'
+
+
+def test_large_images_are_downscaled_into_the_bounding_box(tmp_path):
+    data = encode(Image.new('RGB', (4000, 1000), 'white'), 'JPEG')
+    image = decode(pipeline(tmp_path, max_size=(800, 600)).convert(data))
+    assert image.size == (800, 200)
+
+
+def test_small_images_are_not_upscaled(tmp_path):
+    data = encode(Image.new('RGB', (120, 80), 'white'), 'PNG')
+    assert decode(pipeline(tmp_path).convert(data)).size == (120, 80)
+
+
+def test_lower_quality_gives_smaller_files(tmp_path):
+    data = encode(noisy('RGB', (400, 400)), 'PNG')
+    low = pipeline(tmp_path, quality=20).convert(data)
+    high = pipeline(tmp_path, quality=90).convert(data)
+    assert len(low) < len(high)
+
+
+def test_fetch_converts_once_and_serves_the_cache(tmp_path):
+    url = 'https://static01.nyt.com/photo.png'
+    http = FakeHttp({url: FakeResponse(SOURCES['rgba']())})
+    images = pipeline(tmp_path, http)
+
+    path = images.fetch(url)
+    assert decode(open(path, 'rb').read()).mode == 'L'
+    assert images.fetch(url) == path
+    assert http.requested == [url]
+
+
+@pytest.mark.parametrize('response', [
+    FakeResponse(b'', status=404),
+    requests.exceptions.ConnectionError('offline'),
+])
+def test_download_failures_drop_the_image(tmp_path, response):
+    url = 'https://static01.nyt.com/missing.jpg'
+    assert pipeline(tmp_path, FakeHttp({url: response})).fetch(url) is None
+
+
+def test_undecodable_images_are_dropped_without_a_cache_file(tmp_path):
+    url = 'https://static01.nyt.com/broken.jpg'
+    images = pipeline(tmp_path, FakeHttp({url: FakeResponse(b'<html>not an image</html>')}))
+    assert images.fetch(url) is None
+    assert os.listdir(images.cache_dir) == []
+
+
+def test_process_keeps_only_usable_images(tmp_path):
+    good = 'https://static01.nyt.com/good.png'
+    bad = 'https://static01.nyt.com/bad.jpg'
+    http = FakeHttp({good: FakeResponse(SOURCES['palette']()), bad: FakeResponse(b'garbage')})
+    articles = [{'image_urls': [{'url': bad, 'caption': 'Broken'}, {'url': good, 'caption': 'Fine'}]}]
+
+    pipeline(tmp_path, http).process(articles)
+    assert [image['caption'] for image in articles[0]['images']] == ['Fine']
+
+
+def test_without_pillow_articles_are_left_alone(tmp_path, monkeypatch):
+    monkeypatch.setattr('utils.image_pipeline.Image', None)
+    http = FakeHttp({})
+    articles = [{'image_urls': [{'url': 'https://static01.nyt.com/photo.png'}]}]
+
+    pipeline(tmp_path, http).process(articles)
+    assert 'images' not in articles[0]
+    assert http.requested == []
@@ -0,0 +1,44 @@
+"""
+Import-time budget tests
+Importing the entry point must not load any scraping, formatting or delivery backend
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded only once a run selects the backend that needs them
+HEAVY_MODULES = ['selenium', 'webdriver_manager', 'bs4', 'lxml', 'ebooklib', 'smtplib', 'cryptography', 'PIL']
+
+# Generous for slow CI machines; a lazy import of main takes a few tens of milliseconds
+IMPORT_BUDGET_SECONDS = 0.5
+
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+''' % (HEAVY_MODULES,)
+
+
+def import_main(tmp_path):
+    """Import main in a fresh interpreter (from a scratch directory, which receives its log file)"""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE], cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_main_import_loads_no_backends(tmp_path):
+    assert import_main(tmp_path)['loaded'] == []
+
+
+def test_main_import_within_budget(tmp_path):
+    import_main(tmp_path)  # Warm the bytecode and OS file caches so only the import itself is timed
+    assert import_main(tmp_path)['elapsed'] < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,127 @@
+"""
+Login tests
+Only a login that leaves the login form counts: a failed one must not be saved or marked authenticated
+"""
+
+import pytest
+
+from scrapers import nyt_scraper_selenium
+from scrapers.nyt_scraper_selenium import NYTScraperSelenium
+
+LOGIN_URL = 'https://myaccount.nytimes.com/auth/login'
+
+
+class FakeDriver:
+    def __init__(self, accepts_login):
+        self.accepts_login = accepts_login
+        self.current_url = 'about:blank'
+
+    def execute_script(self, script, *args):
+        return None
+
+
+class FakeField:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def clear(self):
+        pass
+
+    def send_keys(self, text):
+        pass
+
+    def click(self):
+        # Submitting the form: NYT redirects away from the login page only on success
+        if self.driver.accepts_login:
+            self.driver.current_url = 'https://www.nytimes.com/'
+
+
+class FakeReadiness:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def find_first(self, selectors, timeout=10, clickable=False):
+        return FakeField(self.driver), selectors[0]
+
+    def wait_until(self, condition, timeout=10, description='condition'):
+        return condition() or None
+
+    def wait_for_document_ready(self, timeout=10, state='complete'):
+        return True
+
+    def wait_for_dom_quiet(self, quiet_ms=300, timeout=2):
+        return True
+
+
+class FakeManager:
+    user_data_dir = None
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.authenticated = False
+        self.blocking = None
+
+    def get_driver(self):
+        return self.driver
+
+    def readiness(self):
+        return FakeReadiness(self.driver)
+
+    def navigate(self, url):
+        self.driver.current_url = url
+
+    def take_screenshot(self, filename):
+        pass
+
+    def export_cookies(self):
+        return [{'name': 'NYT-S', 'value': 'token'}]
+
+    def use_profile_blocking(self, profile):
+        self.blocking = profile
+
+
+class RecordingSessionStore:
+    def __init__(self):
+        self.saved = []
+
+    def load(self):
+        return None
+
+    def save(self, cookies):
+        self.saved.append(cookies)
+
+
+def login(monkeypatch, accepts_login):
+    monkeypatch.setattr(nyt_scraper_selenium.time, 'sleep', lambda seconds: None)
+    store = RecordingSessionStore()
+    scraper = NYTScraperSelenium('reader@example.com', 'secret', session_store=store)
+    scraper.wm = FakeManager(FakeDriver(accepts_login))
+    return scraper.login(), scraper.wm, store
+
+
+def test_failed_login_is_not_saved_or_marked_authenticated(monkeypatch):
+    logged_in, wm, store = login(monkeypatch, accepts_login=False)
+    assert not logged_in
+    assert wm.driver.current_url == LOGIN_URL
+    assert not wm.authenticated
+    assert store.saved == []
+
+
+def test_successful_login_is_saved(monkeypatch):
+    logged_in, wm, store = login(monkeypatch, accepts_login=True)
+    assert logged_in
+    assert wm.authenticated
+    assert store.saved == [[{'name': 'NYT-S', 'value': 'token'}]]
+
+
+def test_unwritable_salt_disables_the_session_store(tmp_path, monkeypatch):
+    pytest.importorskip('cryptography')
+    from utils import session_store
+
+    monkeypatch.delenv(session_store.KEY_ENV, raising=False)
+    blocker = tmp_path / 'not-a-directory'
+    blocker.write_text('')
+    store = session_store.SessionStore(str(blocker / 'session.enc'), secret='secret')
+    assert not store.enabled
+    store.save([{'name': 'NYT-S', 'value': 'token'}])
+    assert store.load() is None
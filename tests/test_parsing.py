@@ -0,0 +1,55 @@
+"""
+Scoped parsing tests
+The scoped tree must give the extractor the same fields as parsing the whole page
+"""
+
+import pytest
+
+from scrapers.extraction import default_extractor
+from scrapers.parsing import ARTICLE_SCOPE, make_soup
+
+BACKENDS = [['lxml'], ['html.parser']]
+
+# Body container and byline outside any article/main/section element
+TOP_LEVEL_DIVS = '''<html><body>
+<header><p>Subscribe today for unlimited access to every story, newsletter and puzzle we publish</p></header>
+<div class="wrap">
+  <div class="author">By Jane Doe</div>
+  <h1>Rates Hold Steady</h1>
+  <div class="article-body">
+    <p>The central bank left interest rates unchanged on Wednesday.</p>
+    <p>Officials signaled that cuts could come later in the year.</p>
+  </div>
+</div>
+<footer><p>Footer text with contact details, legal notices and links to other sections of the site</p></footer>
+</body></html>'''
+
+COMPANION_COLUMN = '''<html><body>
+<div class="page"><span class="last-byline">By John Roe</span><h1>Earnings Beat</h1>
+<time datetime="2026-01-09T10:00:00Z">Jan. 9, 2026</time>
+<div class="StoryBodyCompanionColumn"><p>Quarterly profit rose on strong demand for chips.</p></div>
+<div class="StoryBodyCompanionColumn"><p>Shares climbed in after-hours trading on the news.</p></div>
+</div></body></html>'''
+
+CLASS_CONTAINS_ARTICLE = '''<html><body>
+<div class="layout"><div class="ArticleContent-x1"><p>A paragraph that lives in a generic article div.</p></div>
+<div class="Byline"><span itemprop="name">Alex Poe</span></div></div>
+</body></html>'''
+
+
+@pytest.mark.parametrize('html', [TOP_LEVEL_DIVS, COMPANION_COLUMN, CLASS_CONTAINS_ARTICLE])
+@pytest.mark.parametrize('backends', BACKENDS)
+def test_scoped_parse_matches_full_parse(html, backends):
+    full = default_extractor.extract(make_soup(html, backends=backends))
+    scoped = default_extractor.extract(make_soup(html, ARTICLE_SCOPE, backends=backends))
+    assert scoped == full
+
+
+@pytest.mark.parametrize('backends', BACKENDS)
+def test_top_level_body_and_byline_are_kept(backends):
+    fields = default_extractor.extract(make_soup(TOP_LEVEL_DIVS, ARTICLE_SCOPE, backends=backends))
+    assert fields['author'] == 'Jane Doe'
+    assert fields['paragraphs'] == [
+        'The central bank left interest rates unchanged on Wednesday.',
+        'Officials signaled that cuts could come later in the year.',
+    ]
@@ -0,0 +1,78 @@
+"""
+Quota governor tests
+Token refill, the daily reset and a budget shared between processes through SQLite
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from utils import rate_limiter
+from utils.rate_limiter import QuotaExceeded, QuotaGovernor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Clock:
+    def __init__(self, now=1_800_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limiter.time, 'time', clock.time)
+    return clock
+
+
+def test_tokens_refill_at_the_per_minute_rate(tmp_path, clock):
+    quota = QuotaGovernor(str(tmp_path / 'quota.db'), per_minute=6, per_day=100)
+    for _ in range(6):
+        assert quota.try_acquire() == 0
+    assert quota.try_acquire() == pytest.approx(10)
+
+    clock.now += 10
+    assert quota.try_acquire() == 0
+    assert quota.try_acquire() > 0
+
+
+def test_daily_quota_resets_on_a_new_day(tmp_path, clock, monkeypatch):
+    quota = QuotaGovernor(str(tmp_path / 'quota.db'), per_minute=60, per_day=2)
+    monkeypatch.setattr(quota, '_today', lambda: '2026-10-18')
+    quota.try_acquire()
+    quota.try_acquire()
+    with pytest.raises(QuotaExceeded):
+        quota.try_acquire()
+
+    monkeypatch.setattr(quota, '_today', lambda: '2026-10-19')
+    assert quota.try_acquire() == 0
+    assert quota.remaining()['daily'] == 1
+
+
+def test_acquire_gives_up_after_max_wait(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(rate_limiter.time, 'sleep', lambda seconds: setattr(clock, 'now', clock.now + seconds))
+    quota = QuotaGovernor(str(tmp_path / 'quota.db'), per_minute=1, per_day=100)
+    quota.acquire()
+    with pytest.raises(QuotaExceeded):
+        quota.acquire(max_wait=5)
+
+
+def test_budget_is_shared_between_processes(tmp_path):
+    db_path = str(tmp_path / 'quota.db')
+    quota = QuotaGovernor(db_path, per_minute=5, per_day=100)
+    other_process = (
+        'from utils.rate_limiter import QuotaGovernor\n'
+        f'quota = QuotaGovernor({db_path!r}, per_minute=5, per_day=100)\n'
+        'for _ in range(3):\n'
+        '    assert quota.try_acquire() == 0\n'
+    )
+    subprocess.run([sys.executable, '-c', other_process], cwd=REPO_ROOT, check=True)
+
+    remaining = quota.remaining()
+    assert remaining['daily'] == 97
+    assert remaining['minute'] <= 2
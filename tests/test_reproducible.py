@@ -0,0 +1,90 @@
+"""
+Reproducible build tests
+The same articles give a byte-identical EPUB on either backend, and the edition hash ignores the build date
+"""
+
+from datetime import datetime
+
+import pytest
+
+from formatters import epub_formatter
+from formatters.epub_formatter import BACKENDS, EpubFormatter
+from formatters.render_cache import ChapterCache
+
+ARTICLES = [
+    {'headline': 'Markets Rally', 'author': 'A. Writer', 'date': 'October 18, 2026',
+     'url': 'https://www.nytimes.com/markets.html', 'section': 'Business',
+     'content': 'Stocks rose.\n\nBonds fell & "analysts" shrugged.'},
+    {'headline': 'Rates Hold', 'author': '', 'date': 'October 18, 2026',
+     'url': 'https://www.nytimes.com/rates.html', 'section': 'Economy',
+     'content': 'The Fed waited <again>.'},
+]
+
+
+def freeze(monkeypatch, moment):
+    """Make datetime.now() in the formatter return a fixed time"""
+    class Frozen(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return moment.replace(tzinfo=tz) if tz else moment
+    monkeypatch.setattr(epub_formatter, 'datetime', Frozen)
+
+
+@pytest.fixture
+def cover(tmp_path):
+    path = tmp_path / 'cover.jpg'
+    path.write_bytes(b'\xff\xd8\xff\xe0 not really a jpeg')
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def no_source_date_epoch(monkeypatch):
+    monkeypatch.delenv('SOURCE_DATE_EPOCH', raising=False)
+
+
+def build(tmp_path, cover, backend, name, **options):
+    formatter = EpubFormatter(cover_image_path=cover, backend=backend, section_dividers=True, **options)
+    path = formatter.format_for_kindle([dict(article) for article in ARTICLES], filename=str(tmp_path / name))
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_rebuilds_on_the_same_day_are_byte_identical(tmp_path, monkeypatch, cover, backend):
+    freeze(monkeypatch, datetime(2026, 10, 18, 6, 0, 0))
+    first = build(tmp_path, cover, backend, 'first.epub')
+    freeze(monkeypatch, datetime(2026, 10, 18, 21, 45, 30))
+    assert build(tmp_path, cover, backend, 'second.epub') == first
+
+
+def test_streaming_rebuild_from_the_chapter_cache_is_byte_identical(tmp_path, monkeypatch, cover):
+    freeze(monkeypatch, datetime(2026, 10, 18, 6, 0, 0))
+    chapters = ChapterCache(cache_dir=str(tmp_path / 'chapters'))
+    first = build(tmp_path, cover, 'streaming', 'first.epub', chapter_cache=chapters)
+    assert build(tmp_path, cover, 'streaming', 'second.epub', chapter_cache=chapters) == first
+    assert build(tmp_path, cover, 'streaming', 'uncached.epub') == first
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_builds_with_source_date_epoch_are_byte_identical(tmp_path, monkeypatch, cover, backend):
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '1792281600')
+    freeze(monkeypatch, datetime(2026, 10, 18, 6, 0, 0))
+    first = build(tmp_path, cover, backend, 'first.epub')
+    freeze(monkeypatch, datetime(2026, 10, 18, 23, 59, 59))
+    assert build(tmp_path, cover, backend, 'second.epub') == first
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_edition_hash_ignores_the_build_date(monkeypatch, cover, backend):
+    formatter = EpubFormatter(cover_image_path=cover, backend=backend)
+    freeze(monkeypatch, datetime(2026, 10, 18, 6, 0, 0))
+    today = formatter.edition_hash(ARTICLES)
+    freeze(monkeypatch, datetime(2027, 3, 1, 12, 0, 0))
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '0')
+    assert formatter.edition_hash(ARTICLES) == today
+
+
+def test_edition_hash_follows_the_content(cover):
+    formatter = EpubFormatter(cover_image_path=cover)
+    edited = [dict(ARTICLES[0], content='Stocks fell.'), ARTICLES[1]]
+    assert formatter.edition_hash(edited) != formatter.edition_hash(ARTICLES)
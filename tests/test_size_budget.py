@@ -0,0 +1,50 @@
+"""
+Size budget tests
+The cheap upper bound must never undercount, and must spare plan() the rendering work
+"""
+
+import random
+import string
+
+from formatters.size_budget import SizeBudget
+
+ALPHABET = string.printable + '&<>"\'é€😀\x01'
+
+
+def random_article(rng):
+    def text(n):
+        return ''.join(rng.choice(ALPHABET) for _ in range(n))
+    return {
+        'headline': text(60), 'author': text(20), 'date': text(25), 'url': text(80),
+        'content': '\n\n'.join(text(rng.randint(0, 800)) for _ in range(rng.randint(0, 25))),
+        'images': [{'path': f'/cache/images/{text(6)}.jpg', 'caption': text(40)} for _ in range(rng.randint(0, 3))],
+    }
+
+
+def test_chapter_bound_never_undercounts():
+    budget = SizeBudget(10 ** 9)
+    rng = random.Random(7)
+    for _ in range(200):
+        article = random_article(rng)
+        assert budget.chapter_size(article) <= budget.chapter_bound(article)
+
+    escapes = {'headline': '"\'&<>' * 50, 'url': '"' * 100, 'content': '&\n\n' * 2000}
+    assert budget.chapter_size(escapes) <= budget.chapter_bound(escapes)
+
+
+def test_plan_skips_rendering_when_the_bound_fits(monkeypatch):
+    articles = [{'headline': f'Story {n}', 'content': 'Text.\n\n' * 200} for n in range(10)]
+    budget = SizeBudget(10 * 1024 * 1024)
+    monkeypatch.setattr(budget, 'chapter_size', lambda article: 1 / 0)
+    assert budget.plan(articles) == [articles]
+
+
+def test_plan_measures_when_the_bound_does_not_fit(monkeypatch):
+    rng = random.Random(3)
+    articles = [dict(random_article(rng), images=[]) for _ in range(6)]
+    max_bytes = SizeBudget(0).upper_bound(articles) // 2
+    budget = SizeBudget(max_bytes)
+
+    measured = SizeBudget(max_bytes)
+    monkeypatch.setattr(measured, 'upper_bound', lambda articles: float('inf'))
+    assert budget.plan(articles) == measured.plan(articles)
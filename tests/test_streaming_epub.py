@@ -0,0 +1,41 @@
+"""
+Streaming EPUB tests
+A build that fails partway must leave nothing at the output path
+"""
+
+import os
+import zipfile
+
+import pytest
+
+from formatters.streaming_epub import StreamingEpubWriter
+from formatters.zip_stream import ZipStream
+
+
+def test_complete_book_is_written(tmp_path):
+    path = str(tmp_path / 'book.epub')
+    with StreamingEpubWriter(path, 'Title') as writer:
+        writer.add_chapter('article_1.xhtml', 'One', '<html/>')
+    assert zipfile.ZipFile(path).namelist()[0] == 'mimetype'
+    assert os.listdir(tmp_path) == ['book.epub']
+
+
+def test_failed_build_leaves_no_file(tmp_path):
+    path = str(tmp_path / 'book.epub')
+    with pytest.raises(RuntimeError):
+        with StreamingEpubWriter(path, 'Title') as writer:
+            writer.add_chapter('article_1.xhtml', 'One', '<html/>')
+            raise RuntimeError('scraper died')
+    assert os.listdir(tmp_path) == []
+
+
+def test_failed_rebuild_keeps_the_previous_book(tmp_path):
+    path = str(tmp_path / 'book.epub')
+    with open(path, 'wb') as f:
+        f.write(b'previous')
+    stream = ZipStream(path)
+    stream.write('a.txt', 'partial')
+    stream.abort()
+    with open(path, 'rb') as f:
+        assert f.read() == b'previous'
+    assert os.listdir(tmp_path) == ['book.epub']
@@ -0,0 +1,60 @@
+"""
+Template tests
+Every field is escaped, so hostile article text still renders as well-formed XHTML
+"""
+
+import xml.etree.ElementTree as ET
+
+from formatters.templates import render_chapter, render_section_divider, render_toc
+
+XHTML = '{http://www.w3.org/1999/xhtml}'
+HOSTILE = 'Tom & Jerry <script>alert("x")</script> \'quoted\' \x0b'
+CLEAN = HOSTILE.replace('\x0b', '')
+
+
+def parse(document):
+    return ET.fromstring(document.encode('utf-8'))
+
+
+def texts(root, tag, cls=None):
+    return [
+        ''.join(el.itertext()) for el in root.iter(XHTML + tag)
+        if cls is None or el.get('class') == cls
+    ]
+
+
+def test_chapter_fields_are_escaped():
+    article = {
+        'headline': HOSTILE,
+        'author': HOSTILE,
+        'date': HOSTILE,
+        'url': 'https://example.com/a?b=1&c="2"',
+        'content': f'{HOSTILE}\n\nSecond <b>paragraph</b>',
+        'images': [{'path': '/cache/images/a&b.jpg', 'caption': HOSTILE}],
+    }
+    root = parse(render_chapter(article))
+
+    assert texts(root, 'title') == [CLEAN]
+    assert texts(root, 'h1') == [CLEAN]
+    assert texts(root, 'p', 'author') == [f'By {CLEAN}']
+    assert texts(root, 'p', 'date') == [CLEAN]
+    assert texts(root, 'p', 'caption') == [CLEAN]
+    assert texts(root, 'p')[-3:-1] == [CLEAN.strip(), 'Second <b>paragraph</b>']  # paragraphs are stripped
+    assert root.find(f'.//{XHTML}script') is None
+
+    (img,) = root.iter(XHTML + 'img')
+    assert img.get('src') == 'images/a&b.jpg'
+    assert img.get('alt') == CLEAN
+    (link,) = root.iter(XHTML + 'a')
+    assert link.get('href') == article['url']
+    assert link.text == article['url']
+
+
+def test_toc_and_divider_are_escaped():
+    toc = parse(render_toc(HOSTILE, [('article_1.xhtml', HOSTILE)]))
+    assert texts(toc, 'h2') == [CLEAN]
+    assert texts(toc, 'a') == [CLEAN]
+
+    divider = parse(render_section_divider(HOSTILE, subtitle=HOSTILE))
+    assert texts(divider, 'h1') == [CLEAN]
+    assert texts(divider, 'p') == [CLEAN]
@@ -1,4 +1,40 @@
-from .kindle_sender import KindleSender, test_connection
-from .webdriver_manager import WebDriverManager
+"""
+Utilities
+Modules are imported on first attribute access, so e.g. smtplib and Selenium
+are only loaded by the code paths that use them
+"""
 
-__all__ = ['KindleSender', 'test_connection', 'WebDriverManager']
+import importlib
+
+# Exported name -> defining module
+_EXPORTS = {
+    'KindleSender': '.kindle_sender',
+    'test_connection': '.kindle_sender',
+    'WebDriverManager': '.webdriver_manager',
+    'BrowserPool': '.webdriver_manager',
+    'PageReadiness': '.page_readiness',
+    'ChromeDriverResolver': '.driver_resolver',
+    'set_driver_resolver': '.driver_resolver',
+    'HttpClient': '.http_client',
+    'get_shared_client': '.http_client',
+    'ArticleStore': '.article_store',
+    'QuotaGovernor': '.rate_limiter',
+    'QuotaExceeded': '.rate_limiter',
+    'HostThrottle': '.rate_limiter',
+    'DeliveryState': '.delivery_state',
+    'is_newer': '.delivery_state',
+    'SessionStore': '.session_store',
+    'ImagePipeline': '.image_pipeline',
+    'atomic_write': '.atomic_file',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import the defining module on first access"""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,182 @@
+"""
+Article Store
+SQLite-backed cache of scraped articles keyed by canonical URL
+"""
+
+from contextlib import closing
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, urlunsplit
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def canonical_url(url):
+    """
+    Normalize an article URL so the same story always maps to one key
+
+    Drops query strings and fragments (tracking parameters, smid=...), lowercases
+    the scheme and host, and strips a trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower() or 'https', parts.netloc.lower(), path, '', ''))
+
+
+def content_hash(article):
+    """Hash the fields of an article that make up its delivered content"""
+    digest = hashlib.sha256()
+    for field in ('headline', 'author', 'date', 'content'):
+        digest.update((article.get(field) or '').encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def parse_timestamp(value):
+    """Convert an ISO-8601 string or datetime into a POSIX timestamp (None if unparseable)"""
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        try:
+            dt = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class ArticleStore:
+    def __init__(self, db_path='cache/articles.db', ttl_hours=72):
+        """
+        Initialize the article store
+
+        Args:
+            db_path: Path to the SQLite database file
+            ttl_hours: Entries older than this are treated as missing and evicted
+        """
+        self.db_path = db_path
+        self.ttl = ttl_hours * 3600 if ttl_hours else None
+
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS articles (
+                    url TEXT PRIMARY KEY,
+                    headline TEXT,
+                    author TEXT,
+                    date TEXT,
+                    content TEXT,
+                    fetched_at REAL NOT NULL,
+                    content_hash TEXT NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_articles_fetched_at ON articles (fetched_at)')
+
+    def _connect(self):
+        """Open a connection (one per operation, so the store is safe to share across threads)"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def get(self, url, updated_after=None):
+        """
+        Look up a stored article
+
+        Args:
+            url: Article URL (any variant of the canonical URL)
+            updated_after: Optional ISO timestamp/datetime of the latest known
+                           update; entries fetched before it count as stale
+
+        Returns:
+            Article dictionary or None if missing, expired or stale
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                'SELECT * FROM articles WHERE url = ?', (canonical_url(url),)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        if self.ttl and row['fetched_at'] < time.time() - self.ttl:
+            return None
+
+        if updated_after:
+            updated_ts = parse_timestamp(updated_after)
+            if updated_ts and row['fetched_at'] < updated_ts:
+                logger.info(f"Stored copy is older than latest update, refetching: {url}")
+                return None
+
+        return {
+            'headline': row['headline'],
+            'author': row['author'],
+            'date': row['date'],
+            'content': row['content'],
+            'url': url,
+            'fetched_at': row['fetched_at'],
+            'content_hash': row['content_hash'],
+        }
+
+    def put(self, article):
+        """
+        Store (or replace) an article
+
+        Args:
+            article: Article dictionary with at least 'url' and 'content'
+
+        Returns:
+            True if the stored content changed, False if it was identical
+        """
+        url = canonical_url(article['url'])
+        new_hash = content_hash(article)
+
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute('SELECT content_hash FROM articles WHERE url = ?', (url,)).fetchone()
+            conn.execute(
+                '''INSERT OR REPLACE INTO articles
+                   (url, headline, author, date, content, fetched_at, content_hash)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                (
+                    url,
+                    article.get('headline', ''),
+                    article.get('author', ''),
+                    article.get('date', ''),
+                    article.get('content', ''),
+                    time.time(),
+                    new_hash,
+                )
+            )
+
+        return row is None or row['content_hash'] != new_hash
+
+    def invalidate(self, url):
+        """Remove an article so the next scrape refetches it"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute('DELETE FROM articles WHERE url = ?', (canonical_url(url),))
+
+    def evict_expired(self):
+        """
+        Delete entries older than the TTL
+
+        Returns:
+            Number of evicted articles
+        """
+        if not self.ttl:
+            return 0
+
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute('DELETE FROM articles WHERE fetched_at < ?', (time.time() - self.ttl,))
+            evicted = cursor.rowcount
+
+        if evicted:
+            logger.info(f"Evicted {evicted} expired articles from store")
+        return evicted
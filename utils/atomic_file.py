@@ -0,0 +1,85 @@
+"""
+Atomic File Writes
+Write a file through a temporary sibling so readers never see a partial file
+"""
+
+from contextlib import contextmanager
+import os
+import tempfile
+
+
+class AtomicFile:
+    def __init__(self, path, mode='w', encoding=None, permissions=None):
+        """
+        Open a temporary file next to path
+
+        For writers that outlive a single block (e.g. a streaming archive):
+        commit() moves the finished file into place, discard() removes it.
+
+        Args:
+            path: Destination file
+            mode: 'w' for text or 'wb' for bytes
+            encoding: Text encoding (text mode only)
+            permissions: Optional file mode, e.g. 0o600 (set before any data is written)
+        """
+        self.path = path
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, self.tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            if permissions is not None:
+                os.chmod(self.tmp_path, permissions)
+            self.file = os.fdopen(fd, mode, encoding=encoding)
+        except BaseException:
+            os.close(fd)
+            self._remove()
+            raise
+
+    def _remove(self):
+        """Delete the temporary file if it still exists"""
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+    def commit(self):
+        """Close the temporary file and replace the destination with it"""
+        try:
+            self.file.close()
+            os.replace(self.tmp_path, self.path)
+        except BaseException:
+            self._remove()
+            raise
+
+    def discard(self):
+        """Close and delete the temporary file, leaving the destination untouched"""
+        try:
+            self.file.close()
+        finally:
+            self._remove()
+
+
+@contextmanager
+def atomic_write(path, mode='w', encoding=None, permissions=None):
+    """
+    Open a temporary file next to path that replaces it once the block completes
+
+    The temporary file is removed if the block (or the replace) fails, so
+    interrupted writes leave neither a partial file nor a stray .tmp behind.
+
+    Args:
+        path: Destination file
+        mode: 'w' for text or 'wb' for bytes
+        encoding: Text encoding (text mode only)
+        permissions: Optional file mode, e.g. 0o600 (set before any data is written)
+
+    Yields:
+        The open temporary file
+    """
+    atomic = AtomicFile(path, mode, encoding, permissions)
+    try:
+        yield atomic.file
+    except BaseException:
+        atomic.discard()
+        raise
+    atomic.commit()
@@ -0,0 +1,182 @@
+"""
+Delivery State
+Per-edition high-water marks recording what has already been delivered
+"""
+
+from datetime import datetime
+import json
+import logging
+
+from .article_store import canonical_url, parse_timestamp
+from .atomic_file import atomic_write
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Number of delivered URLs remembered per edition
+MAX_REMEMBERED_URLS = 1000
+
+
+def is_newer(article, since=None, exclude_urls=None):
+    """
+    Check whether an article is past an edition's high-water mark
+
+    Args:
+        article: Article dictionary ('url' and optionally 'date')
+        since: ISO timestamp of the newest delivered article, or None
+        exclude_urls: Set of canonical URLs already delivered, or None
+
+    Returns:
+        True if the article has not been delivered yet
+    """
+    url = article.get('url')
+    if exclude_urls and url and canonical_url(url) in exclude_urls:
+        return False
+
+    if since and article.get('date'):
+        article_ts = parse_timestamp(article['date'])
+        since_ts = parse_timestamp(since)
+        if article_ts and since_ts and article_ts <= since_ts:
+            return False
+
+    return True
+
+
+class DeliveryState:
+    def __init__(self, state_path='cache/delivery_state.json'):
+        """
+        Initialize delivery state
+
+        Args:
+            state_path: Path to the JSON state file
+        """
+        self.state_path = state_path
+
+    def _load(self):
+        """Load all edition marks"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read delivery state, starting fresh: {e}")
+            return {}
+
+    def _save(self, state):
+        """Atomically write all edition marks"""
+        with atomic_write(self.state_path, encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+
+    def get_mark(self, edition):
+        """
+        Get the high-water mark of an edition
+
+        Returns:
+            Tuple of (last published ISO timestamp or None, set of delivered canonical URLs)
+        """
+        mark = self._load().get(edition, {})
+        return mark.get('last_published'), set(mark.get('urls', []))
+
+    def get_common_mark(self, editions):
+        """
+        Get a mark that every listed edition is past, for scraping one pool for all of them
+
+        Returns:
+            Tuple of (oldest last published timestamp, or None if any edition has
+            none; set of canonical URLs delivered to every edition)
+        """
+        marks = [self.get_mark(edition) for edition in editions]
+        if not marks:
+            return None, set()
+        timestamps = [parse_timestamp(since) if since else None for since, _ in marks]
+        since = None
+        if all(ts is not None for ts in timestamps):
+            since = min(zip(timestamps, (since for since, _ in marks)))[1]
+        return since, set.intersection(*(urls for _, urls in marks))
+
+    def get_edition_hash(self, edition):
+        """
+        Get the content hash of an edition's last delivered book
+
+        Returns:
+            Hex digest, or None if not recorded
+        """
+        return self._load().get(edition, {}).get('edition_hash')
+
+    def get_sent_volumes(self, edition, edition_hash):
+        """
+        Volumes of an edition already delivered by an interrupted run
+
+        Args:
+            edition: Edition name
+            edition_hash: Content hash of the book being delivered
+
+        Returns:
+            Set of volume file digests, empty unless a partial delivery of this
+            exact book was recorded
+        """
+        progress = self._load().get(edition, {}).get('partial', {})
+        if not edition_hash or progress.get('edition_hash') != edition_hash:
+            return set()
+        return set(progress.get('volumes', []))
+
+    def record_volume(self, edition, edition_hash, volume_digest):
+        """
+        Remember that one volume of a multi-volume book was delivered
+
+        The progress is kept until record() marks the whole book delivered, so
+        a retry of the same book only sends the volumes that are still missing.
+
+        Args:
+            edition: Edition name
+            edition_hash: Content hash of the book being delivered
+            volume_digest: Digest of the delivered volume file
+        """
+        if not edition_hash:
+            return
+        state = self._load()
+        mark = state.setdefault(edition, {})
+        progress = mark.get('partial', {})
+        if progress.get('edition_hash') != edition_hash:
+            progress = {'edition_hash': edition_hash, 'volumes': []}
+        if volume_digest not in progress['volumes']:
+            progress['volumes'].append(volume_digest)
+        mark['partial'] = progress
+        self._save(state)
+
+    def record(self, edition, articles, edition_hash=None):
+        """
+        Advance an edition's high-water mark after a successful delivery
+
+        Args:
+            edition: Edition name
+            articles: Delivered article dictionaries
+            edition_hash: Content hash of the delivered book, if known
+        """
+        state = self._load()
+        mark = state.get(edition, {})
+
+        last_published = mark.get('last_published')
+        last_ts = parse_timestamp(last_published) if last_published else None
+        for article in articles:
+            article_ts = parse_timestamp(article['date']) if article.get('date') else None
+            if article_ts and (last_ts is None or article_ts > last_ts):
+                last_published, last_ts = article['date'], article_ts
+
+        urls = mark.get('urls', [])
+        known = set(urls)
+        for article in articles:
+            url = canonical_url(article['url']) if article.get('url') else None
+            if url and url not in known:
+                urls.append(url)
+                known.add(url)
+
+        state[edition] = {
+            'last_published': last_published,
+            'urls': urls[-MAX_REMEMBERED_URLS:],
+            'delivered_at': datetime.now().isoformat(timespec='seconds'),
+            'edition_hash': edition_hash,
+        }
+        self._save(state)
+        logger.info(f"Recorded delivery of {len(articles)} articles for edition '{edition}'")
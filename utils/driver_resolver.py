@@ -0,0 +1,242 @@
+"""
+ChromeDriver Resolver
+Matches the installed Chrome to a cached chromedriver binary without a network round trip
+"""
+
+from datetime import datetime
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+
+from .atomic_file import atomic_write
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CHROME_BINARIES = [
+    'google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser',
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+]
+WINDOWS_CHROME_BINARIES = [
+    os.path.join(os.environ.get(root, ''), 'Google', 'Chrome', 'Application', 'chrome.exe')
+    for root in ('PROGRAMFILES', 'PROGRAMFILES(X86)', 'LOCALAPPDATA')
+    if os.environ.get(root)
+]
+# Chrome records its version here on Windows, where 'chrome.exe --version' prints nothing
+WINDOWS_VERSION_KEYS = [
+    ('HKEY_CURRENT_USER', r'Software\Google\Chrome\BLBeacon'),
+    ('HKEY_LOCAL_MACHINE', r'Software\Google\Chrome\BLBeacon'),
+    ('HKEY_LOCAL_MACHINE', r'Software\Wow6432Node\Google\Chrome\BLBeacon'),
+]
+VERSION_PATTERN = re.compile(r'(\d+)\.\d+\.\d+(?:\.\d+)?')
+
+# Set to 1/true to never download a driver (sandboxed runners)
+OFFLINE_ENV = 'CHROMEDRIVER_OFFLINE'
+
+
+def _read_version(binary):
+    """Run '<binary> --version' and return the full version string, or None"""
+    try:
+        output = subprocess.run(
+            [binary, '--version'], capture_output=True, text=True, timeout=10
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION_PATTERN.search(output)
+    return match.group(0) if match else None
+
+
+def _read_registry_version():
+    """Chrome version recorded in the Windows registry, or None"""
+    try:
+        import winreg
+    except ImportError:
+        return None
+
+    for hive, key_path in WINDOWS_VERSION_KEYS:
+        try:
+            with winreg.OpenKey(getattr(winreg, hive), key_path) as key:
+                version, _ = winreg.QueryValueEx(key, 'version')
+        except OSError:
+            continue
+        match = VERSION_PATTERN.search(str(version))
+        if match:
+            return match.group(0)
+    return None
+
+
+def _read_file_version(binary):
+    """File version of a Windows executable such as chrome.exe, or None"""
+    if not os.path.exists(binary):
+        return None
+    try:
+        output = subprocess.run(
+            ['powershell', '-NoProfile', '-Command',
+             f"(Get-Item -LiteralPath '{binary}').VersionInfo.ProductVersion"],
+            capture_output=True, text=True, timeout=10
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION_PATTERN.search(output)
+    return match.group(0) if match else None
+
+
+def _major(version):
+    """Major version number of a version string"""
+    return version.split('.', 1)[0] if version else None
+
+
+class ChromeDriverResolver:
+    def __init__(self, cache_dir='cache/drivers', offline=None, chrome_binary=None):
+        """
+        Initialize the resolver
+
+        Lookup order: drivers recorded in the manifest for the installed Chrome
+        major version, then a chromedriver on PATH with a matching version, and
+        only then a download through webdriver-manager. When the Chrome version
+        cannot be read, the newest local driver is used without downloading.
+
+        Args:
+            cache_dir: Directory holding the version manifest
+            offline: Never download; use the best local driver (setting the
+                     CHROMEDRIVER_OFFLINE environment variable turns this on too)
+            chrome_binary: Chrome executable to read the version from (default: auto-detect)
+        """
+        env_offline = os.environ.get(OFFLINE_ENV, '').lower() in ('1', 'true', 'yes')
+        self.cache_dir = cache_dir
+        self.offline = bool(offline) or env_offline
+        self.chrome_binary = chrome_binary
+        self.manifest_path = os.path.join(cache_dir, 'manifest.json')
+        self._resolved = None
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def chrome_version(self):
+        """Installed Chrome version, or None if it cannot be determined"""
+        if sys.platform == 'win32':
+            if self.chrome_binary:
+                return _read_file_version(self.chrome_binary)
+            version = _read_registry_version()
+            if version:
+                return version
+            for binary in WINDOWS_CHROME_BINARIES:
+                version = _read_file_version(binary)
+                if version:
+                    return version
+            return None
+
+        candidates = [self.chrome_binary] if self.chrome_binary else CHROME_BINARIES
+        for binary in candidates:
+            version = _read_version(binary)
+            if version:
+                return version
+        return None
+
+    def _load_manifest(self):
+        """Load {major version: {'path', 'version', 'recorded_at'}}"""
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _record(self, driver_path, driver_version):
+        """Remember a driver binary for its major version (atomic write)"""
+        manifest = self._load_manifest()
+        manifest[_major(driver_version)] = {
+            'path': driver_path,
+            'version': driver_version,
+            'recorded_at': datetime.now().isoformat(),
+        }
+        try:
+            with atomic_write(self.manifest_path) as f:
+                json.dump(manifest, f, indent=2)
+        except OSError as e:
+            logger.warning(f"Could not write driver manifest: {e}")
+
+    def _local_candidates(self):
+        """(path, version) of every known local driver: manifest entries, then PATH"""
+        candidates = []
+        for entry in self._load_manifest().values():
+            if os.path.exists(entry.get('path', '')):
+                candidates.append((entry['path'], entry.get('version')))
+        path_driver = shutil.which('chromedriver')
+        if path_driver:
+            candidates.append((path_driver, _read_version(path_driver)))
+        return candidates
+
+    def _download(self):
+        """Install a matching driver through webdriver-manager"""
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        logger.info("Downloading chromedriver for the installed Chrome...")
+        driver_path = ChromeDriverManager().install()
+        driver_version = _read_version(driver_path)
+        if driver_version:
+            self._record(driver_path, driver_version)
+        return driver_path
+
+    def resolve(self):
+        """
+        Path of a chromedriver matching the installed Chrome
+
+        The result is remembered for the life of the process.
+
+        Raises:
+            RuntimeError: In offline mode when no local driver exists
+        """
+        with self._lock:
+            if self._resolved and os.path.exists(self._resolved):
+                return self._resolved
+
+            chrome_major = _major(self.chrome_version())
+            candidates = self._local_candidates()
+
+            for driver_path, driver_version in candidates:
+                if chrome_major and _major(driver_version) == chrome_major:
+                    logger.info(f"Using cached chromedriver {driver_version} for Chrome {chrome_major}")
+                    if driver_path not in (e['path'] for e in self._load_manifest().values()):
+                        self._record(driver_path, driver_version)
+                    self._resolved = driver_path
+                    return driver_path
+
+            if candidates and (self.offline or not chrome_major):
+                # Newest local driver is the best guess when versions cannot be matched
+                driver_path, driver_version = max(
+                    candidates, key=lambda c: int(_major(c[1]) or 0)
+                )
+                reason = 'Offline mode' if self.offline else 'Chrome version unknown'
+                logger.warning(f"{reason}: using chromedriver {driver_version} for Chrome {chrome_major}")
+                self._resolved = driver_path
+                return driver_path
+
+            if self.offline:
+                raise RuntimeError("Offline mode: no local chromedriver found (cache it once online or put it on PATH)")
+
+            self._resolved = self._download()
+            return self._resolved
+
+
+_default_resolver = None
+_default_lock = threading.Lock()
+
+
+def set_driver_resolver(resolver):
+    """Use the given resolver for every browser started in this process"""
+    global _default_resolver
+    with _default_lock:
+        _default_resolver = resolver
+
+
+def get_driver_resolver():
+    """Process-wide resolver (created with defaults on first use)"""
+    global _default_resolver
+    with _default_lock:
+        if _default_resolver is None:
+            _default_resolver = ChromeDriverResolver()
+        return _default_resolver
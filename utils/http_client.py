@@ -0,0 +1,217 @@
+"""
+HTTP Client
+Pooled, keep-alive HTTP session with retries and ETag / Last-Modified revalidation
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from email.utils import parsedate_to_datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from .atomic_file import atomic_write
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Query parameters that must never end up in cache keys or on disk
+SECRET_PARAMS = ('api-key',)
+
+# Statuses retried inside the connection adapter. Rate-limited APIs leave 429
+# to the caller so that every attempt goes through its quota governor.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+SERVER_ERROR_STATUSES = (500, 502, 503, 504)
+
+# Longest Retry-After a caller will sleep for (seconds)
+MAX_RETRY_AFTER = 60
+
+
+class _CappedRetry(Retry):
+    """
+    urllib3 Retry that only retries the listed statuses and never sleeps
+    longer than MAX_RETRY_AFTER on a Retry-After header
+    """
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        # urllib3 otherwise retries any 413/429/503 carrying Retry-After, listed or not
+        has_retry_after = has_retry_after and status_code in (self.status_forcelist or ())
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def get_retry_after(self, response):
+        delay = super().get_retry_after(response)
+        return None if delay is None else min(delay, MAX_RETRY_AFTER)
+
+
+def retry_after(response, default=1.0, limit=MAX_RETRY_AFTER):
+    """
+    Seconds to wait before retrying a response, from its Retry-After header
+
+    Args:
+        response: requests.Response (typically a 429 or 503)
+        default: Delay when the header is missing or unreadable
+        limit: Upper bound on the delay
+
+    Returns:
+        Delay in seconds, between 0 and limit
+    """
+    value = response.headers.get('Retry-After')
+    delay = default
+    if value:
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                pass
+    return min(max(0.0, delay), limit)
+
+
+class HttpClient:
+    def __init__(self, cache_dir='cache/http', pool_size=10, retries=3, backoff_factor=1.0,
+                 retry_statuses=RETRY_STATUSES):
+        """
+        Initialize HTTP client
+
+        Args:
+            cache_dir: Directory for the on-disk response cache (None disables caching)
+            pool_size: Number of keep-alive connections kept per host
+            retries: Number of retries on connection errors and retry_statuses responses
+            backoff_factor: Exponential backoff factor between retries (seconds)
+            retry_statuses: HTTP statuses retried transparently (pass SERVER_ERROR_STATUSES
+                            to handle 429 in the caller)
+        """
+        self.cache_dir = cache_dir
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+        retry = _CappedRetry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=tuple(retry_statuses),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _cache_path(self, url, params):
+        """Get the cache file path for a request (secrets are excluded from the key)"""
+        public_params = sorted(
+            (k, str(v)) for k, v in (params or {}).items() if k not in SECRET_PARAMS
+        )
+        key = hashlib.sha256(json.dumps([url, public_params]).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f'{key}.json')
+
+    def _load_cached(self, path):
+        """Load a cached response entry, or None if missing or unreadable"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store_cached(self, path, entry):
+        """Atomically write a cache entry so concurrent processes never see partial files"""
+        try:
+            with atomic_write(path, encoding='utf-8') as f:
+                json.dump(entry, f)
+        except OSError as e:
+            logger.warning(f"Could not write HTTP cache entry: {e}")
+
+    def get(self, url, params=None, timeout=30, headers=None):
+        """
+        GET a URL over the pooled session (no revalidation cache)
+
+        Returns:
+            requests.Response
+        """
+        return self.session.get(url, params=params, timeout=timeout, headers=headers)
+
+    def get_json(self, url, params=None, timeout=30):
+        """
+        GET a JSON document, revalidating against the on-disk cache
+
+        Sends If-None-Match / If-Modified-Since when a cached copy exists and
+        returns the cached payload on 304 Not Modified.
+
+        Returns:
+            Parsed JSON payload
+
+        Raises:
+            requests.exceptions.RequestException on network or HTTP errors
+        """
+        cache_path = self._cache_path(url, params) if self.cache_dir else None
+        cached = self._load_cached(cache_path) if cache_path else None
+
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        response = self.session.get(url, params=params, timeout=timeout, headers=headers)
+
+        if response.status_code == 304 and cached:
+            logger.info(f"Not modified, using cached response for {url}")
+            return cached['data']
+
+        response.raise_for_status()
+        data = response.json()
+
+        if cache_path and (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+            self._store_cached(cache_path, {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fetched_at': time.time(),
+                'data': data,
+            })
+
+        return data
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.close()
+
+
+_shared_clients = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_client(cache_dir='cache/http', retry_statuses=RETRY_STATUSES):
+    """
+    Get a process-wide HttpClient so keep-alive connections survive across scraper instances
+
+    Args:
+        cache_dir: Directory for the on-disk response cache
+        retry_statuses: HTTP statuses the client retries transparently
+
+    Returns:
+        HttpClient
+    """
+    key = (cache_dir, tuple(retry_statuses))
+    with _shared_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = HttpClient(cache_dir=cache_dir, retry_statuses=retry_statuses)
+            _shared_clients[key] = client
+        return client
@@ -0,0 +1,185 @@
+"""
+Image Pipeline
+Downloads article images concurrently and converts them for e-ink: downscaled, grayscale JPEG
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import requests
+
+from .atomic_file import atomic_write
+from .http_client import HttpClient
+
+try:
+    from PIL import Image
+except ImportError:  # Optional: without Pillow editions are sent without images
+    Image = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Kindle Paperwhite screen in portrait; larger images only cost attachment size
+KINDLE_SCREEN = (1072, 1448)
+
+
+class ImagePipeline:
+    def __init__(self, cache_dir='cache/images', http_client=None, max_size=KINDLE_SCREEN, quality=60,
+                 grayscale=True, workers=4):
+        """
+        Initialize the image pipeline
+
+        Downloads are cached by URL (url -> content hash index) and processed
+        images by the hash of the downloaded bytes plus the output settings, so
+        a photo is downloaded and converted once however many articles or runs
+        use it.
+
+        Args:
+            cache_dir: Directory for processed images and the URL index
+            http_client: Optional HttpClient (default: a dedicated pooled client)
+            max_size: (width, height) bounding box images are downscaled into
+            quality: JPEG quality (1-95)
+            grayscale: Convert to grayscale (e-ink screens show no color)
+            workers: Concurrent downloads
+        """
+        self.cache_dir = cache_dir
+        self.http = http_client or HttpClient(cache_dir=None, pool_size=workers)
+        self.max_size = tuple(max_size)
+        self.quality = quality
+        self.grayscale = grayscale
+        self.workers = max(1, workers)
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+
+        if Image is None:
+            logger.warning("Pillow is not installed; articles will be formatted without images")
+
+    @property
+    def enabled(self):
+        """True if images can be processed"""
+        return Image is not None
+
+    def _load_index(self):
+        """Load the {url: content hash} index"""
+        try:
+            with open(self.index_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        """Atomically write the URL index"""
+        with self._lock:
+            index = dict(self._index)
+        try:
+            with atomic_write(self.index_path) as f:
+                json.dump(index, f)
+        except OSError as e:
+            logger.warning(f"Could not write image index: {e}")
+
+    def _processed_path(self, digest):
+        """Processed image file for a source hash under the current settings"""
+        mode = 'gray' if self.grayscale else 'color'
+        settings = f'{self.max_size[0]}x{self.max_size[1]}-q{self.quality}-{mode}'
+        return os.path.join(self.cache_dir, f'{digest[:32]}-{settings}.jpg')
+
+    def convert(self, data):
+        """
+        Downscale and re-encode an image for the Kindle
+
+        Args:
+            data: Source image bytes (any format Pillow reads)
+
+        Returns:
+            JPEG bytes
+        """
+        with Image.open(BytesIO(data)) as image:
+            image.draft('L' if self.grayscale else 'RGB', self.max_size)  # JPEG sources decode at reduced size
+            image = image.convert('L' if self.grayscale else 'RGB')
+            image.thumbnail(self.max_size, Image.LANCZOS)
+            output = BytesIO()
+            image.save(output, 'JPEG', quality=self.quality, optimize=True)
+            return output.getvalue()
+
+    def fetch(self, url):
+        """
+        Get the processed image for a URL, downloading and converting it only if not cached
+
+        Returns:
+            Path of the processed JPEG, or None if the image could not be used
+        """
+        with self._lock:
+            digest = self._index.get(url)
+        if digest and os.path.exists(self._processed_path(digest)):
+            return self._processed_path(digest)
+
+        try:
+            response = self.http.get(url, timeout=30)
+            response.raise_for_status()
+            data = response.content
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Could not download image {url}: {e}")
+            return None
+
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._processed_path(digest)
+        if not os.path.exists(path):
+            try:
+                converted = self.convert(data)
+            except Exception as e:
+                logger.warning(f"Could not convert image {url}: {e}")
+                return None
+            with atomic_write(path, 'wb') as f:
+                f.write(converted)
+            logger.debug(f"Converted image {url}: {len(data)} -> {len(converted)} bytes")
+
+        with self._lock:
+            self._index[url] = digest
+        return path
+
+    def process(self, articles):
+        """
+        Attach processed images to articles
+
+        Reads each article's 'image_urls' ([{'url', 'caption'}]) and sets
+        'images' to [{'path', 'caption'}]. Every distinct URL is fetched once,
+        concurrently; repeats (by URL or by content) share one file.
+
+        Args:
+            articles: Article dictionaries; updated in place
+
+        Returns:
+            The same list
+        """
+        if not self.enabled:
+            return articles
+
+        urls = list(dict.fromkeys(
+            image['url'] for article in articles for image in article.get('image_urls', []) if image.get('url')
+        ))
+        if not urls:
+            return articles
+
+        logger.info(f"Processing {len(urls)} images with {self.workers} workers")
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            paths = dict(zip(urls, executor.map(self.fetch, urls)))
+        self._save_index()
+
+        for article in articles:
+            images, seen = [], set()
+            for image in article.get('image_urls', []):
+                path = paths.get(image.get('url'))
+                if path and path not in seen:
+                    seen.add(path)
+                    images.append({'path': path, 'caption': image.get('caption', '')})
+            article['images'] = images
+
+        logger.info(f"Attached {len(set(p for p in paths.values() if p))} distinct images")
+        return articles
@@ -0,0 +1,163 @@
+"""
+Page Readiness
+Waits on concrete page signals with short deadlines instead of fixed sleeps
+"""
+
+from selenium.webdriver.common.by import By
+import json
+import logging
+import time
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Records the time of the last DOM mutation on the page
+MUTATION_OBSERVER_SCRIPT = """
+if (!window.__kindleMutationObserver) {
+    window.__kindleLastMutation = Date.now();
+    window.__kindleMutationObserver = new MutationObserver(function () {
+        window.__kindleLastMutation = Date.now();
+    });
+    window.__kindleMutationObserver.observe(document, {childList: true, subtree: true, attributes: true});
+}
+return Date.now() - window.__kindleLastMutation;
+"""
+
+NETWORK_START_EVENTS = ('Network.requestWillBeSent',)
+NETWORK_END_EVENTS = ('Network.loadingFinished', 'Network.loadingFailed')
+
+
+class PageReadiness:
+    def __init__(self, driver, poll_interval=0.1):
+        """
+        Initialize readiness checks for a driver
+
+        Selector probes use find_elements, which returns immediately when the
+        driver's implicit wait is 0, so alternative selectors can be polled
+        together instead of each one burning a full timeout.
+
+        Args:
+            driver: Selenium WebDriver
+            poll_interval: Seconds between signal checks
+        """
+        self.driver = driver
+        self.poll_interval = poll_interval
+
+    def wait_until(self, condition, timeout=10, description='condition'):
+        """
+        Poll a condition until it returns a truthy value
+
+        Returns:
+            The condition's value, or None on timeout
+        """
+        deadline = time.time() + timeout
+        while True:
+            try:
+                result = condition()
+                if result:
+                    return result
+            except Exception as e:
+                logger.debug(f"Readiness check for {description} raised: {e}")
+            if time.time() >= deadline:
+                logger.debug(f"Timed out after {timeout}s waiting for {description}")
+                return None
+            time.sleep(self.poll_interval)
+
+    def wait_for_document_ready(self, timeout=10, state='complete'):
+        """Wait for document.readyState to reach 'interactive' or 'complete'"""
+        accepted = ('complete',) if state == 'complete' else ('interactive', 'complete')
+        return self.wait_until(
+            lambda: self.driver.execute_script("return document.readyState") in accepted,
+            timeout,
+            f"document.readyState {state}"
+        )
+
+    def find_first(self, selectors, timeout=10, clickable=False):
+        """
+        Probe alternative selectors together until one matches
+
+        Args:
+            selectors: List of (By, value) tuples, in order of preference
+            timeout: Overall deadline in seconds
+            clickable: Require the element to be displayed and enabled
+
+        Returns:
+            Tuple of (WebElement, (By, value)) or (None, None)
+        """
+        def probe():
+            for by_type, selector in selectors:
+                for element in self.driver.find_elements(by_type, selector):
+                    if not clickable or (element.is_displayed() and element.is_enabled()):
+                        return element, (by_type, selector)
+            return None
+
+        found = self.wait_until(probe, timeout, f"any of {len(selectors)} selectors")
+        return found or (None, None)
+
+    def wait_for_selector(self, css_selector, timeout=10):
+        """Wait for a CSS selector (comma-separated alternatives allowed) to match"""
+        element, _ = self.find_first([(By.CSS_SELECTOR, css_selector)], timeout)
+        return element
+
+    def wait_for_dom_quiet(self, quiet_ms=500, timeout=5):
+        """Wait until the DOM has not changed for quiet_ms milliseconds"""
+        return self.wait_until(
+            lambda: self.driver.execute_script(MUTATION_OBSERVER_SCRIPT) >= quiet_ms,
+            timeout,
+            f"{quiet_ms}ms of DOM quiescence"
+        )
+
+    def wait_for_network_idle(self, idle_ms=500, timeout=5):
+        """
+        Wait until no network requests have been in flight for idle_ms milliseconds
+
+        Uses CDP Network events from the performance log when the driver was
+        created with performance logging enabled, otherwise falls back to the
+        page's Resource Timing entries settling.
+        """
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception:
+            return self._wait_for_resources_settled(idle_ms, timeout)
+
+        in_flight = set()
+        idle_since = time.time()
+        deadline = time.time() + timeout
+
+        while time.time() < deadline:
+            for entry in entries:
+                try:
+                    message = json.loads(entry['message'])['message']
+                except (KeyError, ValueError):
+                    continue
+                method = message.get('method')
+                request_id = message.get('params', {}).get('requestId')
+                if method in NETWORK_START_EVENTS:
+                    in_flight.add(request_id)
+                elif method in NETWORK_END_EVENTS:
+                    in_flight.discard(request_id)
+
+            now = time.time()
+            if in_flight:
+                idle_since = now
+            elif (now - idle_since) * 1000 >= idle_ms:
+                return True
+            time.sleep(self.poll_interval)
+            entries = self.driver.get_log('performance')
+
+        logger.debug(f"Network not idle after {timeout}s ({len(in_flight)} requests in flight)")
+        return False
+
+    def _wait_for_resources_settled(self, idle_ms, timeout):
+        """Fallback network-idle check based on the Resource Timing entry count"""
+        state = {'count': -1, 'since': time.time()}
+
+        def settled():
+            count = self.driver.execute_script("return performance.getEntriesByType('resource').length")
+            now = time.time()
+            if count != state['count']:
+                state['count'], state['since'] = count, now
+                return False
+            return (now - state['since']) * 1000 >= idle_ms
+
+        return bool(self.wait_until(settled, timeout, "resource loading to settle"))
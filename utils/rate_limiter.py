@@ -0,0 +1,197 @@
+"""
+Rate Limiter
+Cross-process token-bucket limiter with a daily quota, backed by SQLite,
+plus an in-process per-host politeness throttle
+"""
+
+from contextlib import closing, contextmanager
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class QuotaExceeded(Exception):
+    """Raised when a request cannot be admitted within the quota"""
+
+
+class QuotaGovernor:
+    def __init__(self, db_path='cache/nyt_quota.db', name='nyt-api',
+                 per_minute=5, per_day=500, burst=None, max_wait=120):
+        """
+        Initialize the quota governor
+
+        State lives in SQLite so every process on the machine (scheduler,
+        manual runs, CI) draws from the same budget.
+
+        Args:
+            db_path: Path to the shared SQLite state file
+            name: Bucket name (one row per rate-limited service)
+            per_minute: Sustained requests per minute
+            per_day: Requests per calendar day (UTC)
+            burst: Bucket capacity (defaults to per_minute)
+            max_wait: Default seconds a caller will queue before giving up
+        """
+        self.db_path = db_path
+        self.name = name
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst or per_minute)
+        self.per_day = per_day
+        self.max_wait = max_wait
+
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL,
+                    day TEXT NOT NULL,
+                    day_count INTEGER NOT NULL
+                )
+            ''')
+            conn.execute(
+                'INSERT OR IGNORE INTO buckets (name, tokens, updated, day, day_count) VALUES (?, ?, ?, ?, 0)',
+                (self.name, self.capacity, time.time(), self._today())
+            )
+
+    def _connect(self):
+        """Open a connection in autocommit mode so transactions are controlled explicitly"""
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _today(self):
+        """Current quota day"""
+        return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+    def _refilled(self, row, now):
+        """Apply token refill and daily reset to a stored row"""
+        tokens, updated, day, day_count = row
+        tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+        if day != self._today():
+            day, day_count = self._today(), 0
+        return tokens, day, day_count
+
+    def try_acquire(self):
+        """
+        Take one token if available without waiting
+
+        Returns:
+            0 if admitted, otherwise the number of seconds until a token is available
+
+        Raises:
+            QuotaExceeded if the daily quota is used up
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            # BEGIN IMMEDIATE takes the write lock up front, serializing concurrent processes
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute(
+                    'SELECT tokens, updated, day, day_count FROM buckets WHERE name = ?', (self.name,)
+                ).fetchone()
+                tokens, day, day_count = self._refilled(row, now)
+
+                if day_count >= self.per_day:
+                    conn.execute('ROLLBACK')
+                    raise QuotaExceeded(f"Daily quota of {self.per_day} requests used up for {self.name}")
+
+                wait = 0
+                if tokens >= 1:
+                    tokens -= 1
+                    day_count += 1
+                else:
+                    wait = (1 - tokens) / self.rate
+
+                conn.execute(
+                    'UPDATE buckets SET tokens = ?, updated = ?, day = ?, day_count = ? WHERE name = ?',
+                    (tokens, now, day, day_count, self.name)
+                )
+                conn.execute('COMMIT')
+                return wait
+            except sqlite3.Error:
+                conn.execute('ROLLBACK')
+                raise
+
+    def acquire(self, max_wait=None):
+        """
+        Wait for a token, queueing the caller instead of failing it
+
+        Args:
+            max_wait: Seconds to wait before giving up (defaults to the governor's max_wait)
+
+        Raises:
+            QuotaExceeded if the daily quota is used up or no token frees up in time
+        """
+        max_wait = self.max_wait if max_wait is None else max_wait
+        deadline = time.time() + max_wait
+
+        while True:
+            wait = self.try_acquire()
+            if wait == 0:
+                return
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise QuotaExceeded(f"No {self.name} request slot available within {max_wait}s")
+
+            logger.info(f"Rate limit reached for {self.name}, waiting {min(wait, remaining):.1f}s")
+            time.sleep(min(wait, remaining))
+
+    def remaining(self):
+        """
+        Get the remaining budget
+
+        Returns:
+            Dictionary with 'minute' (tokens available now) and 'daily' (requests left today)
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                'SELECT tokens, updated, day, day_count FROM buckets WHERE name = ?', (self.name,)
+            ).fetchone()
+
+        tokens, day, day_count = self._refilled(row, time.time())
+        return {
+            'minute': int(tokens),
+            'daily': max(0, self.per_day - day_count),
+        }
+
+
+class HostThrottle:
+    def __init__(self, max_concurrent=2, min_interval=1.0):
+        """
+        In-process politeness limiter for page loads, applied per host
+
+        Args:
+            max_concurrent: Maximum simultaneous requests to one host
+            min_interval: Minimum seconds between request starts to one host
+        """
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_start = {}
+
+    @contextmanager
+    def slot(self, url):
+        """Hold a request slot for the URL's host for the duration of the block"""
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.Semaphore(self.max_concurrent))
+
+        with semaphore:
+            with self._lock:
+                now = time.time()
+                start = max(now, self._next_start.get(host, 0))
+                self._next_start[host] = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
@@ -0,0 +1,128 @@
+"""
+Session Store
+Keeps a logged-in browser session's cookies on disk, encrypted, between runs
+"""
+
+import base64
+import json
+import logging
+import os
+import time
+
+from .atomic_file import atomic_write
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+except ImportError:  # Optional: without it sessions are simply not persisted
+    Fernet = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# A Fernet key (base64) here takes precedence over deriving one from the secret
+KEY_ENV = 'KINDLE_SESSION_KEY'
+KDF_ITERATIONS = 480000
+
+
+class SessionStore:
+    def __init__(self, path='cache/nyt_session.enc', secret=None):
+        """
+        Initialize the session store
+
+        The encryption key comes from the KINDLE_SESSION_KEY environment variable,
+        or is derived from the secret (e.g. the account password) with PBKDF2 and
+        a random salt kept next to the session file. Without the cryptography
+        package, or without any key material, nothing is persisted.
+
+        Args:
+            path: Encrypted session file
+            secret: Passphrase to derive the key from
+        """
+        self.path = path
+        self.salt_path = path + '.salt'
+        self._fernet = None
+
+        if Fernet is None:
+            logger.warning("cryptography is not installed; login sessions will not be persisted")
+            return
+
+        key = os.environ.get(KEY_ENV)
+        if key:
+            self._fernet = Fernet(key.encode())
+        elif secret:
+            try:
+                self._fernet = Fernet(self._derive_key(secret))
+            except OSError as e:
+                logger.warning(f"Could not create the session key salt, login sessions will not be persisted: {e}")
+
+    @property
+    def enabled(self):
+        """True if sessions can be saved and loaded"""
+        return self._fernet is not None
+
+    def _write_private(self, path, data):
+        """Atomically write bytes readable only by the current user"""
+        with atomic_write(path, 'wb', permissions=0o600) as f:
+            f.write(data)
+
+    def _derive_key(self, secret):
+        """PBKDF2-SHA256 key from the secret and this store's salt (created on first use)"""
+        try:
+            with open(self.salt_path, 'rb') as f:
+                salt = f.read()
+        except FileNotFoundError:
+            salt = os.urandom(16)
+            self._write_private(self.salt_path, salt)
+
+        kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=KDF_ITERATIONS)
+        return base64.urlsafe_b64encode(kdf.derive(secret.encode()))
+
+    def save(self, cookies):
+        """
+        Encrypt and store session cookies
+
+        Args:
+            cookies: Cookie dictionaries as returned by WebDriverManager.export_cookies()
+        """
+        if not self.enabled:
+            return
+        payload = json.dumps({'saved_at': time.time(), 'cookies': cookies}).encode()
+        try:
+            self._write_private(self.path, self._fernet.encrypt(payload))
+            logger.info(f"Saved login session ({len(cookies)} cookies)")
+        except OSError as e:
+            logger.warning(f"Could not save login session: {e}")
+
+    def load(self):
+        """
+        Load the stored session's cookies, dropping any that have expired
+
+        Returns:
+            List of cookie dictionaries, or None if there is no readable session
+        """
+        if not self.enabled:
+            return None
+        try:
+            with open(self.path, 'rb') as f:
+                token = f.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            payload = json.loads(self._fernet.decrypt(token))
+        except (InvalidToken, ValueError):
+            logger.warning("Stored login session could not be decrypted, ignoring it")
+            return None
+
+        now = time.time()
+        cookies = [c for c in payload.get('cookies', []) if c.get('expiry', now + 1) > now]
+        return cookies or None
+
+    def clear(self):
+        """Forget the stored session"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
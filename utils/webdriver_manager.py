@@ -9,23 +9,101 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from contextlib import contextmanager
+import json
 import logging
+import os
+import threading
+import time
+
+from .page_readiness import PageReadiness
+from .driver_resolver import get_driver_resolver
+
+try:
+    import psutil
+except ImportError:  # Optional: used for accurate browser memory accounting
+    psutil = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# User agent to appear as normal browser - updated to match current Chrome
+USER_AGENT = (
+    'Mozilla/5.0 (X11; Linux x86_64) '
+    'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.7499.169 Safari/537.36'
+)
+
+# Ad, analytics and tracking hosts - never needed to log in or read an article
+TRACKER_URL_PATTERNS = [
+    '*google-analytics.com*', '*googletagmanager.com*', '*googletagservices.com*',
+    '*doubleclick.net*', '*googlesyndication.com*', '*adservice.google.com*',
+    '*amazon-adsystem.com*', '*adnxs.com*', '*criteo.com*', '*criteo.net*',
+    '*taboola.com*', '*outbrain.com*', '*facebook.net*', '*connect.facebook.com*',
+    '*scorecardresearch.com*', '*chartbeat.com*', '*chartbeat.net*',
+    '*hotjar.com*', '*segment.io*', '*nr-data.net*', '*newrelic.com*',
+]
+
+# Images, fonts and media - article text does not need them
+MEDIA_URL_PATTERNS = [
+    '*.jpg*', '*.jpeg*', '*.png*', '*.gif*', '*.webp*', '*.avif*', '*.svg*', '*.ico*',
+    '*.woff*', '*.woff2*', '*.ttf*', '*.otf*',
+    '*.mp4*', '*.webm*', '*.m3u8*', '*.mp3*', '*vp.nyt.com*',
+]
+
+# Chrome flags that cut memory and background work
+LIGHTWEIGHT_ARGS = [
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--mute-audio',
+    '--no-first-run',
+    '--renderer-process-limit=2',
+    '--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication',
+    '--js-flags=--max-old-space-size=256',
+    '--blink-settings=imagesEnabled=false',
+]
+
+# Browser profiles selectable per use case
+BROWSER_PROFILES = {
+    # Full-fidelity browser for the login flow (CAPTCHA and login widgets need images)
+    'login': {
+        'window_size': '1920,1080',
+        'images': True,
+        'blocked_urls': TRACKER_URL_PATTERNS,
+        'extra_args': ['--start-maximized'],
+    },
+    # Stripped-down browser for loading article and section pages
+    'article': {
+        'window_size': '1280,800',
+        'images': False,
+        'blocked_urls': TRACKER_URL_PATTERNS + MEDIA_URL_PATTERNS,
+        'extra_args': LIGHTWEIGHT_ARGS,
+    },
+}
+
 
 class WebDriverManager:
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, profile='login', user_data_dir=None):
         """
         Initialize WebDriver Manager
 
         Args:
             headless: Run browser in headless mode (no GUI)
+            profile: Browser profile name from BROWSER_PROFILES ('login' or 'article')
+            user_data_dir: Optional Chrome profile directory kept between runs (its
+                           cookies and HTTP cache survive); only one browser may use it at a time
         """
+        if profile not in BROWSER_PROFILES:
+            raise ValueError(f"Unknown browser profile: {profile}")
         self.headless = headless
+        self.profile = profile
+        self.user_data_dir = user_data_dir
         self.driver = None
+        self.created_at = None
+        self.pages_loaded = 0
+        self.authenticated = False
 
     def create_driver(self):
         """Create and configure Chrome WebDriver"""
@@ -44,8 +122,16 @@ class WebDriverManager:
             chrome_options.add_argument('--disable-dev-shm-usage')
             chrome_options.add_argument('--disable-blink-features=AutomationControlled')
             chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--start-maximized')
+
+            # Window size, resource loading and memory flags depend on the profile
+            profile = BROWSER_PROFILES[self.profile]
+            chrome_options.add_argument(f"--window-size={profile['window_size']}")
+            for arg in profile['extra_args']:
+                chrome_options.add_argument(arg)
+            logger.info(f"Using '{self.profile}' browser profile")
+
+            if self.user_data_dir:
+                chrome_options.add_argument(f"--user-data-dir={os.path.abspath(self.user_data_dir)}")
 
             # More anti-detection measures
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
@@ -54,27 +140,30 @@ class WebDriverManager:
             # Add realistic browser preferences
             chrome_options.add_experimental_option("prefs", {
                 "profile.default_content_setting_values.notifications": 2,
-                "profile.managed_default_content_settings.images": 1,
+                "profile.managed_default_content_settings.images": 1 if profile['images'] else 2,
             })
 
-            # User agent to appear as normal browser - updated to match current Chrome
-            chrome_options.add_argument(
-                'user-agent=Mozilla/5.0 (X11; Linux x86_64) '
-                'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.7499.169 Safari/537.36'
-            )
+            # User agent to appear as normal browser
+            chrome_options.add_argument(f'user-agent={USER_AGENT}')
 
             # Suppress logging
             chrome_options.add_argument('--log-level=3')
 
-            # Setup Chrome driver with webdriver-manager
-            service = Service(ChromeDriverManager().install())
+            # CDP Network events are read from the performance log to detect network idle
+            chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+            # Cached chromedriver matching the installed Chrome; downloads only on a version change
+            service = Service(get_driver_resolver().resolve())
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
 
             # Remove automation indicators
             self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-                "userAgent": 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.7499.169 Safari/537.36'
+                "userAgent": USER_AGENT
             })
 
+            # Drop trackers (and for lightweight profiles, media) before they are requested
+            self.set_blocked_urls(profile['blocked_urls'])
+
             # Enhanced anti-detection scripts
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
 
@@ -88,10 +177,15 @@ class WebDriverManager:
                 });
             """)
 
-            # Set timeouts
-            self.driver.implicitly_wait(10)
+            # Set timeouts - no implicit wait: PageReadiness polls explicit signals,
+            # and a missing optional selector must not cost a full timeout
+            self.driver.implicitly_wait(0)
             self.driver.set_page_load_timeout(30)
 
+            self.created_at = time.time()
+            self.pages_loaded = 0
+            self.authenticated = False
+
             logger.info("WebDriver setup complete")
             return self.driver
 
@@ -115,6 +209,124 @@ class WebDriverManager:
                 logger.error(f"Error closing WebDriver: {e}")
             finally:
                 self.driver = None
+                self.authenticated = False
+
+    def set_blocked_urls(self, patterns):
+        """
+        Block requests matching URL patterns via CDP (can be changed on a live browser)
+
+        Args:
+            patterns: URL patterns with '*' wildcards
+        """
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
+        except Exception as e:
+            logger.warning(f"Could not set blocked URLs: {e}")
+
+    def use_profile_blocking(self, profile):
+        """Switch a live browser to another profile's request blocking (e.g. after login)"""
+        self.set_blocked_urls(BROWSER_PROFILES[profile]['blocked_urls'])
+
+    def navigate(self, url):
+        """Load a page, counting it towards the driver's recycle budget"""
+        self._drain_performance_log()
+        self.driver.get(url)
+        self.pages_loaded += 1
+
+    def _drain_performance_log(self):
+        """Discard buffered CDP events so network-idle checks only see the next page"""
+        try:
+            self.driver.get_log('performance')
+        except Exception:
+            pass
+
+    def evaluate(self, function_source, *args):
+        """
+        Run a JavaScript function inside the page and return its JSON result
+
+        Evaluated through CDP Runtime.evaluate with returnByValue, so only the
+        function's (small) result crosses the wire instead of page_source.
+        Falls back to execute_script where CDP is unavailable.
+
+        Args:
+            function_source: JavaScript function expression, e.g. "function (a) { ... }"
+            *args: JSON-serializable arguments passed to the function
+
+        Returns:
+            The function's return value, converted to Python objects
+        """
+        call = f"({function_source})({', '.join(json.dumps(arg) for arg in args)})"
+        try:
+            response = self.driver.execute_cdp_cmd('Runtime.evaluate', {
+                'expression': call,
+                'returnByValue': True,
+                'awaitPromise': True,
+            })
+            if 'exceptionDetails' in response:
+                raise RuntimeError(response['exceptionDetails'].get('text', 'JavaScript error'))
+            return response['result'].get('value')
+        except AttributeError:
+            return self.driver.execute_script(f"return {call};")
+
+    def readiness(self):
+        """Get a PageReadiness helper for the current driver"""
+        return PageReadiness(self.driver)
+
+    def export_cookies(self):
+        """Get the current session's cookies (e.g. to share a login with other browsers)"""
+        return self.driver.get_cookies()
+
+    def import_cookies(self, cookies, url):
+        """
+        Load cookies into this browser
+
+        Args:
+            cookies: Cookie dictionaries as returned by export_cookies()
+            url: Page on the cookies' site to open first (browsers only accept
+                 cookies for the domain currently loaded)
+        """
+        self.navigate(url)
+        added = 0
+        for cookie in cookies:
+            try:
+                self.driver.add_cookie(cookie)
+                added += 1
+            except Exception as e:
+                logger.debug(f"Skipping cookie {cookie.get('name')}: {e}")
+        logger.info(f"Imported {added} of {len(cookies)} cookies")
+
+    def is_healthy(self):
+        """Check that the browser session still responds"""
+        if self.driver is None:
+            return False
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception as e:
+            logger.warning(f"WebDriver health check failed: {e}")
+            return False
+
+    def memory_mb(self):
+        """
+        Approximate browser memory use in MB
+
+        Uses the resident size of the chromedriver process tree when psutil is
+        installed, otherwise the page's JS heap size.
+        """
+        if self.driver is None:
+            return 0
+        try:
+            if psutil is not None:
+                process = psutil.Process(self.driver.service.process.pid)
+                processes = [process] + process.children(recursive=True)
+                return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+            heap = self.driver.execute_script(
+                "return window.performance && performance.memory ? performance.memory.usedJSHeapSize : 0"
+            )
+            return (heap or 0) / (1024 * 1024)
+        except Exception as e:
+            logger.debug(f"Could not measure browser memory: {e}")
+            return 0
 
     def wait_for_element(self, by, value, timeout=10):
         """
@@ -187,6 +399,108 @@ class WebDriverManager:
         self.quit()
 
 
+class BrowserPool:
+    def __init__(self, headless=True, size=1, max_pages=100, max_memory_mb=1500, max_age=6 * 3600,
+                 profile='login'):
+        """
+        Pool of long-lived browsers leased to scrapers
+
+        Drivers stay open (and logged in) between leases, so a long-running
+        process such as the scheduler pays browser startup and login once.
+
+        Args:
+            headless: Run browsers in headless mode
+            size: Maximum number of browsers alive at once
+            max_pages: Recycle a browser after it has loaded this many pages
+            max_memory_mb: Recycle a browser once it uses more memory than this
+            max_age: Recycle a browser after this many seconds
+            profile: Browser profile for new browsers (see BROWSER_PROFILES)
+        """
+        self.headless = headless
+        self.profile = profile
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.max_age = max_age
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _needs_recycle(self, wm):
+        """Check whether a browser has exceeded its page, age or memory budget"""
+        if wm.pages_loaded >= self.max_pages:
+            logger.info(f"Recycling browser after {wm.pages_loaded} pages")
+            return True
+        if wm.created_at and time.time() - wm.created_at > self.max_age:
+            logger.info("Recycling browser after reaching max age")
+            return True
+        memory = wm.memory_mb()
+        if self.max_memory_mb and memory > self.max_memory_mb:
+            logger.info(f"Recycling browser using {memory:.0f} MB")
+            return True
+        return False
+
+    def acquire(self, blocking=True):
+        """
+        Lease a browser, reusing a healthy idle one when possible
+
+        Args:
+            blocking: Wait for a free slot; if False, return None when the pool is at capacity
+
+        Returns:
+            WebDriverManager with a live driver (check .authenticated before logging in)
+        """
+        if not self._slots.acquire(blocking=blocking):
+            return None
+        try:
+            while True:
+                with self._lock:
+                    wm = self._idle.pop() if self._idle else None
+                if wm is None:
+                    wm = WebDriverManager(headless=self.headless, profile=self.profile)
+                    wm.create_driver()
+                    return wm
+                if wm.is_healthy() and not self._needs_recycle(wm):
+                    logger.info(f"Reusing warm browser ({wm.pages_loaded} pages loaded)")
+                    return wm
+                wm.quit()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, wm, discard=False):
+        """
+        Return a leased browser to the pool
+
+        Args:
+            wm: WebDriverManager obtained from acquire()
+            discard: Quit the browser instead of keeping it warm
+        """
+        try:
+            if discard or not wm.is_healthy() or self._needs_recycle(wm):
+                wm.quit()
+            else:
+                with self._lock:
+                    self._idle.append(wm)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def lease(self):
+        """Context manager around acquire()/release()"""
+        wm = self.acquire()
+        try:
+            yield wm
+        finally:
+            self.release(wm)
+
+    def close(self):
+        """Quit all idle browsers"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for wm in idle:
+            wm.quit()
+
+
 if __name__ == "__main__":
     # Test the WebDriver
     print("Testing WebDriver setup...")